@@ -1,7 +1,8 @@
 """
 SKILL: Multi-Tool Pipeline
 
-DESCRIPTION: Demonstrates chaining multiple MCP tools in a workflow with CLI arguments
+DESCRIPTION: Demonstrates running multiple MCP tools in a workflow with CLI arguments
+(independent calls are issued concurrently with asyncio.gather)
 
 WHEN TO USE:
 - Multi-step workflows
@@ -46,22 +47,18 @@ async def main():
     print(f"Analyzing repository: {args.repo_path}")
 
     try:
-        # Step 1: Get repository status
-        print("\n[1/3] Getting repository status...")
-        status = await call_mcp_tool(
-            "git__git_status", {"repo_path": args.repo_path}
-        )
-
-        # Step 2: Get recent commits
-        print(f"[2/3] Fetching last {args.max_commits} commits...")
-        commits = await call_mcp_tool(
-            "git__git_log", {"repo_path": args.repo_path, "max_count": args.max_commits}
-        )
-
-        # Step 3: Get current branch
-        print("[3/3] Getting branch information...")
-        branches = await call_mcp_tool(
-            "git__git_branch", {"repo_path": args.repo_path, "branch_type": "current"}
+        # The three git queries are independent, so issue them concurrently.
+        # call_mcp_tool is safe under asyncio.gather: the git server is spawned
+        # once and the requests are pipelined over its session.
+        print(f"\nFetching status, last {args.max_commits} commits and current branch...")
+        status, commits, branches = await asyncio.gather(
+            call_mcp_tool("git__git_status", {"repo_path": args.repo_path}),
+            call_mcp_tool(
+                "git__git_log", {"repo_path": args.repo_path, "max_count": args.max_commits}
+            ),
+            call_mcp_tool(
+                "git__git_branch", {"repo_path": args.repo_path, "branch_type": "current"}
+            ),
         )
 
         # Process results
@@ -0,0 +1,208 @@
+"""Per-server circuit breakers.
+
+Without a breaker, every call to a server that is down pays the connect
+timeout plus retries, and nothing remembers that the server just failed.
+CircuitBreaker counts consecutive failures of one server:
+
+    closed ──(failureThreshold failures)──> open
+    open ──(resetTimeout elapsed)──> half_open
+    half_open ──(probe succeeds)──> closed
+    half_open ──(probe fails)──> open
+
+While open, calls fail immediately with CircuitOpenError. In half-open
+state a single probe call is let through. A probe that ends without
+reaching the server (e.g. served from the result cache) gives its lease
+back with release_probe(); if its outcome is never recorded at all another
+probe is allowed after resetTimeout.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from enum import Enum
+from typing import Any
+
+from .config import CircuitBreakerPolicy
+from .exceptions import CircuitOpenError
+
+logger = logging.getLogger("mcp_execution.circuit_breaker")
+
+
+class CircuitState(Enum):
+    """States of a circuit breaker.
+
+    States:
+        CLOSED: Calls pass; failures are counted
+        OPEN: Calls fail fast until the reset timeout has passed
+        HALF_OPEN: One probe call decides whether to close or reopen
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker for one server.
+
+    Example:
+        breaker = CircuitBreaker("nia", config.circuitBreaker)
+        breaker.before_call()  # raises CircuitOpenError while open
+        try:
+            result = await call()
+        except Exception as e:
+            breaker.record_failure(e)
+            raise
+        breaker.record_success()
+
+    Attributes:
+        server_name: Server guarded by the breaker
+        policy: Thresholds and timeouts
+        opened: Number of times the circuit has opened
+        rejected: Number of calls failed fast while open
+    """
+
+    def __init__(
+        self,
+        server_name: str,
+        policy: CircuitBreakerPolicy,
+        clock: Callable[[], float] = time.monotonic,
+        on_transition: Callable[[str, CircuitState], None] | None = None,
+    ) -> None:
+        """Create a closed breaker.
+
+        Args:
+            server_name: Server guarded by the breaker
+            policy: Thresholds and timeouts
+            clock: Monotonic time source (for tests)
+            on_transition: Called with (server_name, new_state) on each
+                state change
+        """
+        self.server_name = server_name
+        self.policy = policy
+        self.opened = 0
+        self.rejected = 0
+        self._clock = clock
+        self._on_transition = on_transition
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: float | None = None
+        self._last_error: str | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state; an open circuit turns half-open once resetTimeout has passed."""
+        if (
+            self._state is CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.policy.resetTimeout
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe call through (0 if not open)."""
+        if self.state is not CircuitState.OPEN:
+            return 0.0
+        return max(self.policy.resetTimeout - (self._clock() - self._opened_at), 0.0)
+
+    def allows_calls(self) -> bool:
+        """Return True if a call would currently be let through."""
+        if not self.policy.enabled:
+            return True
+        state = self.state
+        if state is CircuitState.OPEN:
+            return False
+        if state is CircuitState.HALF_OPEN:
+            return not self._probe_in_flight()
+        return True
+
+    def _probe_in_flight(self) -> bool:
+        return (
+            self._probe_started is not None
+            and self._clock() - self._probe_started < self.policy.resetTimeout
+        )
+
+    def before_call(self) -> bool:
+        """Admit a call, or fail fast if the circuit is open.
+
+        In half-open state the admitted call becomes the probe; further calls
+        are rejected until its outcome is recorded or it is released.
+
+        Returns:
+            True if the call was admitted as the half-open probe
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a probe is in flight
+        """
+        if not self.allows_calls():
+            self.rejected += 1
+            retry_after = self.retry_after()
+            reason = f"; last error: {self._last_error}" if self._last_error else ""
+            when = f"retry in {retry_after:.1f}s" if retry_after else "a probe call is in flight"
+            raise CircuitOpenError(
+                f"Circuit open for MCP server '{self.server_name}' after "
+                f"{self._failures} consecutive failure(s) ({when}){reason}"
+            )
+        if self.policy.enabled and self._state is CircuitState.HALF_OPEN:
+            self._probe_started = self._clock()
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """Give back the lease of a probe that ended without an outcome.
+
+        Call this when an admitted probe did not reach the server (served
+        from a cache, rejected locally, cancelled), so that the next call
+        becomes the probe. Does nothing once the probe's outcome was recorded.
+        """
+        if self._state is CircuitState.HALF_OPEN:
+            self._probe_started = None
+
+    def record_success(self) -> None:
+        """Record a successful call or health ping, closing the circuit."""
+        self._failures = 0
+        self._probe_started = None
+        self._last_error = None
+        if self._state is not CircuitState.CLOSED:
+            logger.info(f"Circuit for server '{self.server_name}' closed")
+            self._transition(CircuitState.CLOSED)
+
+    def record_failure(self, error: BaseException | None = None) -> None:
+        """Record a failed connect, transient call error or failed health ping.
+
+        Args:
+            error: The failure, kept for CircuitOpenError messages
+        """
+        state = self.state
+        self._failures += 1
+        self._probe_started = None
+        if error is not None:
+            self._last_error = f"{type(error).__name__}: {error}"
+        if state is CircuitState.HALF_OPEN or (
+            state is CircuitState.CLOSED and self._failures >= self.policy.failureThreshold
+        ):
+            self._opened_at = self._clock()
+            self.opened += 1
+            logger.warning(
+                f"Circuit for server '{self.server_name}' opened after "
+                f"{self._failures} consecutive failure(s); failing fast for "
+                f"{self.policy.resetTimeout:.0f}s"
+            )
+            self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        self._state = state
+        if self._on_transition is not None:
+            self._on_transition(self.server_name, state)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the breaker's state as JSON-serializable data."""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_after": round(self.retry_after(), 3),
+            "last_error": self._last_error,
+        }
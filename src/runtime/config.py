@@ -4,11 +4,106 @@ This module defines the configuration structure for MCP servers and provides
 validation using Pydantic models.
 """
 
+import random
 from typing import Any, Literal
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 
+class RetryPolicy(BaseModel):
+    """Backoff policy for retrying tool calls after transient failures.
+
+    The delay before retry n (0-based) is
+    min(maxDelay, baseDelay * multiplier**n), reduced by a random fraction of
+    up to ``jitter`` so that concurrent callers do not retry in lockstep.
+
+    Attributes:
+        maxRetries: Retries of a failed call, unless the caller passes
+            max_retries
+        baseDelay: Delay in seconds before the first retry
+        multiplier: Factor applied to the delay after each retry
+        maxDelay: Upper bound on any single delay in seconds
+        jitter: Fraction (0-1) of the delay that is randomized
+    """
+
+    maxRetries: int = Field(default=1, ge=0, description="Retries after a transient failure")
+    baseDelay: float = Field(default=0.5, ge=0, description="Initial retry delay (seconds)")
+    multiplier: float = Field(default=2.0, ge=1, description="Backoff multiplier")
+    maxDelay: float = Field(default=8.0, ge=0, description="Maximum retry delay (seconds)")
+    jitter: float = Field(default=0.5, ge=0, le=1, description="Randomized fraction of delay")
+
+    def compute_delay(self, attempt: int) -> float:
+        """Return the delay in seconds before retry number ``attempt`` (0-based)."""
+        delay = min(self.maxDelay, self.baseDelay * self.multiplier**attempt)
+        return delay * (1 - self.jitter * random.random())
+
+
+class CircuitBreakerPolicy(BaseModel):
+    """Circuit breaker and health check settings for a server.
+
+    After ``failureThreshold`` consecutive failures (failed connects,
+    transient call errors, failed health pings) the circuit opens and calls
+    fail fast with CircuitOpenError. After ``resetTimeout`` seconds one
+    probe call is let through (half-open): success closes the circuit,
+    failure reopens it.
+
+    Attributes:
+        enabled: Whether calls are gated by the breaker
+        failureThreshold: Consecutive failures that open the circuit
+        resetTimeout: Seconds the circuit stays open before a probe call
+        healthCheckInterval: Seconds between pings of a connected server
+            (0 disables health checks)
+        healthCheckTimeout: Seconds a health ping may take before it counts
+            as a failure
+    """
+
+    enabled: bool = Field(default=True, description="Gate calls with the circuit breaker")
+    failureThreshold: int = Field(
+        default=5, ge=1, description="Consecutive failures that open the circuit"
+    )
+    resetTimeout: float = Field(
+        default=30.0, ge=0, description="Seconds before an open circuit lets a probe through"
+    )
+    healthCheckInterval: float = Field(
+        default=30.0, ge=0, description="Seconds between health pings (0 disables)"
+    )
+    healthCheckTimeout: float = Field(
+        default=5.0, gt=0, description="Health ping timeout (seconds)"
+    )
+
+
+class HttpOptions(BaseModel):
+    """HTTP client tuning for SSE and HTTP servers.
+
+    Attributes:
+        maxConnections: Maximum open connections to the server
+        maxKeepaliveConnections: Maximum idle connections kept open for reuse
+        keepaliveExpiry: Seconds an idle connection is kept before closing,
+            so calls spaced further apart repeat the TCP and TLS handshake
+        connectTimeout: Seconds to wait for a connection to be established
+        timeout: Seconds to wait for other HTTP operations (writes, pool)
+        readTimeout: Seconds to wait for data on an open response or event
+            stream
+        http2: Negotiate HTTP/2 (requires the ``h2`` package; HTTP/1.1 is
+            used when it is missing)
+        resumeSession: Reuse the Streamable HTTP session ID when reconnecting,
+            skipping the initialize handshake (http only)
+    """
+
+    maxConnections: int = Field(default=10, ge=1, description="Connection pool size")
+    maxKeepaliveConnections: int = Field(
+        default=5, ge=0, description="Idle connections kept open for reuse"
+    )
+    keepaliveExpiry: float = Field(
+        default=60.0, ge=0, description="Idle connection lifetime (seconds)"
+    )
+    connectTimeout: float = Field(default=10.0, gt=0, description="Connect timeout (seconds)")
+    timeout: float = Field(default=30.0, gt=0, description="Write/pool timeout (seconds)")
+    readTimeout: float = Field(default=300.0, gt=0, description="Read timeout (seconds)")
+    http2: bool = Field(default=False, description="Negotiate HTTP/2")
+    resumeSession: bool = Field(default=True, description="Resume sessions on reconnect")
+
+
 class ServerConfig(BaseModel):
     """Configuration for a single MCP server.
 
@@ -25,6 +120,14 @@ class ServerConfig(BaseModel):
         url: Endpoint URL (sse/http only)
         headers: HTTP headers (sse/http only)
         disabled: Whether this server should be skipped
+        maxConcurrentRequests: Maximum in-flight requests over the server's session
+        retry: Backoff policy for retrying transient tool call failures
+        circuitBreaker: Fail-fast and health check policy (see
+            runtime.circuit_breaker)
+        warmup: When to connect: 'lazy' on the first tool call, 'eager' in the
+            background during initialize, or 'predicted' in the background when
+            recent runs used the server (see runtime.usage_stats)
+        http: Connection pooling, keep-alive, timeouts and HTTP/2 (sse/http only)
     """
 
     type: Literal["stdio", "sse", "http"] = Field(
@@ -43,9 +146,24 @@ class ServerConfig(BaseModel):
     headers: dict[str, str] | None = Field(
         default=None, description="HTTP headers (sse/http only)"
     )
+    http: HttpOptions = Field(
+        default_factory=HttpOptions, description="HTTP client tuning (sse/http only)"
+    )
 
     # common fields
     disabled: bool = Field(default=False, description="Whether to skip this server")
+    maxConcurrentRequests: int = Field(
+        default=16, ge=1, description="Maximum concurrent in-flight requests to this server"
+    )
+    retry: RetryPolicy = Field(
+        default_factory=RetryPolicy, description="Retry backoff policy for tool calls"
+    )
+    circuitBreaker: CircuitBreakerPolicy = Field(
+        default_factory=CircuitBreakerPolicy, description="Circuit breaker and health checks"
+    )
+    warmup: Literal["lazy", "eager", "predicted"] = Field(
+        default="lazy", description="Connection warmup policy"
+    )
 
     @model_validator(mode="after")
     def validate_transport_fields(self) -> "ServerConfig":
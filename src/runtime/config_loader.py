@@ -0,0 +1,201 @@
+"""Loading of the merged MCP configuration, with an in-memory snapshot cache.
+
+The configuration is the global ~/.claude/mcp_config.json merged with the
+project's .mcp.json (or mcp_config.json), the project taking precedence.
+load_mcp_config() is the single place that reads, validates and merges these
+files; McpClientManager.initialize() and generate_wrappers() both use it.
+
+Validating and merging again is wasted work when the files have not changed,
+e.g. for each manager of a batch run or each reconnect of the daemon.
+ConfigSnapshotCache keeps the merged, already-validated config in memory,
+keyed on the paths, mtimes and sizes of all candidate files, and rebuilds it
+when any of them changes (including a project file appearing or
+disappearing). Snapshots are not written to disk: reading one back is slower
+than validating the small config files, and they would copy env and header
+secrets into the project directory.
+
+aiofiles is imported on first use so that importing the runtime does not pay
+for it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from functools import lru_cache
+from pathlib import Path
+
+from .config import McpConfig
+from .exceptions import ConfigurationError
+
+logger = logging.getLogger("mcp_execution.config")
+
+# (path, mtime_ns, size) of each candidate file; mtime and size are None if missing
+SourceKey = tuple[tuple[str, int | None, int | None], ...]
+
+
+def global_config_path() -> Path:
+    """Return the path of the global config (~/.claude/mcp_config.json)."""
+    return Path.home() / ".claude" / "mcp_config.json"
+
+
+def project_config_paths() -> list[Path]:
+    """Return the project config candidates in order of preference."""
+    return [Path.cwd() / ".mcp.json", Path.cwd() / "mcp_config.json"]
+
+
+def source_key(paths: list[Path]) -> SourceKey:
+    """Stat the config candidates.
+
+    Args:
+        paths: Candidate config files (missing files are part of the key)
+
+    Returns:
+        Tuple of (absolute path, mtime_ns, size) per candidate
+    """
+    key = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            key.append((str(path.absolute()), None, None))
+        else:
+            key.append((str(path.absolute()), stat.st_mtime_ns, stat.st_size))
+    return tuple(key)
+
+
+class ConfigSnapshotCache:
+    """In-memory cache of the merged, validated config.
+
+    A snapshot is reused while the stat key of its source files is
+    unchanged; only the most recent snapshot is kept.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty cache."""
+        self._memory: dict[SourceKey, McpConfig] = {}
+
+    def load(self, key: SourceKey) -> McpConfig | None:
+        """Return the snapshot for key, or None on a miss.
+
+        Args:
+            key: Current stat key of the source files
+
+        Returns:
+            The cached config, or None if absent or stale
+        """
+        return self._memory.get(key)
+
+    def store(self, key: SourceKey, config: McpConfig) -> None:
+        """Remember a freshly loaded config, replacing any older snapshot.
+
+        Args:
+            key: Stat key of the source files the config was built from
+            config: Validated, merged configuration
+        """
+        self._memory = {key: config}
+
+
+@lru_cache(maxsize=1)
+def get_config_cache() -> ConfigSnapshotCache:
+    """Return the process-wide config snapshot cache."""
+    return ConfigSnapshotCache()
+
+
+async def _read_config(path: Path) -> McpConfig:
+    """Read and validate one config file.
+
+    Raises:
+        ConfigurationError: If the file is not valid JSON or not a valid config
+    """
+    import aiofiles
+
+    try:
+        async with aiofiles.open(path) as f:
+            content = await f.read()
+        return McpConfig.model_validate_json(content)
+    except json.JSONDecodeError as e:
+        raise ConfigurationError(f"Invalid JSON in config file {path}: {e}")
+    except Exception as e:
+        raise ConfigurationError(f"Failed to load config from {path}: {e}")
+
+
+async def _build_merged_config(global_path: Path, project_paths: list[Path]) -> McpConfig:
+    """Read, validate and merge the global and project configs.
+
+    An unreadable global config is skipped with a warning; an unreadable
+    project config is an error.
+    """
+    global_cfg: McpConfig | None = None
+    project_cfg: McpConfig | None = None
+
+    if global_path.exists():
+        try:
+            global_cfg = await _read_config(global_path)
+            servers = len(global_cfg.mcpServers)
+            logger.info(f"Loaded global config: {global_path} ({servers} servers)")
+        except ConfigurationError as e:
+            logger.warning(f"Failed to load global config {global_path}: {e}")
+
+    # Prefer .mcp.json over mcp_config.json
+    project_path = next((path for path in project_paths if path.exists()), None)
+    if project_path:
+        project_cfg = await _read_config(project_path)
+        servers = len(project_cfg.mcpServers)
+        logger.info(f"Loaded project config: {project_path} ({servers} servers)")
+
+    # Merge configs (project overrides global)
+    if global_cfg and project_cfg:
+        config = global_cfg.merge(project_cfg)
+        logger.info(f"Merged configs: {len(config.mcpServers)} servers total")
+        return config
+    if project_cfg:
+        return project_cfg
+    if global_cfg:
+        return global_cfg
+    raise ConfigurationError(
+        f"No config file found. Expected .mcp.json or mcp_config.json in {Path.cwd()}, "
+        f"or global config at {global_path}"
+    )
+
+
+async def load_mcp_config(
+    config_path: Path | None = None, cache: ConfigSnapshotCache | None = None
+) -> McpConfig:
+    """Load the MCP configuration.
+
+    Args:
+        config_path: Use only this file. If not provided, the global config
+            is merged with the project config (.mcp.json or mcp_config.json),
+            project servers overriding global ones with the same name.
+        cache: Snapshot cache to consult and update (None: always rebuild)
+
+    Returns:
+        Validated configuration
+
+    Raises:
+        ConfigurationError: If no config file is found or a config is invalid
+    """
+    if config_path:
+        if not config_path.exists():
+            raise ConfigurationError(f"Config file not found: {config_path}")
+        sources = [config_path]
+    else:
+        global_path = global_config_path()
+        project_paths = project_config_paths()
+        sources = [global_path, *project_paths]
+
+    key = source_key(sources)
+    if cache is not None:
+        config = cache.load(key)
+        if config is not None:
+            return config
+
+    if config_path:
+        config = await _read_config(config_path)
+    else:
+        config = await _build_merged_config(global_path, project_paths)
+
+    if cache is not None:
+        cache.store(key, config)
+    return config
@@ -0,0 +1,138 @@
+"""Dedicated tasks owning MCP transport and session contexts.
+
+The SDK's transports (stdio_client, sse_client, streamablehttp_client) and
+ClientSession run anyio task groups, whose cancel scopes belong to the task
+that entered them. Exiting one from another task fails, and cancelling the
+scope cancels the entering task instead; a script that connected a server
+in its main task and later closes it from a gather() in cleanup() would be
+cancelled itself.
+
+ContextHost enters a server's contexts in a task of its own and exits them
+there when asked to close, so connections can be opened and closed from
+any task: concurrent cleanup, pooled servers released by another manager,
+or a timeout wrapper.
+
+Example:
+    host = ContextHost("fs")
+
+    async def enter(stack: AsyncExitStack) -> ClientSession:
+        read, write = await enter_context(stack, stdio_client(params))
+        session = await enter_context(stack, ClientSession(read, write))
+        await session.initialize()
+        return session
+
+    session = await host.start(enter)
+    ...
+    await host.aclose()
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+from typing import Any, TypeVar
+
+logger = logging.getLogger("mcp_execution.context_host")
+
+T = TypeVar("T")
+
+
+async def enter_context(stack: AsyncExitStack, ctx: Any) -> Any:
+    """Enter an async context manager and register its exit on stack.
+
+    Like AsyncExitStack.enter_async_context, but calls the instance's own
+    __aenter__/__aexit__ as the manager always has, rather than looking
+    them up on the type.
+
+    Args:
+        stack: Stack the exit is pushed onto
+        ctx: Async context manager to enter
+
+    Returns:
+        The value returned by __aenter__
+    """
+    value = await ctx.__aenter__()
+
+    # A plain function: push_async_exit treats anything whose type has an
+    # __aexit__ (e.g. a mocked bound method) as a context manager itself
+    async def exit_ctx(*exc_info: Any) -> bool | None:
+        return await ctx.__aexit__(*exc_info)
+
+    stack.push_async_exit(exit_ctx)
+    return value
+
+
+class ContextHost:
+    """Keeps a server's contexts open in a dedicated task until closed.
+
+    The host can also be passed where an entered context manager is
+    expected: ``await host.__aexit__(None, None, None)`` closes it.
+
+    Attributes:
+        label: Server name used in task names and log messages
+    """
+
+    def __init__(self, label: str) -> None:
+        """Create a host that has not entered anything yet."""
+        self.label = label
+        self._task: asyncio.Task[None] | None = None
+        self._closing = asyncio.Event()
+
+    async def start(self, enter: Callable[[AsyncExitStack], Awaitable[T]]) -> T:
+        """Enter contexts in the host task and return what enter() returns.
+
+        Args:
+            enter: Coroutine function entering contexts on the given stack;
+                its return value (e.g. the initialized session) is passed back
+
+        Returns:
+            The value returned by enter
+
+        Raises:
+            Exception: Whatever enter raises; contexts entered so far are
+                exited before it propagates
+        """
+        ready: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(enter, ready), name=f"mcp-host-{self.label}")
+        try:
+            return await ready
+        except BaseException:
+            # Failed or abandoned (e.g. by a timeout): unwind what was entered
+            self._task.cancel()
+            await asyncio.wait({self._task})
+            raise
+
+    async def _run(
+        self, enter: Callable[[AsyncExitStack], Awaitable[T]], ready: "asyncio.Future[T]"
+    ) -> None:
+        try:
+            async with AsyncExitStack() as stack:
+                value = await enter(stack)
+                if ready.done():
+                    return
+                ready.set_result(value)
+                await self._closing.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.error(f"Error closing contexts of server '{self.label}': {e}")
+
+    async def aclose(self) -> None:
+        """Exit the hosted contexts and wait for the host task to finish.
+
+        Cancelling the caller cancels the host task, so a bounded close
+        (see close_with_escalation) abandons a hung exit.
+        """
+        if self._task is None:
+            return
+        self._closing.set()
+        await self._task
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the host (context-manager style, see exit_context)."""
+        await self.aclose()
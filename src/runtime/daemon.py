@@ -0,0 +1,532 @@
+"""
+Long-lived MCP connection daemon.
+
+Every harness run normally spawns the stdio servers it touches and tears
+them down on exit, so short scripts spend most of their time in server
+startup. The daemon keeps an McpClientManager (and its ClientSessions) warm
+across runs, serving tool calls over a Unix socket. Servers that stay idle
+longer than the idle timeout are disconnected and reconnect lazily.
+
+call_mcp_tool() routes through the daemon transparently whenever one is
+listening for the current project; otherwise it connects in-process.
+
+Usage:
+    mcp-daemon start     # start in the background
+    mcp-daemon serve     # run in the foreground
+    mcp-daemon status
+    mcp-daemon stop
+
+Wire protocol: each message is a 4-byte big-endian length followed by a
+UTF-8 JSON object. Requests carry an "op" ("call_tool", "ping", "shutdown");
+responses carry "ok" plus either "result" or "error"/"error_type".
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import signal
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from .env_utils import load_project_env
+from .exceptions import (
+    CircuitOpenError,
+    ConfigurationError,
+    DaemonUnavailableError,
+    ServerConnectionError,
+    ToolExecutionError,
+    ToolNotFoundError,
+)
+from .mcp_client import McpClientManager
+from .tool_cache import ToolSchemaCache
+
+logger = logging.getLogger("mcp_execution.daemon")
+
+# Environment variable overriding the socket path
+DAEMON_SOCKET_ENV = "MCP_DAEMON_SOCKET"
+# Environment variable disabling daemon routing in call_mcp_tool ("0")
+DAEMON_ROUTING_ENV = "MCP_DAEMON"
+
+DEFAULT_IDLE_TIMEOUT = 300.0  # seconds
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+
+_FRAME_HEADER = struct.Struct("!I")
+
+# Exceptions re-raised client-side by name
+_ERROR_TYPES: dict[str, type[Exception]] = {
+    cls.__name__: cls
+    for cls in (
+        CircuitOpenError,
+        ConfigurationError,
+        ServerConnectionError,
+        ToolExecutionError,
+        ToolNotFoundError,
+    )
+}
+
+
+def daemon_socket_path(project_dir: Path | None = None) -> Path:
+    """Return the daemon socket path for a project.
+
+    Each project directory gets its own daemon, since server configuration
+    is per project. Sockets live in a per-user directory (created 0700 by
+    the daemon) under XDG_RUNTIME_DIR or the temp dir. MCP_DAEMON_SOCKET
+    overrides the computed path.
+
+    Args:
+        project_dir: Project directory (default: cwd)
+
+    Returns:
+        Path of the Unix socket
+    """
+    override = os.environ.get(DAEMON_SOCKET_ENV)
+    if override:
+        return Path(override)
+
+    project = (project_dir or Path.cwd()).resolve()
+    digest = hashlib.sha256(str(project).encode("utf-8")).hexdigest()[:12]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(runtime_dir) / f"mcp-daemon-{os.getuid()}" / f"{digest}.sock"
+
+
+def _check_socket_owner(path: Path) -> None:
+    """Refuse a daemon socket that another user created or can connect to.
+
+    The default socket directory may live in the shared temp dir, where
+    another user could create the path first and receive our tool calls.
+
+    Raises:
+        DaemonUnavailableError: If the socket is missing, not owned by the
+            current user, or accessible to group or others
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        raise DaemonUnavailableError(f"No MCP daemon socket at {path}") from None
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        logger.warning(f"Ignoring MCP daemon socket {path}: not private to the current user")
+        raise DaemonUnavailableError(f"MCP daemon socket {path} is not private to this user")
+
+
+def daemon_routing_active(project_dir: Path | None = None) -> bool:
+    """Return True if call_mcp_tool() will likely be served by a daemon.
+
+    This only checks that routing is enabled and the socket exists; it does
+    not connect.
+    """
+    if os.environ.get(DAEMON_ROUTING_ENV) == "0":
+        return False
+    return daemon_socket_path(project_dir).exists()
+
+
+async def _write_frame(writer: asyncio.StreamWriter, message: dict[str, Any]) -> int:
+    """Write one length-prefixed JSON message and return its payload size in bytes."""
+    payload = json.dumps(message, default=str).encode("utf-8")
+    writer.write(_FRAME_HEADER.pack(len(payload)) + payload)
+    await writer.drain()
+    return len(payload)
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> tuple[dict[str, Any], int]:
+    """Read one length-prefixed JSON message.
+
+    Returns:
+        The message and its payload size in bytes
+
+    Raises:
+        asyncio.IncompleteReadError: If the peer closed the connection
+        ValueError: If the frame exceeds MAX_FRAME_SIZE
+    """
+    header = await reader.readexactly(_FRAME_HEADER.size)
+    (length,) = _FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame too large: {length} bytes")
+    payload = await reader.readexactly(length)
+    message: dict[str, Any] = json.loads(payload)
+    return message, length
+
+
+def _to_jsonable(value: Any) -> Any:
+    """Convert a tool result into JSON-serializable data.
+
+    Parsed JSON and text results pass through unchanged; MCP content models
+    (returned when a result is not plain text) are dumped to dicts.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True, exclude_none=True)
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _to_jsonable(item) for key, item in value.items()}
+    return value
+
+
+class McpDaemon:
+    """Unix-socket server that proxies tool calls to a warm McpClientManager.
+
+    Attributes:
+        socket_path: Path of the listening Unix socket
+        idle_timeout: Seconds of inactivity after which a server is disconnected
+    """
+
+    def __init__(
+        self,
+        socket_path: Path | None = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        manager: McpClientManager | None = None,
+    ) -> None:
+        """Create a daemon; call start() to begin serving."""
+        self.socket_path = socket_path or daemon_socket_path()
+        self.idle_timeout = idle_timeout
+        self._manager = manager or McpClientManager(schema_cache=ToolSchemaCache.from_env())
+        self._server: asyncio.AbstractServer | None = None
+        self._eviction_task: asyncio.Task[None] | None = None
+        self._stopped = asyncio.Event()
+        self._closed = asyncio.Event()
+        self._started_at = time.time()
+        self._last_used: dict[str, float] = {}
+        self._in_flight: dict[str, int] = {}
+        self._stop_task: asyncio.Task[None] | None = None
+
+    async def start(self, config_path: Path | None = None) -> None:
+        """Load configuration and start listening.
+
+        Args:
+            config_path: Optional explicit config file (default: merged configs)
+
+        Raises:
+            ServerConnectionError: If another daemon already owns the socket
+        """
+        if self.socket_path.exists():
+            if await _ping(self.socket_path):
+                raise ServerConnectionError(f"MCP daemon already running on {self.socket_path}")
+            # Stale socket left behind by a crashed daemon
+            self.socket_path.unlink()
+
+        await self._manager.initialize(config_path)
+
+        self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Create the socket 0600 rather than chmod it after bind, so there is
+        # no window in which other users can connect
+        umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(
+                self._handle_client, path=str(self.socket_path)
+            )
+        finally:
+            os.umask(umask)
+
+        self._eviction_task = asyncio.create_task(self._evict_idle_servers())
+        logger.info(
+            f"MCP daemon listening on {self.socket_path} (idle timeout: {self.idle_timeout}s)"
+        )
+
+    async def serve_forever(self) -> None:
+        """Block until stop() completes (e.g., after a shutdown request or signal)."""
+        await self._closed.wait()
+
+    def request_stop(self) -> None:
+        """Schedule stop() without waiting (safe from handlers and signals)."""
+        if self._stop_task is None:
+            self._stop_task = asyncio.create_task(self.stop())
+
+    async def stop(self) -> None:
+        """Stop serving, disconnect all servers and remove the socket."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+
+        if self._eviction_task:
+            self._eviction_task.cancel()
+            await asyncio.gather(self._eviction_task, return_exceptions=True)
+
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+        await self._manager.cleanup()
+
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+        self._closed.set()
+        logger.info("MCP daemon stopped")
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve requests from one client connection until it closes."""
+        try:
+            while True:
+                try:
+                    request, _size = await _read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                response = await self._dispatch(request)
+                await _write_frame(writer, response)
+                if request.get("op") == "shutdown":
+                    self.request_stop()
+                    break
+        except Exception as e:
+            logger.error(f"Daemon client connection failed: {e}")
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Execute one request and build its response."""
+        op = request.get("op")
+
+        if op == "ping":
+            return {
+                "ok": True,
+                "result": {
+                    "pid": os.getpid(),
+                    "uptime": time.time() - self._started_at,
+                    "connected": self._manager.connected_servers,
+                    "circuits": self._manager.get_circuit_states(),
+                },
+            }
+
+        if op == "shutdown":
+            return {"ok": True, "result": None}
+
+        if op != "call_tool":
+            return {"ok": False, "error": f"Unknown op: {op}", "error_type": "ConfigurationError"}
+
+        tool_identifier = request.get("tool", "")
+        server_name = tool_identifier.split("__", 1)[0]
+        self._in_flight[server_name] = self._in_flight.get(server_name, 0) + 1
+        self._last_used[server_name] = time.monotonic()
+        try:
+            result = await self._manager.call_tool(
+                tool_identifier,
+                request.get("params") or {},
+                max_retries=request.get("max_retries"),
+            )
+            return {"ok": True, "result": _to_jsonable(result)}
+        except Exception as e:
+            return {"ok": False, "error": str(e), "error_type": type(e).__name__}
+        finally:
+            self._in_flight[server_name] -= 1
+            self._last_used[server_name] = time.monotonic()
+
+    async def _evict_idle_servers(self) -> None:
+        """Periodically disconnect servers idle longer than idle_timeout.
+
+        Servers connected without a call (e.g. by warmup) count as used when
+        a sweep first sees them connected, so they are evicted as well.
+        """
+        sweep_interval = max(self.idle_timeout / 4, 0.01)
+        while True:
+            await asyncio.sleep(sweep_interval)
+            now = time.monotonic()
+            for server_name in self._manager.connected_servers:
+                if self._in_flight.get(server_name, 0):
+                    continue
+                last_used = self._last_used.setdefault(server_name, now)
+                if now - last_used >= self.idle_timeout:
+                    logger.info(f"Evicting idle server: {server_name}")
+                    await self._manager.disconnect_server(server_name)
+                    self._last_used.pop(server_name, None)
+
+
+async def daemon_request(
+    request: dict[str, Any],
+    socket_path: Path | None = None,
+    sizes: dict[str, int] | None = None,
+) -> Any:
+    """Send one request to the daemon and return its result.
+
+    Args:
+        request: Request message (must include "op")
+        socket_path: Daemon socket (default: daemon_socket_path())
+        sizes: Optional dict receiving "request_bytes" and "response_bytes",
+            the payload sizes of the frames sent and received
+
+    Returns:
+        The "result" field of the response
+
+    Raises:
+        DaemonUnavailableError: If no daemon is listening, or the socket is
+            not private to the current user
+        McpExecutionError: The daemon-side error, re-raised by type
+    """
+    path = socket_path or daemon_socket_path()
+    _check_socket_owner(path)
+
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(path))
+    except OSError as e:
+        raise DaemonUnavailableError(f"MCP daemon not reachable at {path}: {e}") from e
+
+    # Past this point the request may have executed, so failures must not
+    # be reported as "unavailable" (which would trigger a local re-run).
+    try:
+        request_bytes = await _write_frame(writer, request)
+        if sizes is not None:
+            sizes["request_bytes"] = request_bytes
+        response, response_bytes = await _read_frame(reader)
+        if sizes is not None:
+            sizes["response_bytes"] = response_bytes
+    except (OSError, asyncio.IncompleteReadError) as e:
+        raise ServerConnectionError(f"Lost connection to MCP daemon: {e}") from e
+    finally:
+        writer.close()
+
+    if response.get("ok"):
+        return response.get("result")
+
+    error_cls = _ERROR_TYPES.get(response.get("error_type", ""), ToolExecutionError)
+    raise error_cls(response.get("error", "Unknown daemon error"))
+
+
+async def call_via_daemon(
+    tool_identifier: str,
+    params: dict[str, Any],
+    max_retries: int | None = None,
+    sizes: dict[str, int] | None = None,
+) -> Any:
+    """Call a tool through the daemon.
+
+    Args:
+        tool_identifier: Tool identifier in format "serverName__toolName"
+        params: Dictionary of parameters to pass to the tool
+        max_retries: Maximum number of retry attempts on failure
+        sizes: Optional dict receiving the frame sizes (see daemon_request)
+
+    Returns:
+        The tool execution result
+
+    Raises:
+        DaemonUnavailableError: If routing is disabled or no daemon is listening
+    """
+    if os.environ.get(DAEMON_ROUTING_ENV) == "0":
+        raise DaemonUnavailableError("Daemon routing disabled")
+    return await daemon_request(
+        {"op": "call_tool", "tool": tool_identifier, "params": params, "max_retries": max_retries},
+        sizes=sizes,
+    )
+
+
+async def _ping(socket_path: Path) -> dict[str, Any] | None:
+    """Return daemon status, or None if it is not reachable."""
+    try:
+        result: dict[str, Any] = await daemon_request({"op": "ping"}, socket_path)
+        return result
+    except ServerConnectionError:
+        return None
+
+
+async def _serve(socket_path: Path, idle_timeout: float) -> None:
+    """Run the daemon in the foreground until shutdown or signal."""
+    # Tool calls inside the daemon must never be routed back to itself
+    os.environ[DAEMON_ROUTING_ENV] = "0"
+
+    daemon = McpDaemon(socket_path, idle_timeout)
+    await daemon.start()
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, daemon.request_stop)
+
+    await daemon.serve_forever()
+
+
+def _start_detached(socket_path: Path, idle_timeout: float) -> int:
+    """Spawn the daemon in a new session and wait for it to answer pings."""
+    log_dir = Path.cwd() / ".claude" / "cache"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_file = log_dir / "mcp-daemon.log"
+
+    with open(log_file, "ab") as log:
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "runtime.daemon",
+                "serve",
+                "--socket",
+                str(socket_path),
+                "--idle-timeout",
+                str(idle_timeout),
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if asyncio.run(_ping(socket_path)):
+            logger.info(f"MCP daemon started on {socket_path} (log: {log_file})")
+            return 0
+        time.sleep(0.1)
+
+    logger.error(f"MCP daemon did not start; see {log_file}")
+    return 1
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Keep MCP server sessions warm across runs")
+    parser.add_argument("command", choices=["start", "serve", "stop", "status"])
+    parser.add_argument("--socket", type=Path, default=None, help="Unix socket path")
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help=f"Disconnect servers idle this many seconds (default: {DEFAULT_IDLE_TIMEOUT:g})",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s", stream=sys.stderr)
+    load_project_env()
+
+    socket_path = args.socket or daemon_socket_path()
+
+    if args.command == "serve":
+        try:
+            asyncio.run(_serve(socket_path, args.idle_timeout))
+        except Exception as e:
+            logger.error(f"MCP daemon failed: {e}")
+            sys.exit(1)
+        sys.exit(0)
+
+    status = asyncio.run(_ping(socket_path))
+
+    if args.command == "status":
+        if status:
+            print(json.dumps(status, indent=2))
+            sys.exit(0)
+        print(f"MCP daemon not running ({socket_path})")
+        sys.exit(1)
+
+    if args.command == "stop":
+        if status:
+            asyncio.run(daemon_request({"op": "shutdown"}, socket_path))
+            print("MCP daemon stopped")
+        else:
+            print("MCP daemon not running")
+        sys.exit(0)
+
+    # start
+    if status:
+        print(f"MCP daemon already running (pid {status['pid']})")
+        sys.exit(0)
+    sys.exit(_start_detached(socket_path, args.idle_timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,85 @@
 This module provides:
 - .env file loading via python-dotenv
 - ${VAR} and ${VAR:-default} expansion in config values
+
+Expansion goes through EnvTemplate: each distinct string is parsed once into
+literal and variable segments, so expanding it again is a join over the
+segments. ServerConfigResolver applies this to a server's env and headers
+and keeps the expanded config until a referenced variable changes.
 """
 
 import os
 import re
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from dotenv import load_dotenv
 
+from .config import ServerConfig
+
 # Pattern for ${VAR} or ${VAR:-default}
 ENV_VAR_PATTERN = re.compile(r"\$\{([^}:]+)(?::-([^}]*))?\}")
 
 
+class EnvTemplate:
+    """A string with ${VAR} / ${VAR:-default} placeholders, parsed once.
+
+    Attributes:
+        segments: Literal strings and (name, default) pairs, in order;
+            default is None for plain ${VAR}
+        variables: Names of the referenced environment variables
+    """
+
+    __slots__ = ("segments", "variables")
+
+    def __init__(self, value: str) -> None:
+        """Parse value into segments."""
+        segments: list[str | tuple[str, str | None]] = []
+        position = 0
+        for match in ENV_VAR_PATTERN.finditer(value):
+            if match.start() > position:
+                segments.append(value[position : match.start()])
+            segments.append((match.group(1), match.group(2)))
+            position = match.end()
+        if position < len(value):
+            segments.append(value[position:])
+        self.segments = tuple(segments)
+        self.variables = frozenset(
+            segment[0] for segment in segments if isinstance(segment, tuple)
+        )
+
+    def expand(self, environ: Mapping[str, str] | None = None) -> str:
+        """Substitute the placeholders.
+
+        Args:
+            environ: Variables to substitute (default: os.environ)
+
+        Returns:
+            The expanded string; unset variables without a default expand to ""
+        """
+        environ = os.environ if environ is None else environ
+        parts = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+            else:
+                name, default = segment
+                env_value = environ.get(name)
+                if env_value is not None:
+                    parts.append(env_value)
+                elif default is not None:
+                    parts.append(default)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def compile_env_template(value: str) -> EnvTemplate:
+    """Return the parsed template for a string (memoized per distinct string)."""
+    return EnvTemplate(value)
+
+
 def expand_env_vars(value: str) -> str:
     """Expand environment variables in a string.
 
@@ -30,15 +96,7 @@ def expand_env_vars(value: str) -> str:
         String with all env vars expanded
     """
 
-    def replacer(match: re.Match[str]) -> str:
-        var_name = match.group(1)
-        default = match.group(2)  # May be None
-        env_value = os.environ.get(var_name)
-        if env_value is not None:
-            return env_value
-        return default if default is not None else ""
-
-    return ENV_VAR_PATTERN.sub(replacer, value)
+    return compile_env_template(value).expand()
 
 
 def expand_env_vars_in_config(config: Any) -> Any:
@@ -60,6 +118,62 @@ def expand_env_vars_in_config(config: Any) -> Any:
         return config
 
 
+class ServerConfigResolver:
+    """Expands ${VAR} placeholders in a server's env and headers.
+
+    The templates are parsed when the resolver is created (once per config
+    load). resolve() returns a cached expanded copy of the config and only
+    re-expands when one of the referenced variables has changed in
+    os.environ since the previous call.
+
+    Attributes:
+        config: The unexpanded server configuration
+
+    Example:
+        resolver = ServerConfigResolver(config)
+        params = StdioServerParameters(command=..., env=resolver.resolve().env)
+    """
+
+    def __init__(self, config: ServerConfig) -> None:
+        """Parse the env and header templates of config."""
+        self.config = config
+        self._env = {key: compile_env_template(value) for key, value in (config.env or {}).items()}
+        self._headers = {
+            key: compile_env_template(value) for key, value in (config.headers or {}).items()
+        }
+        self._variables = tuple(
+            sorted(
+                {
+                    name
+                    for template in (*self._env.values(), *self._headers.values())
+                    for name in template.variables
+                }
+            )
+        )
+        self._environ_key: tuple[str | None, ...] | None = None
+        self._resolved: ServerConfig | None = None
+
+    def resolve(self) -> ServerConfig:
+        """Return the config with env and headers expanded against os.environ.
+
+        Returns:
+            The original config if it has no placeholders, otherwise an
+            expanded copy (reused until a referenced variable changes)
+        """
+        if not self._variables:
+            return self.config
+        environ_key = tuple(os.environ.get(name) for name in self._variables)
+        if self._resolved is None or environ_key != self._environ_key:
+            update: dict[str, Any] = {}
+            if self.config.env is not None:
+                update["env"] = {key: t.expand() for key, t in self._env.items()}
+            if self.config.headers is not None:
+                update["headers"] = {key: t.expand() for key, t in self._headers.items()}
+            self._resolved = self.config.model_copy(update=update)
+            self._environ_key = environ_key
+        return self._resolved
+
+
 def load_project_env(start_path: Path | None = None) -> bool:
     """Load .env file from project root, with global fallback.
 
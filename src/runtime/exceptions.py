@@ -21,6 +21,25 @@ class ServerConnectionError(McpExecutionError):
     pass
 
 
+class DaemonUnavailableError(ServerConnectionError):
+    """Raised when the MCP connection daemon cannot be reached.
+
+    Callers treat this as a signal to fall back to in-process connections.
+    """
+
+    pass
+
+
+class CircuitOpenError(ServerConnectionError):
+    """Raised instead of calling a server whose circuit breaker is open.
+
+    The server failed repeatedly; calls fail fast until its reset timeout
+    has passed and a probe call succeeds.
+    """
+
+    pass
+
+
 class ToolNotFoundError(McpExecutionError):
     """Raised when a requested tool does not exist on any configured server.
 
@@ -4,18 +4,18 @@ Generate test parameters for MCP tools using Claude LLM.
 This module uses Claude to generate reasonable test parameters from tool
 inputSchemas, enabling automatic discovery configuration generation.
 It also classifies tools by safety (SAFE/DANGEROUS/UNKNOWN) based on patterns
-and descriptions.
+and descriptions (see tool_safety).
 """
 
 import argparse
 import json
 import logging
-import re
 import subprocess
-from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from .tool_safety import ToolSafety, classify_tool
+
 try:
     import anthropic
     from anthropic.types import TextBlock
@@ -26,112 +26,6 @@ except ImportError:
 logger = logging.getLogger("mcp_execution.generate_test_params")
 
 
-class ToolSafety(str, Enum):
-    """Safety classification for tools."""
-
-    SAFE = "safe"
-    DANGEROUS = "dangerous"
-    UNKNOWN = "unknown"
-
-
-# Regex patterns for tool classification
-SAFE_PATTERNS = [
-    r"^get_",
-    r"^list_",
-    r"^search_",
-    r"^describe_",
-    r"^fetch",
-    r"^read_",
-    r"^show_",
-    r"^view_",
-    r"^find_",
-    r"^query_",
-]
-
-DANGEROUS_PATTERNS = [
-    r"^delete_",
-    r"^remove_",
-    r"^drop_",
-    r"^destroy_",
-    r"^kill_",
-    r"^create_.*table",
-    r"^update_",
-    r"^write_",
-    r"^execute_",
-    r"^run_",
-    r"^modify_",
-    r"^set_",
-    r"^put_",
-    r"^post_",
-]
-
-SAFE_KEYWORDS = [
-    "get",
-    "list",
-    "read",
-    "fetch",
-    "search",
-    "query",
-    "show",
-    "view",
-    "find",
-    "describe",
-]
-
-DANGEROUS_KEYWORDS = [
-    "delete",
-    "remove",
-    "drop",
-    "destroy",
-    "kill",
-    "update",
-    "write",
-    "execute",
-    "modify",
-    "truncate",
-]
-
-
-def classify_tool(tool_name: str, description: str | None = None) -> ToolSafety:
-    """
-    Classify a tool as SAFE, DANGEROUS, or UNKNOWN based on patterns and description.
-
-    Classification strategy:
-    1. Check description for dangerous keywords (overrides all else)
-    2. Check against explicit regex patterns
-    3. Fall back to description keywords
-    4. Default to UNKNOWN if no signals
-
-    Args:
-        tool_name: Name of the tool
-        description: Optional tool description
-
-    Returns:
-        ToolSafety classification
-    """
-    # First priority: dangerous keywords in description override everything
-    if description:
-        desc_lower = description.lower()
-        if any(kw in desc_lower for kw in DANGEROUS_KEYWORDS):
-            return ToolSafety.DANGEROUS
-
-    # Check dangerous patterns (high priority)
-    if any(re.match(pattern, tool_name, re.IGNORECASE) for pattern in DANGEROUS_PATTERNS):
-        return ToolSafety.DANGEROUS
-
-    # Check safe patterns
-    if any(re.match(pattern, tool_name, re.IGNORECASE) for pattern in SAFE_PATTERNS):
-        return ToolSafety.SAFE
-
-    # Fall back to description safe keywords
-    if description:
-        desc_lower = description.lower()
-        if any(kw in desc_lower for kw in SAFE_KEYWORDS):
-            return ToolSafety.SAFE
-
-    return ToolSafety.UNKNOWN
-
-
 def _load_prompt_template() -> str:
     """Load the prompt template from src/prompts/generate_test_params.txt."""
     # Get the directory where this module is located
@@ -5,24 +5,77 @@ This module implements the progressive disclosure pattern by generating
 Pydantic models and wrapper functions for each MCP tool.
 """
 
+import argparse
 import asyncio
 import logging
+import sys
+import textwrap
+import time
 from pathlib import Path
 from typing import Any
 
-from .config import McpConfig
+from .config import ServerConfig
+from .config_loader import get_config_cache, load_mcp_config
+from .env_utils import ServerConfigResolver
+from .exceptions import ConfigurationError
+from .http_transport import http_transport_kwargs
+from .mcp_client import DEFAULT_SERVER_CONCURRENCY, DEFAULT_SERVER_TIMEOUT, open_stdio_server
+from .normalize_fields import get_normalization_strategy
 from .schema_utils import (
+    SchemaCompiler,
     generate_pydantic_model,
     sanitize_name,
 )
+from .stdio_pool import get_stdio_pool
+from .wrapper_manifest import (
+    DEFAULT_TARGET,
+    MANIFEST_FILE,
+    TARGETS,
+    ManifestDiff,
+    WrapperManifest,
+    diff_tools,
+)
 
 logger = logging.getLogger("mcp_execution.generate_wrappers")
 
+# Outcomes of generating one server's wrappers, in summary order
+STATUSES = ("generated", "unchanged", "drifted", "failed", "skipped")
+
+# Imports at the top of every generated module
+MODULE_IMPORTS = [
+    "from typing import Any, Dict, List, Optional, Union",
+    "from pydantic import BaseModel, Field",
+    "from typing import Literal",
+]
+
+
+def params_model_name(tool_name: str) -> str:
+    """Return the class name of a tool's params model (e.g. GitStatusParams)."""
+    return f"{sanitize_name(tool_name).title().replace('_', '')}Params"
+
+
+def runtime_imports(server_name: str) -> list[str]:
+    """Return the runtime imports of a server's generated modules.
+
+    Wrappers import what they call once, at module level. Servers whose
+    normalization strategy is "none" do not import normalize_field_names.
+    """
+    imports = ["from runtime.mcp_client import call_mcp_tool"]
+    if get_normalization_strategy(server_name) != "none":
+        imports.append("from runtime.normalize_fields import normalize_field_names")
+    return imports
+
 
 def generate_tool_wrapper(server_name: str, tool_name: str, tool: Any) -> str:
     """
     Generate Python wrapper function for a tool.
 
+    The wrapper accepts either its params model or a plain dict keyed by
+    the tool's argument names. Dicts skip building a model and dumping it:
+    they are validated strictly by the model's compiled validator and sent
+    as given. Results are normalized only if the server's normalization
+    strategy (at generation time) is not "none".
+
     Args:
         server_name: Name of the MCP server
         tool_name: Name of the tool
@@ -33,138 +86,232 @@ def generate_tool_wrapper(server_name: str, tool_name: str, tool: Any) -> str:
 
     Example output:
         ```python
-        async def git_status(params: GitStatusParams) -> Dict[str, Any]:
+        _ARGUMENT_NAMES = frozenset(...)
+        _validate_arguments = GitStatusParams.__pydantic_validator__.validate_python
+
+
+        async def git_status(params: Union[GitStatusParams, Dict[str, Any]]) -> Dict[str, Any]:
             '''Get git repository status'''
-            from runtime.mcp_client import call_mcp_tool
-            from runtime.normalize_fields import normalize_field_names
+            if isinstance(params, dict):
+                arguments = {k: v for k, v in params.items() if k in _ARGUMENT_NAMES ...}
+                _validate_arguments(arguments, strict=True)
+            else:
+                arguments = params.model_dump(exclude_none=True, by_alias=True)
 
-            result = await call_mcp_tool("git__git_status", params.model_dump())
-            normalized = normalize_field_names(result, "git")
-            return GitStatusResult.model_validate(normalized)
+            result = await call_mcp_tool("git__git_status", arguments)
+            return getattr(result, "value", result)
         ```
     """
     safe_tool_name = sanitize_name(tool_name)
     tool_identifier = f"{server_name}__{tool_name}"
 
     # Get tool description
-    description = getattr(tool, "description", "MCP tool wrapper")
+    description = getattr(tool, "description", None) or "MCP tool wrapper"
     description_escaped = description.replace('"""', '\\"\\"\\"')
 
     # Generate parameter model name
-    params_model = f"{safe_tool_name.title().replace('_', '')}Params"
+    params_model = params_model_name(tool_name)
+
+    if get_normalization_strategy(server_name) != "none":
+        result_code = f'''
+    # Apply field normalization
+    normalized = normalize_field_names(unwrapped, "{server_name}")
+
+    return normalized'''
+    else:
+        result_code = """
+    # Normalization strategy is "none": results are returned as is
+    return unwrapped"""
 
     # Generate wrapper function
     wrapper = f'''
-async def {safe_tool_name}(params: {params_model}) -> Dict[str, Any]:
+# Argument names the tool accepts, and the compiled validator for dict params
+_ARGUMENT_NAMES = frozenset(
+    field.alias or name for name, field in {params_model}.model_fields.items()
+)
+_validate_arguments = {params_model}.__pydantic_validator__.validate_python
+
+
+async def {safe_tool_name}(params: Union[{params_model}, Dict[str, Any]]) -> Dict[str, Any]:
     """
     {description_escaped}
 
     Args:
-        params: Tool parameters
+        params: Tool parameters as {params_model}, or as a dict keyed by
+            the tool's argument names (validated strictly and sent as
+            given, without unknown keys and None values)
 
     Returns:
         Tool execution result
     """
-    from runtime.mcp_client import call_mcp_tool
-    from runtime.normalize_fields import normalize_field_names
+    if isinstance(params, dict):
+        arguments = {{k: v for k, v in params.items() if k in _ARGUMENT_NAMES and v is not None}}
+        _validate_arguments(arguments, strict=True)
+    else:
+        arguments = params.model_dump(exclude_none=True, by_alias=True)
 
     # Call tool
-    result = await call_mcp_tool("{tool_identifier}", params.model_dump(exclude_none=True))
+    result = await call_mcp_tool("{tool_identifier}", arguments)
 
     # Defensive unwrapping
     unwrapped = getattr(result, "value", result)
-
-    # Apply field normalization
-    normalized = normalize_field_names(unwrapped, "{server_name}")
-
-    return normalized
+{result_code}
 '''
 
     return wrapper
 
 
-def generate_params_model(tool_name: str, tool: Any) -> str:
+def generate_params_model(
+    tool_name: str, tool: Any, compiler: SchemaCompiler | None = None
+) -> str:
     """
     Generate Pydantic model for tool parameters.
 
     Args:
         tool_name: Name of the tool
         tool: Tool definition from MCP
+        compiler: Compiler shared by the models of one module (default: a
+            new one)
 
     Returns:
-        Python code for Pydantic params model
+        Python code for Pydantic params model, preceded by the nested
+        models it uses
     """
-    safe_tool_name = sanitize_name(tool_name)
-    model_name = f"{safe_tool_name.title().replace('_', '')}Params"
+    model_name = params_model_name(tool_name)
 
     # Get input schema
     input_schema = getattr(tool, "inputSchema", {})
 
     if not input_schema or input_schema.get("type") != "object":
         # No parameters
-        return f'''
-class {model_name}(BaseModel):
-    """Parameters for {tool_name}."""
-    pass
-'''
+        return generate_pydantic_model(model_name, {}, f"Parameters for {tool_name}.", compiler)
 
     description = f"Parameters for {tool_name}"
-    return generate_pydantic_model(model_name, input_schema, description)
+    return generate_pydantic_model(model_name, input_schema, description, compiler)
 
 
-def generate_server_module(server_name: str, tools: list[Any], output_dir: Path) -> None:
+def generate_tool_module(server_name: str, tool: Any) -> str:
     """
-    Generate complete module for a server's tools.
+    Generate the module for one tool: its params model and wrapper.
 
-    Creates:
-    - Individual tool files (servers/{server_name}/{tool_name}.py)
-    - Barrel export (__init__.py)
-    - README.md
+    Args:
+        server_name: Name of the MCP server
+        tool: Tool definition from MCP
+
+    Returns:
+        Python code of servers/{server_name}/{tool_name}.py
+    """
+    imports = [*MODULE_IMPORTS, "", *runtime_imports(server_name)]
+    params_model = generate_params_model(tool.name, tool)
+    wrapper_func = generate_tool_wrapper(server_name, tool.name, tool)
+    return "\n".join(imports) + "\n\n\n" + params_model + "\n\n" + wrapper_func
+
+
+def generate_server_bundle(server_name: str, tools: list[Any]) -> str:
+    """
+    Generate a single module holding all of a server's wrappers.
+
+    Each tool's params model and wrapper are defined inside a builder
+    function. The module's ``__getattr__`` runs a tool's builder the first
+    time the wrapper or its params model is accessed, so importing the
+    server (or one tool from it) compiles one module and builds only the
+    Pydantic models actually used. Nested models are shared by all tools
+    of the server; each has a cached builder run by the builders of the
+    models using it.
 
     Args:
         server_name: Name of the MCP server
         tools: List of tool definitions
-        output_dir: Output directory (servers/)
+
+    Returns:
+        Python code of servers/{server_name}/__init__.py
     """
-    server_dir = output_dir / server_name
-    server_dir.mkdir(parents=True, exist_ok=True)
+    params_models = {params_model_name(tool.name) for tool in tools}
+    compiler = SchemaCompiler(reserved=params_models)
+    for tool in tools:
+        generate_params_model(tool.name, tool, compiler)
+
+    def model_body(model_name: str) -> str:
+        uses = [f"{dep} = _model_{dep}()" for dep in compiler.dependencies(model_name)]
+        return "\n".join([*uses, compiler.code(model_name)])
+
+    builders = [
+        f"@cache\ndef _model_{name}():\n"
+        + textwrap.indent(model_body(name), "    ")
+        + f"\n\n    return {name}\n"
+        for name in compiler.model_names
+        if name not in params_models
+    ]
+    exports = {}
+    for tool in tools:
+        safe_tool_name = sanitize_name(tool.name)
+        params_model = params_model_name(tool.name)
+        body = model_body(params_model) + "\n" + generate_tool_wrapper(
+            server_name, tool.name, tool
+        )
+        builders.append(
+            f"def _build_{safe_tool_name}():\n"
+            + textwrap.indent(body.strip("\n"), "    ")
+            + f'\n\n    return {{"{safe_tool_name}": {safe_tool_name}, '
+            f'"{params_model}": {params_model}}}\n'
+        )
+        exports[safe_tool_name] = exports[params_model] = f"_build_{safe_tool_name}"
+
+    tool_names = [sanitize_name(tool.name) for tool in tools]
+    registry = "\n".join(f'    "{name}": {builder},' for name, builder in exports.items())
+    return f'''"""{server_name} MCP tool wrappers.
+
+Models and wrappers are built on first access (see __getattr__).
+"""
 
-    logger.info(f"Generating wrappers for server: {server_name} ({len(tools)} tools)")
+from functools import cache
+{chr(10).join(MODULE_IMPORTS)}
 
-    imports = [
-        "from typing import Any, Dict, List, Optional",
-        "from pydantic import BaseModel, Field",
-        "from typing import Literal",
-    ]
+{chr(10).join(runtime_imports(server_name))}
 
-    tool_names = []
 
-    for tool in tools:
-        tool_name = sanitize_name(tool.name)
-        tool_names.append(tool_name)
+{(chr(10) * 2).join(builders)}
+
+_BUILDERS = {{
+{registry}
+}}
+
+__all__ = {tool_names}
+
 
-        # Generate tool file
-        tool_file = server_dir / f"{tool_name}.py"
+def __getattr__(name: str) -> Any:
+    builder = _BUILDERS.get(name)
+    if builder is None:
+        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+    exported = builder()
+    for value in exported.values():
+        value.__qualname__ = value.__name__
+    globals().update(exported)
+    return exported[name]
 
-        # Generate models and wrapper
-        params_model = generate_params_model(tool.name, tool)
-        wrapper_func = generate_tool_wrapper(server_name, tool.name, tool)
 
-        # Write tool file
-        tool_code = "\n".join(imports) + "\n\n" + params_model + "\n" + wrapper_func
+def __dir__() -> List[str]:
+    return sorted({{*globals(), *_BUILDERS}})
+'''
+
+
+def generate_server_index(server_name: str, tools: list[Any]) -> dict[str, str]:
+    """
+    Generate a server's barrel export and README.
+
+    Args:
+        server_name: Name of the MCP server
+        tools: List of tool definitions
 
-        tool_file.write_text(tool_code)
-        logger.debug(f"Generated: {tool_file}")
+    Returns:
+        File name -> content for __init__.py and README.md
+    """
+    tool_names = [sanitize_name(tool.name) for tool in tools]
 
-    # Generate __init__.py (barrel export)
-    init_file = server_dir / "__init__.py"
     init_imports = [f"from .{name} import {name}" for name in tool_names]
     init_all = f"__all__ = {tool_names}"
     init_content = "\n".join(init_imports) + "\n\n" + init_all
-    init_file.write_text(init_content)
 
-    # Generate README.md
-    readme_file = server_dir / "README.md"
     readme_content = f"""# {server_name} MCP Tools
 
 Auto-generated wrappers for {server_name} MCP server.
@@ -187,150 +334,396 @@ result = await {tool_names[0] if tool_names else 'tool_name'}(params)
 
 **Note**: This file is auto-generated. Do not edit manually.
 """
-    readme_file.write_text(readme_content)
+    return {"__init__.py": init_content, "README.md": readme_content}
+
 
+def _has_content(path: Path, content: str) -> bool:
+    """Return True if path exists and holds exactly content."""
+    try:
+        return path.read_text() == content
+    except OSError:
+        return False
 
-async def generate_wrappers(config_path: Path | None = None) -> None:
+
+def generate_server_module(
+    server_name: str,
+    tools: list[Any],
+    output_dir: Path,
+    check: bool = False,
+    target: str | None = None,
+) -> ManifestDiff:
     """
-    Main wrapper generation orchestrator.
+    Generate complete module for a server's tools.
 
-    1. Load config from global + project (merged, project overrides)
-    2. For each server:
-       a. Connect and list tools
-       b. Generate wrappers
-       c. Write to servers/{server}/
-    3. Generate top-level __init__.py
+    Creates, for the "package" target:
+    - Individual tool files (servers/{server_name}/{tool_name}.py)
+    - Barrel export (__init__.py)
+    - README.md
+    - Manifest of tool hashes (.manifest.json)
+
+    The "bundle" target puts all wrappers in __init__.py instead, building
+    each one on first access (see generate_server_bundle).
+
+    Only wrappers of tools that are new or changed since the manifest was
+    written are regenerated, and wrappers of tools the server no longer
+    lists are deleted. Files whose content would not change are left
+    untouched, so their mtimes and bytecode caches stay valid.
 
     Args:
-        config_path: Path to config file. If provided, uses only that file.
-                    Otherwise merges global (~/.claude/mcp_config.json) with
-                    project config (.mcp.json or mcp_config.json)
+        server_name: Name of the MCP server
+        tools: List of tool definitions
+        output_dir: Output directory (servers/)
+        check: Only compute the differences, writing nothing
+        target: "package" or "bundle" (default: the target the server's
+            wrappers were last generated for, else "package")
+
+    Returns:
+        The differences between the tools and the wrappers on disk
+        (before they were updated)
     """
-    logger.info("Starting wrapper generation...")
+    server_dir = output_dir / server_name
+    previous = WrapperManifest.load(server_dir)
+    if target is None:
+        target = previous.target if previous is not None else DEFAULT_TARGET
+    if target not in TARGETS:
+        raise ConfigurationError(f"Unknown wrapper target '{target}' (expected one of {TARGETS})")
+
+    def tool_path(tool_name: str) -> Path:
+        return server_dir / f"{sanitize_name(tool_name)}.py"
+
+    def wrapper_path(tool_name: str) -> Path:
+        return server_dir / "__init__.py" if target == "bundle" else tool_path(tool_name)
+
+    current = WrapperManifest.for_tools(tools, target, get_normalization_strategy(server_name))
+    diff = diff_tools(previous, current, wrapper_path)
+    files = generate_server_index(server_name, tools)
+    if target == "bundle":
+        files["__init__.py"] = generate_server_bundle(server_name, tools)
+    files[MANIFEST_FILE] = current.to_json()
+    diff.stale_files = [
+        name for name, content in files.items() if not _has_content(server_dir / name, content)
+    ]
 
-    import aiofiles
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
-
-    # Load config with merging support
-    if config_path:
-        if not config_path.exists():
-            logger.error(f"Config file not found: {config_path}")
-            return
-        logger.info(f"Using explicit config: {config_path}")
-        async with aiofiles.open(config_path) as f:
-            content = await f.read()
-        config = McpConfig.model_validate_json(content)
-    else:
-        # Config merging: global + project (project overrides)
-        mcp_json = Path.cwd() / ".mcp.json"
-        mcp_config_json = Path.cwd() / "mcp_config.json"
-        global_config = Path.home() / ".claude" / "mcp_config.json"
-
-        global_cfg: McpConfig | None = None
-        project_cfg: McpConfig | None = None
-
-        # Load global config if exists
-        if global_config.exists():
-            try:
-                async with aiofiles.open(global_config) as f:
-                    content = await f.read()
-                global_cfg = McpConfig.model_validate_json(content)
-                logger.info(f"Loaded global config: {global_config} ({len(global_cfg.mcpServers)} servers)")
-            except Exception as e:
-                logger.warning(f"Failed to load global config {global_config}: {e}")
-
-        # Load project config if exists
-        project_config_file = None
-        if mcp_json.exists():
-            project_config_file = mcp_json
-        elif mcp_config_json.exists():
-            project_config_file = mcp_config_json
-
-        if project_config_file:
-            try:
-                async with aiofiles.open(project_config_file) as f:
-                    content = await f.read()
-                project_cfg = McpConfig.model_validate_json(content)
-                logger.info(f"Loaded project config: {project_config_file} ({len(project_cfg.mcpServers)} servers)")
-            except Exception as e:
-                logger.error(f"Failed to load project config {project_config_file}: {e}")
-                return
-
-        # Merge configs (project overrides global)
-        if global_cfg and project_cfg:
-            config = global_cfg.merge(project_cfg)
-            logger.info(f"Merged configs: {len(config.mcpServers)} servers total")
-        elif project_cfg:
-            config = project_cfg
-        elif global_cfg:
-            config = global_cfg
-        else:
-            logger.error("No config file found. Expected .mcp.json or mcp_config.json, or global ~/.claude/mcp_config.json")
-            return
+    if check or not diff.has_changes:
+        logger.info(f"Wrappers for server {server_name}: {diff.summary()}")
+        return diff
 
-    # Output directory
-    output_dir = Path(__file__).parent.parent.parent / "servers"
-    output_dir.mkdir(exist_ok=True)
+    logger.info(f"Generating wrappers for server: {server_name} ({diff.summary()})")
+    server_dir.mkdir(parents=True, exist_ok=True)
+
+    tools_by_name = {tool.name: tool for tool in tools}
+    if target == "package":
+        for tool_name in diff.added + diff.changed:
+            tool_file = tool_path(tool_name)
+            tool_code = generate_tool_module(server_name, tools_by_name[tool_name])
+            # Wrappers generated before manifests existed may already be current
+            if not _has_content(tool_file, tool_code):
+                tool_file.write_text(tool_code)
+                logger.debug(f"Generated: {tool_file}")
+
+    # Per-tool files of removed tools, or of all tools when switching to a bundle
+    if previous is not None and previous.target == "package":
+        current_files = {wrapper_path(tool.name) for tool in tools}
+        for tool_name in previous.tools:
+            tool_file = tool_path(tool_name)
+            if tool_file not in current_files and tool_file.exists():
+                tool_file.unlink()
+                logger.debug(f"Removed: {tool_file}")
+
+    for name in diff.stale_files:
+        (server_dir / name).write_text(files[name])
+    return diff
+
+
+class ServerGenerationResult:
+    """Outcome of generating one server's wrappers.
+
+    Attributes:
+        server_name: Name of the MCP server
+        status: "generated" (files written), "unchanged", "drifted" (--check
+            found differences), "failed" or "skipped"
+        tool_count: Number of tools found
+        connect_seconds: Time spent connecting and listing tools
+        write_seconds: Time spent generating and writing files
+        error: Failure or skip reason, if any
+        changes: Summary of added, changed and removed wrappers, if any
+    """
+
+    def __init__(
+        self,
+        server_name: str,
+        status: str,
+        tool_count: int = 0,
+        connect_seconds: float = 0.0,
+        write_seconds: float = 0.0,
+        error: str | None = None,
+        changes: str | None = None,
+    ) -> None:
+        """Record a server's outcome."""
+        self.server_name = server_name
+        self.status = status
+        self.tool_count = tool_count
+        self.connect_seconds = connect_seconds
+        self.write_seconds = write_seconds
+        self.error = error
+        self.changes = changes
+
+
+async def list_server_tools(server_name: str, server_config: ServerConfig) -> list[Any]:
+    """Connect to a server and list its tools.
+
+    Stdio servers come from the process-wide pool, so a server already
+    running for a client manager in this process is reused.
 
-    # Generate for each server
-    for server_name, server_config in config.mcpServers.items():
+    Args:
+        server_name: Name of the MCP server
+        server_config: Server configuration with placeholders resolved
+
+    Returns:
+        The server's tool definitions
+
+    Raises:
+        ConfigurationError: If the transport type is unsupported
+        Exception: Whatever connecting or listing raises
+    """
+    if server_config.type == "stdio":
+        pool = get_stdio_pool()
+        pooled = await pool.acquire(server_name, server_config, open_stdio_server)
         try:
-            if server_config.disabled:
-                logger.info(f"Skipping disabled server: {server_name}")
-                continue
+            return (await pooled.client.list_tools()).tools
+        finally:
+            await pool.release(pooled)
+
+    from mcp import ClientSession
+
+    # Create appropriate client based on transport type
+    if server_config.type == "sse":
+        from mcp.client.sse import sse_client
+        client_ctx = sse_client(
+            url=server_config.url,
+            headers=server_config.headers or {},
+            **http_transport_kwargs(server_config.http),
+        )
+    elif server_config.type == "http":
+        from mcp.client.streamable_http import streamablehttp_client
+        client_ctx = streamablehttp_client(
+            url=server_config.url,
+            headers=server_config.headers or {},
+            **http_transport_kwargs(server_config.http),
+        )
+    else:
+        raise ConfigurationError(f"Unsupported transport type '{server_config.type}'")
+
+    # Connect and list tools using proper context manager pattern
+    async with client_ctx as streams:
+        # Handle different return signatures
+        read, write = streams[0], streams[1]
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            return (await session.list_tools()).tools
+
+
+async def _generate_server(
+    server_name: str,
+    server_config: ServerConfig,
+    output_dir: Path,
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+    check: bool = False,
+    target: str | None = None,
+) -> ServerGenerationResult:
+    """Introspect one server and write its wrappers, never raising.
+
+    Only introspection holds a pool slot; files are written in a worker
+    thread after the slot is released, so they overlap with other servers
+    still connecting. With check, wrappers are only compared.
+    """
+    if server_config.disabled:
+        logger.info(f"Skipping disabled server: {server_name}")
+        return ServerGenerationResult(server_name, "skipped", error="disabled")
 
+    start = time.perf_counter()
+    try:
+        async with semaphore:
             logger.info(f"Connecting to server: {server_name} (transport: {server_config.type})")
+            # Substitute environment variable placeholders in env and headers
+            server_config = ServerConfigResolver(server_config).resolve()
+            tools = await asyncio.wait_for(list_server_tools(server_name, server_config), timeout)
+    except Exception as e:
+        if isinstance(e, TimeoutError):
+            e = TimeoutError(f"timed out after {timeout:.0f}s")
+        logger.error(f"Failed to generate wrappers for {server_name}: {e}")
+        return ServerGenerationResult(
+            server_name, "failed", connect_seconds=time.perf_counter() - start, error=str(e)
+        )
+    connect_seconds = time.perf_counter() - start
+    logger.info(f"Found {len(tools)} tools for {server_name}")
+
+    start = time.perf_counter()
+    try:
+        diff = await asyncio.to_thread(
+            generate_server_module, server_name, tools, output_dir, check, target
+        )
+    except Exception as e:
+        logger.error(f"Failed to write wrappers for {server_name}: {e}")
+        return ServerGenerationResult(
+            server_name, "failed", len(tools), connect_seconds, time.perf_counter() - start, str(e)
+        )
+    if not diff.has_changes:
+        status = "unchanged"
+    else:
+        status = "drifted" if check else "generated"
+    return ServerGenerationResult(
+        server_name,
+        status,
+        len(tools),
+        connect_seconds,
+        time.perf_counter() - start,
+        changes=diff.summary() if diff.has_changes else None,
+    )
 
-            # Create appropriate client based on transport type
-            if server_config.type == "stdio":
-                from mcp.client.stdio import stdio_client
-                server_params = StdioServerParameters(
-                    command=server_config.command,
-                    args=server_config.args,
-                    env=server_config.env,
-                )
-                client_ctx = stdio_client(server_params)
-            elif server_config.type == "sse":
-                from mcp.client.sse import sse_client
-                client_ctx = sse_client(url=server_config.url, headers=server_config.headers or {})
-            elif server_config.type == "http":
-                from mcp.client.streamable_http import streamablehttp_client
-                client_ctx = streamablehttp_client(url=server_config.url, headers=server_config.headers or {})
-            else:
-                logger.warning(f"Skipping {server_name}: unsupported transport type '{server_config.type}'")
-                continue
 
-            # Connect and list tools using proper context manager pattern
-            async with client_ctx as streams:
-                # Handle different return signatures
-                if server_config.type == "http":
-                    read, write, _get_session_id = streams
-                else:
-                    read, write = streams
+def format_generation_summary(results: list[ServerGenerationResult]) -> str:
+    """Format per-server outcomes as an aligned table.
 
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
+    Args:
+        results: Outcomes in configuration order
 
-                    # List tools
-                    tools_response = await session.list_tools()
-                    tools = tools_response.tools
-                    logger.info(f"Found {len(tools)} tools for {server_name}")
+    Returns:
+        Multi-line summary ending with the number of servers per status
+    """
+    width = max((len(r.server_name) for r in results), default=6)
+    lines = [f"{'server':<{width}}  {'status':<9}  {'tools':>5}  {'connect':>8}  {'write':>7}"]
+    for r in results:
+        line = (
+            f"{r.server_name:<{width}}  {r.status:<9}  {r.tool_count:>5}  "
+            f"{r.connect_seconds:>7.2f}s  {r.write_seconds:>6.2f}s"
+        )
+        if r.error or r.changes:
+            line += f"  {r.error or r.changes}"
+        lines.append(line)
+    counts = {status: sum(r.status == status for r in results) for status in STATUSES}
+    lines.append(", ".join(f"{count} {status}" for status, count in counts.items() if count))
+    return "\n".join(lines)
+
+
+async def generate_wrappers(
+    config_path: Path | None = None,
+    output_dir: Path | None = None,
+    concurrency: int = DEFAULT_SERVER_CONCURRENCY,
+    timeout: float = DEFAULT_SERVER_TIMEOUT,
+    check: bool = False,
+    target: str | None = None,
+) -> list[ServerGenerationResult]:
+    """
+    Main wrapper generation orchestrator.
 
-                    # Generate wrappers
-                    generate_server_module(server_name, tools, output_dir)
+    1. Load config from global + project (merged, project overrides)
+    2. For all servers concurrently (at most ``concurrency`` connecting at once):
+       a. Connect and list tools
+       b. Regenerate new or changed wrappers in servers/{server}/ and
+          delete removed ones (in a worker thread, while other servers are
+          still connecting)
+    3. Log a per-server summary of timings, changes and failures
+
+    A failing or slow server does not affect the others.
+
+    Args:
+        config_path: Path to config file. If provided, uses only that file.
+                    Otherwise merges global (~/.claude/mcp_config.json) with
+                    project config (.mcp.json or mcp_config.json)
+        output_dir: Output directory (default: servers/ in the repository)
+        concurrency: Maximum number of servers introspected at once
+        timeout: Seconds each server may take to connect and list its tools
+        check: Report servers whose wrappers drifted from their tools
+            ("drifted" status) without writing anything
+        target: "package" (one file per tool) or "bundle" (one lazily
+            loading module per server); default: each server's current target
 
-        except Exception as e:
-            logger.error(f"Failed to generate wrappers for {server_name}: {e}")
-            # Continue with other servers
-            continue
+    Returns:
+        One result per configured server, in configuration order (empty if
+        the configuration could not be loaded)
+    """
+    logger.info("Starting wrapper generation...")
+
+    # Load config with merging support (shared with McpClientManager.initialize)
+    try:
+        config = await load_mcp_config(config_path, cache=get_config_cache())
+    except ConfigurationError as e:
+        logger.error(str(e))
+        return []
+
+    # Output directory
+    if output_dir is None:
+        output_dir = Path(__file__).parent.parent.parent / "servers"
+    if not check:
+        output_dir.mkdir(exist_ok=True)
+
+    start = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    results = list(
+        await asyncio.gather(
+            *(
+                _generate_server(
+                    server_name, server_config, output_dir, semaphore, timeout, check, target
+                )
+                for server_name, server_config in config.mcpServers.items()
+            )
+        )
+    )
 
-    logger.info("Wrapper generation complete!")
+    logger.info(
+        f"Wrapper generation complete in {time.perf_counter() - start:.2f}s\n"
+        + format_generation_summary(results)
+    )
+    return results
 
 
 def main() -> None:
     """CLI entry point."""
-    asyncio.run(generate_wrappers())
+    parser = argparse.ArgumentParser(description="Generate typed wrappers for MCP server tools")
+    parser.add_argument("--config", type=Path, default=None, help="Use only this config file")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_SERVER_CONCURRENCY,
+        help="Maximum servers introspected at once",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_SERVER_TIMEOUT,
+        help="Seconds each server may take to connect and list tools",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Report wrappers that differ from the servers' tools without writing; "
+        "exit with status 1 if any drifted or a server failed",
+    )
+    parser.add_argument(
+        "--target",
+        choices=TARGETS,
+        default=None,
+        help="Generate one file per tool (package) or one lazily loading module per "
+        "server (bundle); default: keep each server's current target",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(levelname)s] %(message)s",
+    )
+    results = asyncio.run(
+        generate_wrappers(
+            args.config,
+            concurrency=args.concurrency,
+            timeout=args.timeout,
+            check=args.check,
+            target=args.target,
+        )
+    )
+    if args.check and any(r.status in ("drifted", "failed") for r in results):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
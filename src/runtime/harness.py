@@ -6,38 +6,139 @@ This harness:
 2. Executes user script with MCP tools available
 3. Handles signals gracefully (SIGINT/SIGTERM)
 4. Cleans up all connections on exit
+5. Writes MCP call metrics as JSON (disable with MCP_METRICS=0)
+
+The MCP SDK is not imported here: mcp_client loads it on the first server
+connection. Pass --profile-startup to print a summary of import costs.
+
+Scripts that define a top-level ``async def main()`` run on the harness's
+persistent event loop: asyncio.run() is routed to that loop, and main() is
+awaited by the harness if the script does not call it itself. MCP sessions
+therefore live and close on a single loop. Other scripts use the legacy
+path, where each asyncio.run() creates its own loop.
+
+Batch mode (--batch) runs many scripts in one process with one warm
+McpClientManager, so servers are spawned once for the whole batch:
+
+    mcp-exec --batch a.py b.py c.py
+    ls skills/*.py | mcp-exec --batch --concurrency 4
 """
 
+import argparse
+import ast
 import asyncio
+import inspect
+import io
 import logging
+import os
 import runpy
 import signal
 import sys
+import threading
+import time
+import traceback
+from collections.abc import Iterable, Iterator
+from concurrent.futures import CancelledError as FutureCancelledError
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, NoReturn
+from typing import Any, NoReturn, TextIO
 
+from .daemon import daemon_routing_active
 from .env_utils import load_project_env
 from .exceptions import McpExecutionError
-from .mcp_client import get_mcp_client_manager
+from .mcp_client import McpClientManager, get_mcp_client_manager
+from .metrics import METRICS_ENV
 
 # Configure logging to stderr
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s", stream=sys.stderr)
 
 logger = logging.getLogger("mcp_execution.harness")
 
+PROFILE_STARTUP_FLAG = "--profile-startup"
+
+# Buffer receiving the output of the batch script running in this context
+_script_output: ContextVar[io.StringIO | None] = ContextVar("_script_output", default=None)
+
+# Per-thread record of whether the running script ran an event loop itself
+# (asyncio.run(), loop.run_until_complete() or loop.run_forever())
+_entry_state = threading.local()
+
+# BaseEventLoop methods replaced by _tracking_loop_entries, and the number of
+# scripts currently relying on the replacement
+_loop_entry_lock = threading.Lock()
+_loop_entry_originals: tuple[Any, Any] | None = None
+_loop_entry_users = 0
 
-def _parse_arguments() -> Path:
+
+def _parse_arguments() -> argparse.Namespace:
     """
     Parse command-line arguments.
 
+    Options must precede the script path(s); in single-script mode anything
+    after the script is left in sys.argv for the script.
+
     Returns:
-        Path to script
+        Parsed arguments with scripts (list of paths), batch, concurrency
+        and profile_startup
     """
-    if len(sys.argv) < 2:
-        logger.error("Usage: python -m runtime.harness <script_path>")
+    parser = argparse.ArgumentParser(
+        prog="mcp-exec", description="Execute MCP-enabled Python scripts"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Run several scripts with one shared MCP client manager. "
+        "Script paths are read from stdin (one per line) when none or '-' is given.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Scripts to run at once in batch mode (default: 1, sequential)",
+    )
+    parser.add_argument(
+        PROFILE_STARTUP_FLAG,
+        action="store_true",
+        help="Summarize import-time cost after the run",
+    )
+    parser.add_argument("scripts", nargs=argparse.REMAINDER, help="Script path(s)")
+    args = parser.parse_args()
+
+    if args.batch:
+        if not args.scripts or args.scripts == ["-"]:
+            args.scripts = _read_manifest(sys.stdin)
+        if args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+    elif not args.scripts:
+        logger.error(f"Usage: python -m runtime.harness [{PROFILE_STARTUP_FLAG}] <script_path>")
         sys.exit(1)
+    else:
+        args.scripts = args.scripts[:1]
 
-    return Path(sys.argv[1]).resolve()
+    args.scripts = [Path(script).resolve() for script in args.scripts]
+    return args
+
+
+def _read_manifest(lines: Iterable[str]) -> list[str]:
+    """
+    Read a batch manifest: one script path per line.
+
+    Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        lines: Manifest lines (e.g. sys.stdin)
+
+    Returns:
+        Script paths in manifest order
+    """
+    scripts = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            scripts.append(line)
+    return scripts
 
 
 class _AsyncgenErrorFilter(logging.Filter):
@@ -131,18 +232,34 @@ def _cancel_all_tasks(loop):
             pass  # Suppress task exceptions during cleanup
 
 
-def _execute_direct(script_path: Path) -> int:
+def _dump_metrics(manager: McpClientManager) -> None:
     """
-    Execute script in direct mode (current process, no sandbox).
+    Write the manager's metrics snapshot as JSON.
+
+    The destination is .claude/cache/mcp-metrics.json (override with
+    MCP_METRICS_FILE). Nothing is written when MCP_METRICS=0 or when no
+    server was contacted.
 
     Args:
-        script_path: Path to Python script
+        manager: Manager whose metrics to dump
+    """
+    if os.environ.get(METRICS_ENV) == "0" or manager.metrics.is_empty():
+        return
 
-    Returns:
-        Exit code
+    try:
+        path = manager.metrics.dump()
+        logger.info(f"MCP metrics written to {path}")
+    except OSError as e:
+        logger.warning(f"Failed to write MCP metrics: {e}")
+
+
+def _prepare_runtime() -> asyncio.AbstractEventLoop:
     """
-    logger.info("=== Direct Mode ===")
+    Set up sys.path and error suppression, and create the persistent loop.
 
+    Returns:
+        The harness's persistent event loop (set as current)
+    """
     # Add project root and src/ to Python path for imports
     src_path = Path(__file__).parent.parent
     if str(src_path) not in sys.path:
@@ -166,16 +283,12 @@ def _execute_direct(script_path: Path) -> int:
     if hasattr(_suppress_asyncgen_errors, "_handler"):
         loop.set_exception_handler(_suppress_asyncgen_errors._handler)
 
-    # Initialize MCP client manager
-    manager = get_mcp_client_manager()
-    try:
-        loop.run_until_complete(manager.initialize())
-        logger.info("MCP client manager initialized")
-    except McpExecutionError as e:
-        logger.error(f"Failed to initialize MCP client: {e}")
-        return 1
+    return loop
+
+
+def _install_signal_handlers() -> None:
+    """Exit with status 130 on SIGINT/SIGTERM (cleanup runs in finally blocks)."""
 
-    # Set up signal handling
     def signal_handler(signum: int, frame: Any) -> None:
         """Handle shutdown signals."""
         signal_name = signal.Signals(signum).name
@@ -185,11 +298,212 @@ def _execute_direct(script_path: Path) -> int:
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
+
+def _shutdown(loop: asyncio.AbstractEventLoop, manager: McpClientManager, exit_code: int) -> int:
+    """
+    Close all MCP connections, write metrics and close the loop.
+
+    Tasks still pending after cleanup (e.g. coroutines of interrupted batch
+    scripts) are cancelled before the loop closes.
+
+    Args:
+        loop: The harness's persistent event loop
+        manager: Manager to clean up
+        exit_code: Exit code so far
+
+    Returns:
+        Exit code (1 if cleanup failed and the run had succeeded)
+    """
+    logger.debug("Cleaning up MCP connections...")
+    try:
+        loop.run_until_complete(manager.cleanup())
+        logger.info("Cleanup complete")
+    except BaseException as e:
+        # Suppress BaseExceptionGroup from async generators
+        if type(e).__name__ == "BaseExceptionGroup":
+            logger.debug("Suppressed BaseExceptionGroup during cleanup")
+        else:
+            logger.error(f"Cleanup failed: {e}", exc_info=True)
+            if exit_code == 0:
+                exit_code = 1
+    finally:
+        _dump_metrics(manager)
+        try:
+            _cancel_all_tasks(loop)
+        except Exception:
+            pass  # Suppress task errors during shutdown
+        # Reset asyncgen hooks before closing loop
+        sys.set_asyncgen_hooks(firstiter=None, finalizer=None)
+        loop.close()
+
+    return exit_code
+
+
+def _has_async_main(script_path: Path) -> bool:
+    """
+    Return True if the script defines a top-level ``async def main()``.
+
+    Args:
+        script_path: Path to Python script
+
+    Returns:
+        True if the script opts into the native async entry point
+    """
+    try:
+        tree = ast.parse(script_path.read_text(encoding="utf-8"), str(script_path))
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        return False
+    return any(
+        isinstance(node, ast.AsyncFunctionDef) and node.name == "main" for node in tree.body
+    )
+
+
+def _run_on_persistent_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Patch asyncio.run to execute coroutines on the harness's persistent loop.
+
+    Unlike asyncio.run, the loop is neither replaced nor closed afterwards and
+    pending tasks (such as MCP transport readers) are left running, so
+    connections opened by one call are reused by the next and cleaned up on
+    the same loop at exit.
+
+    Args:
+        loop: The persistent loop (not running while the script executes)
+    """
+
+    def persistent_run(main, *, debug=None, **kwargs):
+        if loop.is_running():
+            raise RuntimeError("asyncio.run() cannot be called from a running event loop")
+        _entry_state.called_run = True
+        if debug is not None:
+            loop.set_debug(debug)
+        return loop.run_until_complete(main)
+
+    asyncio.run = persistent_run
+
+
+@contextmanager
+def _tracking_loop_entries() -> Iterator[None]:
+    """
+    Record scripts that drive an event loop without asyncio.run().
+
+    While active, BaseEventLoop.run_until_complete and run_forever flag the
+    calling thread, so a script running ``loop.run_until_complete(main())``
+    itself does not get main() awaited a second time by _run_script_entry.
+    Batch scripts overlap, so the methods stay patched while any script runs
+    and are restored when the last one finishes.
+    """
+    global _loop_entry_originals, _loop_entry_users
+
+    with _loop_entry_lock:
+        if _loop_entry_users == 0:
+            original_run_until_complete = asyncio.BaseEventLoop.run_until_complete
+            original_run_forever = asyncio.BaseEventLoop.run_forever
+
+            def run_until_complete(self, future):
+                _entry_state.called_run = True
+                return original_run_until_complete(self, future)
+
+            def run_forever(self):
+                _entry_state.called_run = True
+                return original_run_forever(self)
+
+            _loop_entry_originals = (original_run_until_complete, original_run_forever)
+            asyncio.BaseEventLoop.run_until_complete = run_until_complete
+            asyncio.BaseEventLoop.run_forever = run_forever
+        _loop_entry_users += 1
+
+    try:
+        yield
+    finally:
+        with _loop_entry_lock:
+            _loop_entry_users -= 1
+            if _loop_entry_users == 0 and _loop_entry_originals is not None:
+                (
+                    asyncio.BaseEventLoop.run_until_complete,
+                    asyncio.BaseEventLoop.run_forever,
+                ) = _loop_entry_originals
+                _loop_entry_originals = None
+
+
+def _run_script_entry(script_path: Path) -> None:
+    """
+    Execute a script as __main__, then await its ``async def main()``.
+
+    main() is only invoked by the harness when the script did not already
+    run an event loop itself (asyncio.run(), loop.run_until_complete() or
+    loop.run_forever(), e.g. it has no ``__main__`` guard) and main() takes
+    no required arguments. asyncio.run must be patched to target the shared
+    loop (see _run_on_persistent_loop and _run_on_shared_loop).
+
+    Args:
+        script_path: Path to Python script
+    """
+    _entry_state.called_run = False
+    with _tracking_loop_entries():
+        namespace = runpy.run_path(str(script_path), run_name="__main__")
+    if getattr(_entry_state, "called_run", False):
+        return
+
+    entry = namespace.get("main")
+    if not inspect.iscoroutinefunction(entry):
+        return
+
+    required = [
+        parameter
+        for parameter in inspect.signature(entry).parameters.values()
+        if parameter.default is inspect.Parameter.empty
+        and parameter.kind not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD)
+    ]
+    if required:
+        logger.debug(f"Not awaiting main() of {script_path}: it requires arguments")
+        return
+
+    logger.debug(f"Awaiting main() of {script_path}")
+    asyncio.run(entry())
+
+
+def _execute_direct(script_path: Path) -> int:
+    """
+    Execute script in direct mode (current process, no sandbox).
+
+    Args:
+        script_path: Path to Python script
+
+    Returns:
+        Exit code
+    """
+    logger.info("=== Direct Mode ===")
+
+    loop = _prepare_runtime()
+
+    # Initialize MCP client manager. Background warmup needs the harness loop
+    # to run while the script does, i.e. the async main() path, and is
+    # pointless when a daemon serves the tool calls.
+    native_entry = _has_async_main(script_path)
+    manager = get_mcp_client_manager()
+    try:
+        loop.run_until_complete(
+            manager.initialize(warmup=native_entry and not daemon_routing_active())
+        )
+        logger.info("MCP client manager initialized")
+    except McpExecutionError as e:
+        logger.error(f"Failed to initialize MCP client: {e}")
+        return 1
+
+    # Set up signal handling
+    _install_signal_handlers()
+
     # Execute script
     exit_code = 0
     try:
         logger.info(f"Executing script: {script_path}")
-        runpy.run_path(str(script_path), run_name="__main__")
+        if native_entry:
+            logger.debug("Script defines async main(): running on the harness event loop")
+            _run_on_persistent_loop(loop)
+            _run_script_entry(script_path)
+        else:
+            runpy.run_path(str(script_path), run_name="__main__")
         logger.info("Script execution completed")
 
     except KeyboardInterrupt:
@@ -201,49 +515,244 @@ def _execute_direct(script_path: Path) -> int:
         exit_code = 1
 
     finally:
-        # Cleanup
-        logger.debug("Cleaning up MCP connections...")
-        try:
-            loop.run_until_complete(manager.cleanup())
-            logger.info("Cleanup complete")
-        except BaseException as e:
-            # Suppress BaseExceptionGroup from async generators
-            if type(e).__name__ == "BaseExceptionGroup":
-                logger.debug("Suppressed BaseExceptionGroup during cleanup")
-            else:
-                logger.error(f"Cleanup failed: {e}", exc_info=True)
-                if exit_code == 0:
-                    exit_code = 1
-        finally:
-            # Reset asyncgen hooks before closing loop
-            sys.set_asyncgen_hooks(firstiter=None, finalizer=None)
-            loop.close()
+        exit_code = _shutdown(loop, manager, exit_code)
+
+    return exit_code
+
+
+class ScriptResult:
+    """Outcome of one script in batch mode.
+
+    Attributes:
+        path: Script path
+        exit_code: Exit status (0 success, 1 error, 130 interrupted, or the
+            script's sys.exit() status)
+        elapsed: Wall-clock seconds
+        output: Captured stdout/stderr (concurrent batches only)
+    """
+
+    def __init__(self, path: Path, exit_code: int, elapsed: float, output: str = "") -> None:
+        """Create a result."""
+        self.path = path
+        self.exit_code = exit_code
+        self.elapsed = elapsed
+        self.output = output
+
+
+class _ScriptOutputRouter(io.TextIOBase):
+    """sys.stdout/sys.stderr proxy writing to the current batch script's buffer.
+
+    Writes made outside a captured script (harness, other threads) go to the
+    wrapped stream. Coroutines inherit the capture through the context that
+    asyncio.run_coroutine_threadsafe propagates from the script's thread.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        """Wrap a stream."""
+        self._stream = stream
+
+    def write(self, text: str) -> int:
+        buffer = _script_output.get()
+        return (buffer if buffer is not None else self._stream).write(text)
+
+    def flush(self) -> None:
+        if _script_output.get() is None:
+            self._stream.flush()
+
+    def isatty(self) -> bool:
+        return _script_output.get() is None and self._stream.isatty()
+
+    def fileno(self) -> int:
+        return self._stream.fileno()
+
+    @property
+    def encoding(self) -> str:
+        return self._stream.encoding
+
+
+def _run_on_shared_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Patch asyncio.run to execute coroutines on the harness's running loop.
+
+    Batch scripts run in worker threads. Their asyncio.run(main()) calls
+    submit main() to the shared loop and block the worker until it finishes,
+    so every script talks to the same warm MCP sessions. An ``async def
+    main()`` the script does not run itself is awaited the same way (see
+    _run_script_entry).
+
+    Args:
+        loop: The running persistent loop
+    """
+
+    def shared_run(main, *, debug=None, **kwargs):
+        if threading.get_ident() == loop_thread:
+            raise RuntimeError("asyncio.run() cannot be called from a running event loop")
+        _entry_state.called_run = True
+        return asyncio.run_coroutine_threadsafe(main, loop).result()
+
+    loop_thread = threading.get_ident()
+    asyncio.run = shared_run
+
+
+def _exit_status(code: Any) -> int:
+    """Convert a SystemExit code to an exit status like the interpreter does."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_script(script_path: Path, capture: bool) -> ScriptResult:
+    """
+    Run one batch script to completion in the calling (worker) thread.
+
+    Args:
+        script_path: Path to Python script
+        capture: Buffer the script's stdout/stderr instead of streaming it
+
+    Returns:
+        The script's result
+    """
+    buffer = io.StringIO() if capture else None
+    token = _script_output.set(buffer)
+    start = time.perf_counter()
+    try:
+        _run_script_entry(script_path)
+        exit_code = 0
+    except SystemExit as e:
+        exit_code = _exit_status(e.code)
+    except (KeyboardInterrupt, FutureCancelledError, asyncio.CancelledError):
+        exit_code = 130
+    except Exception:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        _script_output.reset(token)
+
+    output = buffer.getvalue() if buffer is not None else ""
+    return ScriptResult(script_path, exit_code, time.perf_counter() - start, output)
+
+
+async def _run_scripts(script_paths: list[Path], concurrency: int) -> list[ScriptResult]:
+    """
+    Run scripts in worker threads, at most `concurrency` at a time.
+
+    With concurrency > 1 each script's output is captured and printed as one
+    block when the script finishes, so outputs do not interleave.
+
+    Args:
+        script_paths: Scripts to run, in order
+        concurrency: Maximum number of scripts running at once
+
+    Returns:
+        Results in script order
+    """
+    loop = asyncio.get_running_loop()
+    capture = concurrency > 1
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="mcp-batch")
+
+    async def run(script_path: Path) -> ScriptResult:
+        result = await loop.run_in_executor(executor, _run_script, script_path, capture)
+        if result.output:
+            print(f"===== {script_path} (exit {result.exit_code}) =====")
+            print(result.output, end="" if result.output.endswith("\n") else "\n")
+        logger.info(
+            f"Script finished: {script_path} (exit {result.exit_code}, {result.elapsed:.2f}s)"
+        )
+        return result
+
+    try:
+        return await asyncio.gather(*(run(script_path) for script_path in script_paths))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _execute_batch(script_paths: list[Path], concurrency: int) -> int:
+    """
+    Execute several scripts with one shared manager and event loop.
+
+    Args:
+        script_paths: Scripts to run
+        concurrency: Maximum number of scripts running at once
+
+    Returns:
+        0 if every script succeeded, 130 if interrupted, otherwise 1
+    """
+    logger.info(f"=== Batch Mode: {len(script_paths)} scripts, concurrency {concurrency} ===")
+
+    loop = _prepare_runtime()
+
+    manager = get_mcp_client_manager()
+    try:
+        loop.run_until_complete(manager.initialize(warmup=not daemon_routing_active()))
+        logger.info("MCP client manager initialized")
+    except McpExecutionError as e:
+        logger.error(f"Failed to initialize MCP client: {e}")
+        return 1
+
+    _install_signal_handlers()
+    _run_on_shared_loop(loop)
+    sys.stdout = _ScriptOutputRouter(sys.stdout)
+    sys.stderr = _ScriptOutputRouter(sys.stderr)
 
+    results: list[ScriptResult] = []
+    exit_code = 0
+    try:
+        results = loop.run_until_complete(_run_scripts(script_paths, concurrency))
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("Batch interrupted")
+        exit_code = 130
+    finally:
+        exit_code = _shutdown(loop, manager, exit_code)
+        sys.stdout = sys.__stdout__
+        sys.stderr = sys.__stderr__
+
+    failed = [result for result in results if result.exit_code != 0]
+    logger.info(
+        f"Batch summary: {len(results)} scripts, "
+        f"{len(results) - len(failed)} succeeded, {len(failed)} failed"
+    )
+    for result in results:
+        logger.info(f"  exit {result.exit_code:<3} {result.elapsed:7.2f}s  {result.path}")
+
+    if exit_code == 0 and failed:
+        exit_code = 1
     return exit_code
 
 
 def main() -> NoReturn:
     """Entry point for the harness."""
+    # Profile mode re-runs the harness under -X importtime and summarizes it
+    if PROFILE_STARTUP_FLAG in sys.argv[1:]:
+        from .import_profile import run_with_import_profile
+
+        sys.exit(run_with_import_profile([a for a in sys.argv[1:] if a != PROFILE_STARTUP_FLAG]))
+
     # 0. Load .env file (if present) for API keys
     if load_project_env():
         logger.info("Loaded .env file")
 
     # 1. Parse CLI arguments
-    script_path = _parse_arguments()
-
-    # 2. Validate script exists
-    if not script_path.exists():
-        logger.error(f"Script not found: {script_path}")
-        sys.exit(1)
-
-    if not script_path.is_file():
-        logger.error(f"Not a file: {script_path}")
-        sys.exit(1)
-
-    logger.info(f"Script: {script_path}")
-
-    # 3. Execute script
-    exit_code = _execute_direct(script_path)
+    args = _parse_arguments()
+
+    # 2. Validate scripts exist
+    for script_path in args.scripts:
+        if not script_path.exists():
+            logger.error(f"Script not found: {script_path}")
+            sys.exit(1)
+
+        if not script_path.is_file():
+            logger.error(f"Not a file: {script_path}")
+            sys.exit(1)
+
+    # 3. Execute script(s)
+    if args.batch:
+        exit_code = _execute_batch(args.scripts, args.concurrency)
+    else:
+        logger.info(f"Script: {args.scripts[0]}")
+        exit_code = _execute_direct(args.scripts[0])
 
     sys.exit(exit_code)
 
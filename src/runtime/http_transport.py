@@ -0,0 +1,147 @@
+"""HTTP client tuning and session resumption for SSE/HTTP MCP servers.
+
+The SDK transports build a default httpx client per connection: HTTP/1.1, a
+30s timeout and httpx's 5s keep-alive expiry, so tool calls spaced a few
+seconds apart repeat the TCP and TLS handshake. http_transport_kwargs()
+builds the transport arguments for a server's HttpOptions instead.
+
+Streamable HTTP servers identify a session by the ``mcp-session-id`` header
+of their initialize response. The manager keeps that ID (HttpSession) and,
+when it reconnects, sends it with the negotiated protocol version so the
+server continues the existing session and the initialize handshake is
+skipped. Sessions kept for resumption are terminated explicitly by
+terminate_http_session() when the manager shuts down.
+"""
+
+import importlib.util
+import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from .config import HttpOptions
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger("mcp_execution.http_transport")
+
+# Streamable HTTP session headers (see the MCP transport specification)
+MCP_SESSION_ID_HEADER = "mcp-session-id"
+MCP_PROTOCOL_VERSION_HEADER = "mcp-protocol-version"
+
+
+class HttpSession:
+    """A Streamable HTTP session that can be resumed on reconnect.
+
+    Attributes:
+        session_id: Value of the server's mcp-session-id header
+        protocol_version: Protocol version negotiated by initialize
+    """
+
+    def __init__(self, session_id: str, protocol_version: str) -> None:
+        """Record a session established by initialize."""
+        self.session_id = session_id
+        self.protocol_version = protocol_version
+
+    def headers(self) -> dict[str, str]:
+        """Return the request headers continuing this session."""
+        return {
+            MCP_SESSION_ID_HEADER: self.session_id,
+            MCP_PROTOCOL_VERSION_HEADER: self.protocol_version,
+        }
+
+
+@lru_cache(maxsize=1)
+def http2_available() -> bool:
+    """Return True if httpx can negotiate HTTP/2 (the h2 package is installed)."""
+    available = importlib.util.find_spec("h2") is not None
+    if not available:
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+    return available
+
+
+def build_http_client(
+    options: HttpOptions,
+    headers: dict[str, str] | None = None,
+    auth: "httpx.Auth | None" = None,
+) -> "httpx.AsyncClient":
+    """Create an httpx client with a server's pool, keep-alive and timeouts.
+
+    Args:
+        options: The server's HTTP options
+        headers: Default headers sent with every request
+        auth: Optional authentication handler
+
+    Returns:
+        An httpx.AsyncClient (to be used as an async context manager)
+    """
+    import httpx
+
+    return httpx.AsyncClient(
+        headers=headers,
+        auth=auth,
+        follow_redirects=True,
+        timeout=httpx.Timeout(
+            options.timeout, connect=options.connectTimeout, read=options.readTimeout
+        ),
+        limits=httpx.Limits(
+            max_connections=options.maxConnections,
+            max_keepalive_connections=options.maxKeepaliveConnections,
+            keepalive_expiry=options.keepaliveExpiry,
+        ),
+        http2=options.http2 and http2_available(),
+    )
+
+
+def http_transport_kwargs(options: HttpOptions) -> dict[str, Any]:
+    """Build the tuning arguments accepted by sse_client and streamablehttp_client.
+
+    Args:
+        options: The server's HTTP options
+
+    Returns:
+        Keyword arguments: timeout, sse_read_timeout and httpx_client_factory
+    """
+
+    def client_factory(
+        headers: dict[str, str] | None = None,
+        timeout: Any = None,
+        auth: "httpx.Auth | None" = None,
+    ) -> "httpx.AsyncClient":
+        # The SDK's timeout only covers connect/read; ours sets each phase
+        return build_http_client(options, headers=headers, auth=auth)
+
+    return {
+        "timeout": options.timeout,
+        "sse_read_timeout": options.readTimeout,
+        "httpx_client_factory": client_factory,
+    }
+
+
+async def terminate_http_session(
+    url: str,
+    headers: dict[str, str] | None,
+    session: HttpSession,
+    options: HttpOptions,
+) -> None:
+    """Ask a Streamable HTTP server to end a session (DELETE with its ID).
+
+    Failures are logged and otherwise ignored: servers may not support
+    termination, and expire abandoned sessions on their own.
+
+    Args:
+        url: Server endpoint URL
+        headers: The server's configured headers (e.g. authorization)
+        session: Session to terminate
+        options: The server's HTTP options
+    """
+    import httpx
+
+    request_headers = {**(headers or {}), **session.headers()}
+    try:
+        async with build_http_client(options, headers=request_headers) as client:
+            response = await client.delete(url)
+        if response.status_code not in (200, 202, 204, 404, 405):
+            logger.debug(f"Terminating session at {url} returned HTTP {response.status_code}")
+    except httpx.HTTPError as e:
+        logger.debug(f"Could not terminate session at {url}: {e!r}")
@@ -0,0 +1,131 @@
+"""Summarized import-time profiling for harness runs.
+
+`python -m runtime.harness --profile-startup script.py` re-runs the harness
+under `python -X importtime`, passes the script's stderr through, and prints
+a summary of where import time went (by top-level package and by module)
+instead of the raw per-module trace.
+"""
+
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+IMPORTTIME_PREFIX = "import time:"
+
+
+class ImportRecord:
+    """One line of `-X importtime` output.
+
+    Attributes:
+        module: Fully qualified module name
+        self_us: Time spent importing the module itself (microseconds)
+        cumulative_us: Time including the module's own imports (microseconds)
+        depth: Nesting level (0 for modules imported directly by the program)
+    """
+
+    def __init__(self, module: str, self_us: int, cumulative_us: int, depth: int) -> None:
+        """Create a record."""
+        self.module = module
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+
+    @property
+    def package(self) -> str:
+        """Top-level package of the module."""
+        return self.module.split(".", 1)[0]
+
+
+def parse_importtime_line(line: str) -> ImportRecord | None:
+    """Parse one `-X importtime` line.
+
+    Args:
+        line: A stderr line starting with "import time:"
+
+    Returns:
+        The parsed record, or None for the header or malformed lines
+    """
+    parts = line[len(IMPORTTIME_PREFIX) :].rstrip("\n").split("|")
+    if len(parts) != 3:
+        return None
+    try:
+        self_us = int(parts[0])
+        cumulative_us = int(parts[1])
+    except ValueError:
+        return None
+    name = parts[2]
+    stripped = name.lstrip()
+    # The name column has one leading space plus two per nesting level
+    depth = max(len(name) - len(stripped) - 1, 0) // 2
+    return ImportRecord(stripped, self_us, cumulative_us, depth)
+
+
+def summarize(records: list[ImportRecord], top: int = 15) -> str:
+    """Format an import-time summary.
+
+    Args:
+        records: Parsed import records of one process
+        top: Number of packages and modules to list
+
+    Returns:
+        Multi-line human-readable report
+    """
+    total_us = sum(record.self_us for record in records)
+    by_package: dict[str, int] = defaultdict(int)
+    for record in records:
+        by_package[record.package] += record.self_us
+
+    lines = [
+        f"=== Startup import profile: {len(records)} modules, {total_us / 1000:.1f} ms total ===",
+        "Top packages (self time):",
+    ]
+    for package, package_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        share = package_us / total_us * 100 if total_us else 0.0
+        lines.append(f"  {package_us / 1000:8.1f} ms  {share:5.1f}%  {package}")
+
+    lines.append("Top imports (cumulative time, as imported by the program):")
+    direct = [record for record in records if record.depth == 0]
+    for record in sorted(direct, key=lambda r: -r.cumulative_us)[:top]:
+        lines.append(f"  {record.cumulative_us / 1000:8.1f} ms  {record.module}")
+    return "\n".join(lines)
+
+
+def run_with_import_profile(harness_args: list[str], top: int = 15) -> int:
+    """Run the harness in a child interpreter with `-X importtime`.
+
+    Import-time lines are collected from the child's stderr; all other
+    stderr output is forwarded unchanged. The summary is printed to stderr
+    after the child exits.
+
+    Args:
+        harness_args: Harness arguments (script path etc.) for the child
+        top: Number of packages and modules in the summary
+
+    Returns:
+        The child's exit code
+    """
+    env = os.environ.copy()
+    src_path = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_path, env.get("PYTHONPATH")]))
+
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", "-m", "runtime.harness", *harness_args],
+        stderr=subprocess.PIPE,
+        text=True,
+        env=env,
+    )
+    records: list[ImportRecord] = []
+    for line in process.stderr or ():
+        if line.startswith(IMPORTTIME_PREFIX):
+            record = parse_importtime_line(line)
+            if record is not None:
+                records.append(record)
+        else:
+            sys.stderr.write(line)
+            sys.stderr.flush()
+
+    exit_code = process.wait()
+    print(summarize(records, top=top), file=sys.stderr)
+    return exit_code
@@ -3,36 +3,159 @@
 This module provides the core runtime client manager that connects to MCP servers
 on-demand, caches tools, and manages the lifecycle of server connections using
 an explicit state machine pattern for clarity and debugging.
+
+The MCP SDK (client session and transports) is imported on the first server
+connection rather than at module import, so scripts that never call a tool,
+or whose calls are served by the daemon, do not pay for it. The SDK names
+below remain available as module attributes (e.g. for mocking).
 """
 
+from __future__ import annotations
+
 import asyncio
+import importlib
 import json
 import logging
-import os
-import re
 import sys
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
+from contextlib import AsyncExitStack
 from enum import Enum
 from functools import lru_cache
+from itertools import chain, zip_longest
 from pathlib import Path
-from typing import Any
-
-import aiofiles
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
-from mcp.client.sse import sse_client
-from mcp.client.streamable_http import streamablehttp_client
-from mcp.types import Tool
+from typing import TYPE_CHECKING, Any
 
+from .circuit_breaker import CircuitBreaker
 from .config import McpConfig, ServerConfig
+from .config_loader import ConfigSnapshotCache, get_config_cache, load_mcp_config
+from .context_host import ContextHost, enter_context
+from .env_utils import ServerConfigResolver
 from .exceptions import (
+    CircuitOpenError,
     ConfigurationError,
+    DaemonUnavailableError,
     ServerConnectionError,
     ToolExecutionError,
     ToolNotFoundError,
 )
+from .http_transport import HttpSession, http_transport_kwargs, terminate_http_session
+from .metrics import MetricsRegistry, payload_size
+from .result_cache import ResultCache
+from .result_stream import (
+    DEFAULT_SPILL_THRESHOLD,
+    SpilledText,
+    iter_json_array,
+    spill_threshold_from_env,
+    unwrap_content,
+)
+from .retry import is_connection_lost, is_transient_error
+from .shutdown import (
+    DEFAULT_SHUTDOWN_GRACE,
+    close_with_escalation,
+    exit_context,
+    shutdown_grace_from_env,
+    stdio_process_pid,
+)
+from .stdio_pool import PooledServer, StdioServerPool, get_stdio_pool
+from .tool_cache import ToolSchemaCache
+from .usage_stats import UsageStats
+
+if TYPE_CHECKING:
+    from mcp import ClientSession
+    from mcp.types import Tool
 
 logger = logging.getLogger("mcp_execution.client")
 
+# SDK names resolved on first use: name -> (module, attribute)
+_LAZY_SDK_NAMES = {
+    "ClientSession": ("mcp.client.session", "ClientSession"),
+    "StdioServerParameters": ("mcp.client.stdio", "StdioServerParameters"),
+    "stdio_client": ("mcp.client.stdio", "stdio_client"),
+    "sse_client": ("mcp.client.sse", "sse_client"),
+    "streamablehttp_client": ("mcp.client.streamable_http", "streamablehttp_client"),
+}
+
+# Defaults for fan-out operations across servers (list_all_tools)
+DEFAULT_SERVER_CONCURRENCY = 8
+DEFAULT_SERVER_TIMEOUT = 30.0
+
+# Default number of concurrently executing calls in a batch (call_tools_batch)
+DEFAULT_BATCH_CONCURRENCY = 8
+
+ToolCall = tuple[str, dict[str, Any]]
+
+
+def _sdk(name: str) -> Any:
+    """Return an MCP SDK name, importing its module on first use.
+
+    Module globals take precedence, so names that were already resolved (or
+    patched in tests) are returned without an import.
+    """
+    value = globals().get(name)
+    if value is None:
+        module_name, attribute = _LAZY_SDK_NAMES[name]
+        value = getattr(importlib.import_module(module_name), attribute)
+        globals()[name] = value
+    return value
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve lazily imported SDK names accessed as module attributes."""
+    if name in _LAZY_SDK_NAMES:
+        return _sdk(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _on_running_loop(task: asyncio.Task[Any]) -> bool:
+    """Return True if a task belongs to the running event loop."""
+    return task.get_loop() is asyncio.get_running_loop()
+
+
+async def _run_batch(
+    calls: Sequence[ToolCall],
+    call: Callable[[str, dict[str, Any]], Awaitable[Any]],
+    concurrency: int,
+) -> list[Any]:
+    """Execute tool calls concurrently, returning results in input order.
+
+    Calls are grouped by server and scheduled round-robin across servers, so a
+    long run of calls to one server does not starve calls to the others.
+    Exceptions are captured per item instead of aborting the batch.
+
+    Args:
+        calls: (tool_identifier, params) pairs
+        call: Coroutine function executing a single call
+        concurrency: Maximum number of calls executing at once
+
+    Returns:
+        One entry per call: the result, or the Exception it raised
+
+    Raises:
+        ConfigurationError: If concurrency < 1
+    """
+    if concurrency < 1:
+        raise ConfigurationError(f"concurrency must be at least 1, got {concurrency}")
+
+    by_server: dict[str, list[int]] = {}
+    for index, (tool_identifier, _params) in enumerate(calls):
+        by_server.setdefault(tool_identifier.split("__", 1)[0], []).append(index)
+
+    interleaved: Iterable[int | None] = chain.from_iterable(zip_longest(*by_server.values()))
+    schedule = iter([index for index in interleaved if index is not None])
+    results: list[Any] = [None] * len(calls)
+
+    async def worker() -> None:
+        for index in schedule:
+            tool_identifier, params = calls[index]
+            try:
+                results[index] = await call(tool_identifier, params)
+            except Exception as e:
+                results[index] = e
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(calls)))))
+    return results
+
 
 class ConnectionState(Enum):
     """Explicit states for the MCP Client Manager lifecycle.
@@ -55,9 +178,26 @@ class McpClientManager:
     connections with the following characteristics:
     - Lazy initialization: Config loaded on initialize(), servers NOT connected
     - Lazy connection: Servers connect on first call_tool() call
-    - Tool caching: Cache tools per server to avoid repeated list_tools calls
+    - Tool caching: Cache tools per server to avoid repeated list_tools calls,
+      optionally persisted on disk across processes (ToolSchemaCache)
+    - Result memoization: opt-in caching of SAFE tool results (ResultCache)
+    - Metrics: connect/list_tools/call latencies, payload sizes, retries and
+      errors per server and tool (MetricsRegistry, see the metrics property)
     - Defensive unwrapping: Handle response.value and fallback patterns
+    - Large results: stream_tool() yields content items one at a time, and an
+      optional size guard spills oversized text to temporary files
     - Explicit state tracking: Clear state transitions with validation
+    - Concurrency safety: per-server locks serialize lazy connects and tool
+      listing, and a per-server semaphore bounds in-flight requests
+
+    Concurrency guarantee:
+        It is safe to issue many call_tool() calls concurrently (e.g. with
+        asyncio.gather) from one event loop, including for servers that are not
+        yet connected. Each server is spawned/connected exactly once, and
+        concurrent calls to the same server are pipelined over its single
+        ClientSession (JSON-RPC requests are matched to responses by id). At
+        most ServerConfig.maxConcurrentRequests requests per server are in
+        flight; additional calls wait for a free slot (back-pressure).
 
     State Transitions:
         UNINITIALIZED -> INITIALIZED (via initialize())
@@ -68,23 +208,91 @@ class McpClientManager:
         _state: Current connection state
         _clients: Mapping of server names to active client sessions
         _tool_cache: Cached tools per server to avoid repeated queries
+        _tool_index: Per-server name -> Tool index for O(1) lookups
+        _schema_cache: Optional persistent tool cache shared across processes
+        _result_cache: Optional memoization cache for idempotent tool results
+        _metrics: Latency, size, retry and error metrics per server and tool
+        _spill_threshold: Text length above which call_tool spills results to disk
+        _spilled: Temporary files created by the size guard (removed on cleanup)
         _config: Loaded MCP configuration
-        _stdio_contexts: Stdio context managers for proper lifecycle management
-        _session_contexts: Session context managers for proper lifecycle management
-        _read_streams: Active stdio read streams
-        _write_streams: Active stdio write streams
+        _config_cache: Optional snapshot cache used by initialize()
+        _config_resolvers: Parsed ${VAR} templates of env and headers per server
+        _usage_stats: Optional usage history for predicted warmup
+        _used_servers: Servers that executed a tool call since initialize()
+        _warmup_tasks: Pending background warmup tasks
+        _health_tasks: Health ping task per connected server
+        _loop: Event loop initialize() ran on; background tasks only run there
+        _stdio_contexts: Transport contexts (ContextHosts) of SSE/HTTP servers
+        _session_contexts: Session contexts not owned by a ContextHost
+        _server_timings: Seconds spent connecting and listing tools per server
+        _stdio_pool: Process-wide pool of stdio servers shared with other managers
+        _pooled: Stdio servers this manager holds a pool reference to
+        _shutdown_grace: Seconds each server may take to close before it is killed
+        _shutdown_timings: Seconds each server took to shut down (last cleanup)
+        _server_locks: Per-server locks guarding connection and tool listing
+        _request_semaphores: Per-server semaphores bounding in-flight requests
     """
 
-    def __init__(self) -> None:
-        """Initialize an uninitialized MCP Client Manager."""
+    def __init__(
+        self,
+        schema_cache: ToolSchemaCache | None = None,
+        result_cache: ResultCache | None = None,
+        metrics: MetricsRegistry | None = None,
+        spill_threshold: int | None = None,
+        shutdown_grace: float = DEFAULT_SHUTDOWN_GRACE,
+        config_cache: ConfigSnapshotCache | None = None,
+        usage_stats: UsageStats | None = None,
+        stdio_pool: StdioServerPool | None = None,
+    ) -> None:
+        """Initialize an uninitialized MCP Client Manager.
+
+        Args:
+            schema_cache: Optional on-disk tool cache. When set, tool lists are
+                loaded from and stored to disk so a fresh process can resolve
+                tools without a list_tools round trip.
+            result_cache: Optional memoization cache for results of SAFE
+                (read-only) tools. Disabled when None.
+            metrics: Registry to record metrics into (default: a new one)
+            spill_threshold: When set, call_tool returns text content longer
+                than this many characters as a SpilledText handle instead of
+                a string. Disabled when None.
+            shutdown_grace: Seconds a server may take to close during
+                cleanup() before its process is terminated, then killed
+            config_cache: Optional snapshot cache of the merged, validated
+                config, reused while the config files are unchanged
+            usage_stats: Optional per-server usage history; selects the
+                "predicted" servers to warm up and is updated by cleanup()
+            stdio_pool: Pool to take stdio servers from (default: the
+                process-wide pool, so managers share server processes)
+        """
         self._state: ConnectionState = ConnectionState.UNINITIALIZED
         self._clients: dict[str, ClientSession] = {}
         self._tool_cache: dict[str, list[Tool]] = {}
+        self._tool_index: dict[str, dict[str, Tool]] = {}
+        self._schema_cache = schema_cache
+        self._result_cache = result_cache
+        self._metrics = metrics if metrics is not None else MetricsRegistry()
+        self._spill_threshold = spill_threshold
+        self._spilled: list[SpilledText] = []
         self._config: McpConfig | None = None
+        self._config_cache = config_cache
+        self._config_resolvers: dict[str, ServerConfigResolver] = {}
+        self._usage_stats = usage_stats
+        self._used_servers: set[str] = set()
+        self._warmup_tasks: set[asyncio.Task[None]] = set()
         self._stdio_contexts: dict[str, Any] = {}  # Store stdio context managers
         self._session_contexts: dict[str, Any] = {}  # Store session context managers
-        self._read_streams: dict[str, Any] = {}
-        self._write_streams: dict[str, Any] = {}
+        self._server_timings: dict[str, float] = {}
+        self._stdio_pool = stdio_pool if stdio_pool is not None else get_stdio_pool()
+        self._pooled: dict[str, PooledServer] = {}
+        self._http_sessions: dict[str, HttpSession] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._health_tasks: dict[str, asyncio.Task[None]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._shutdown_grace = shutdown_grace
+        self._shutdown_timings: dict[str, float] = {}
+        self._server_locks: dict[str, asyncio.Lock] = {}
+        self._request_semaphores: dict[str, asyncio.Semaphore] = {}
 
     def _validate_state(self, required_state: ConnectionState, operation: str) -> None:
         """Validate that the manager is in the required state for an operation.
@@ -142,7 +350,7 @@ class McpClientManager:
         self._state = ConnectionState.UNINITIALIZED
         logger.debug("State transition: -> UNINITIALIZED")
 
-    async def initialize(self, config_path: Path | None = None) -> None:
+    async def initialize(self, config_path: Path | None = None, warmup: bool = True) -> None:
         """Initialize the manager by loading configuration.
 
         This method loads the MCP configuration from JSON files but does NOT
@@ -153,77 +361,23 @@ class McpClientManager:
         configs exist, they are merged with project config taking precedence
         for servers with the same name.
 
+        Servers configured with warmup "eager" (and "predicted" servers that
+        recent runs used) start connecting in background tasks on the
+        current event loop; initialize() does not wait for them.
+
         Args:
             config_path: Optional path to config file. If not provided,
                         merges global config with project config (.mcp.json or mcp_config.json)
+            warmup: Start background warmup of eager/predicted servers. Pass
+                False when tool calls will run on a different event loop.
 
         Raises:
             ConfigurationError: If no config file is found or config is invalid
         """
         self._validate_state(ConnectionState.UNINITIALIZED, "initialize")
 
-        # If explicit path provided, use only that
-        if config_path:
-            if not config_path.exists():
-                raise ConfigurationError(f"Config file not found: {config_path}")
-            try:
-                async with aiofiles.open(config_path) as f:
-                    content = await f.read()
-                self._config = McpConfig.model_validate_json(content)
-            except json.JSONDecodeError as e:
-                raise ConfigurationError(f"Invalid JSON in config file {config_path}: {e}")
-            except Exception as e:
-                raise ConfigurationError(f"Failed to load config from {config_path}: {e}")
-        else:
-            # Config merging: global + project (project overrides)
-            mcp_json = Path.cwd() / ".mcp.json"
-            mcp_config_json = Path.cwd() / "mcp_config.json"
-            global_config = Path.home() / ".claude" / "mcp_config.json"
-
-            global_cfg: McpConfig | None = None
-            project_cfg: McpConfig | None = None
-
-            # Load global config if exists
-            if global_config.exists():
-                try:
-                    async with aiofiles.open(global_config) as f:
-                        content = await f.read()
-                    global_cfg = McpConfig.model_validate_json(content)
-                    logger.info(f"Loaded global config: {global_config} ({len(global_cfg.mcpServers)} servers)")
-                except Exception as e:
-                    logger.warning(f"Failed to load global config {global_config}: {e}")
-
-            # Load project config if exists (prefer .mcp.json over mcp_config.json)
-            project_config_file = None
-            if mcp_json.exists():
-                project_config_file = mcp_json
-            elif mcp_config_json.exists():
-                project_config_file = mcp_config_json
-
-            if project_config_file:
-                try:
-                    async with aiofiles.open(project_config_file) as f:
-                        content = await f.read()
-                    project_cfg = McpConfig.model_validate_json(content)
-                    logger.info(f"Loaded project config: {project_config_file} ({len(project_cfg.mcpServers)} servers)")
-                except json.JSONDecodeError as e:
-                    raise ConfigurationError(f"Invalid JSON in config file {project_config_file}: {e}")
-                except Exception as e:
-                    raise ConfigurationError(f"Failed to load config from {project_config_file}: {e}")
-
-            # Merge configs (project overrides global)
-            if global_cfg and project_cfg:
-                self._config = global_cfg.merge(project_cfg)
-                logger.info(f"Merged configs: {len(self._config.mcpServers)} servers total")
-            elif project_cfg:
-                self._config = project_cfg
-            elif global_cfg:
-                self._config = global_cfg
-            else:
-                raise ConfigurationError(
-                    f"No config file found. Expected .mcp.json or mcp_config.json in {Path.cwd()}, "
-                    f"or global config at {global_config}"
-                )
+        self._config = await load_mcp_config(config_path, cache=self._config_cache)
+        self._loop = asyncio.get_running_loop()
 
         enabled_count = len(self._config.get_enabled_servers())
         logger.info(
@@ -232,11 +386,73 @@ class McpClientManager:
         )
         self._mark_initialized()
 
+        if warmup:
+            self._start_warmup()
+
+    def _start_warmup(self) -> None:
+        """Connect eager and predicted servers in background tasks."""
+        if self._config is None:
+            return
+        enabled = self._config.get_enabled_servers()
+        eager = [name for name, config in enabled.items() if config.warmup == "eager"]
+        candidates = [name for name, config in enabled.items() if config.warmup == "predicted"]
+        predicted = (
+            self._usage_stats.predicted(candidates)
+            if candidates and self._usage_stats is not None
+            else []
+        )
+
+        servers = eager + predicted
+        if not servers:
+            return
+        logger.info(f"Warming up servers in the background: {', '.join(servers)}")
+        for server_name in servers:
+            task = asyncio.create_task(
+                self._warm_server(server_name, enabled[server_name]),
+                name=f"mcp-warmup-{server_name}",
+            )
+            self._warmup_tasks.add(task)
+            task.add_done_callback(self._warmup_tasks.discard)
+
+    async def _warm_server(self, server_name: str, config: ServerConfig) -> None:
+        """Connect a server and load its tools ahead of the first call.
+
+        Failures are logged only; the first tool call connects again and
+        reports the error.
+        """
+        start = time.perf_counter()
+        try:
+            await self._connect_to_server(server_name, config)
+            if not await self._load_cached_tools(server_name, config):
+                await self._get_server_tools(server_name)
+        except Exception as e:
+            logger.warning(f"Background warmup of server '{server_name}' failed: {e}")
+            return
+        logger.info(f"Server '{server_name}' warmed up in {time.perf_counter() - start:.2f}s")
+
+    async def wait_for_warmup(self) -> None:
+        """Wait until all background warmup tasks have finished."""
+        if self._warmup_tasks:
+            await asyncio.gather(*self._warmup_tasks, return_exceptions=True)
+
+    def _server_lock(self, server_name: str) -> asyncio.Lock:
+        """Return the lock guarding connection and tool listing for a server."""
+        return self._server_locks.setdefault(server_name, asyncio.Lock())
+
+    def _request_semaphore(self, server_name: str, config: ServerConfig) -> asyncio.Semaphore:
+        """Return the semaphore bounding in-flight requests for a server."""
+        semaphore = self._request_semaphores.get(server_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(config.maxConcurrentRequests)
+            self._request_semaphores[server_name] = semaphore
+        return semaphore
+
     async def _connect_to_server(self, server_name: str, config: ServerConfig) -> None:
         """Establish connection to a single MCP server on-demand.
 
         This method is called lazily when a tool from the server is first invoked.
-        Supports stdio, SSE, and HTTP transports.
+        Supports stdio, SSE, and HTTP transports. Concurrent callers for the
+        same server wait on a per-server lock, so the server is only spawned once.
 
         Args:
             server_name: Name of the server to connect to
@@ -245,13 +461,22 @@ class McpClientManager:
         Raises:
             ServerConnectionError: If connection fails
         """
-        if server_name in self._clients:
-            logger.debug(f"Server '{server_name}' already connected")
-            return
+        async with self._server_lock(server_name):
+            if server_name in self._clients:
+                logger.debug(f"Server '{server_name}' already connected")
+                return
 
+            await self._open_connection(server_name, config)
+
+    async def _open_connection(self, server_name: str, config: ServerConfig) -> None:
+        """Open the transport and session for a server (caller holds its lock)."""
         logger.info(f"Connecting to MCP server: {server_name} (transport: {config.type})")
+        start = time.perf_counter()
 
         try:
+            # Substitute environment variable placeholders in env and headers
+            config = self._resolve_config(server_name, config)
+
             # Create appropriate client based on transport type
             if config.type == "stdio":
                 await self._connect_stdio(server_name, config)
@@ -263,10 +488,15 @@ class McpClientManager:
                 raise ServerConnectionError(f"Unsupported transport type: {config.type}")
 
             self._mark_connected()
+            self._metrics.record_connect(server_name, time.perf_counter() - start)
+            self._circuit(server_name, config).record_success()
+            self._start_health_check(server_name, config)
             logger.info(f"Successfully connected to server: {server_name}")
 
         except Exception as e:
+            self._metrics.record_connect(server_name, time.perf_counter() - start, ok=False)
             logger.error(f"Failed to connect to server '{server_name}': {e}")
+            self._circuit(server_name, config).record_failure(e)
             # Clean up any partially created contexts
             if server_name in self._stdio_contexts:
                 try:
@@ -276,93 +506,179 @@ class McpClientManager:
                 del self._stdio_contexts[server_name]
             raise ServerConnectionError(f"Could not connect to MCP server '{server_name}': {e}")
 
-    def _substitute_env_vars(self, env: dict[str, str] | None) -> dict[str, str] | None:
-        """Substitute ${VAR} placeholders with actual environment variable values."""
-        if not env:
-            return env
-        result = {}
-        pattern = re.compile(r'\$\{([^}]+)\}')
-        for key, value in env.items():
-            # Replace ${VAR} with os.environ.get('VAR', '')
-            def replacer(match: re.Match) -> str:
-                var_name = match.group(1)
-                return os.environ.get(var_name, '')
-            result[key] = pattern.sub(replacer, value)
-        return result
+    def _circuit(self, server_name: str, config: ServerConfig) -> CircuitBreaker:
+        """Return the circuit breaker of a server, creating it on first use."""
+        breaker = self._breakers.get(server_name)
+        if breaker is None:
+            breaker = self._breakers[server_name] = CircuitBreaker(
+                server_name,
+                config.circuitBreaker,
+                on_transition=lambda name, state: self._metrics.record_circuit_state(
+                    name, state.value
+                ),
+            )
+        return breaker
 
-    async def _connect_stdio(self, server_name: str, config: ServerConfig) -> None:
-        """Connect to stdio MCP server."""
-        # Substitute environment variable placeholders
-        resolved_env = self._substitute_env_vars(config.env)
-
-        # Create stdio server parameters
-        server_params = StdioServerParameters(
-            command=config.command,
-            args=config.args,
-            env=resolved_env,
-        )
+    def _admit_call(self, server_name: str, config: ServerConfig) -> bool:
+        """Let a call through the server's circuit breaker.
 
-        # Establish stdio connection and store the context manager
-        stdio_ctx = stdio_client(server_params)
-        streams = await stdio_ctx.__aenter__()
-        read_stream, write_stream = streams
+        Returns:
+            True if the call is the half-open probe; the caller must then
+            release it (CircuitBreaker.release_probe) when it finishes
+            without recording an outcome
 
-        # Store the context manager for cleanup
-        self._stdio_contexts[server_name] = stdio_ctx
-        self._read_streams[server_name] = read_stream
-        self._write_streams[server_name] = write_stream
+        Raises:
+            CircuitOpenError: If the server's circuit is open
+        """
+        try:
+            return self._circuit(server_name, config).before_call()
+        except CircuitOpenError:
+            self._metrics.record_circuit_rejection(server_name)
+            raise
+
+    def _start_health_check(self, server_name: str, config: ServerConfig) -> None:
+        """Start periodic health pings for a newly connected server.
+
+        Pings only run when the server was connected on the manager's own
+        loop: a connection made inside a script's asyncio.run() (the legacy
+        harness path) lives on a loop that is closed when the script's call
+        returns, and a task left on it could be neither run nor awaited.
+        """
+        if asyncio.get_running_loop() is not self._loop:
+            logger.debug(f"No health checks for '{server_name}': connected on another event loop")
+            return
+        interval = config.circuitBreaker.healthCheckInterval
+        if interval > 0 and server_name not in self._health_tasks:
+            self._health_tasks[server_name] = asyncio.create_task(
+                self._health_check_loop(server_name, config), name=f"mcp-health-{server_name}"
+            )
 
-        # Create and initialize session
-        session = ClientSession(read_stream, write_stream)
-        client = await session.__aenter__()
-        await client.initialize()
+    async def _health_check_loop(self, server_name: str, config: ServerConfig) -> None:
+        """Ping a connected server periodically, feeding its circuit breaker.
 
-        # Store client and session context
-        self._clients[server_name] = client
-        self._session_contexts[server_name] = session
+        A ping that finds the transport closed disconnects the server, so the
+        next call reconnects right away instead of failing first.
+        """
+        policy = config.circuitBreaker
+        breaker = self._circuit(server_name, config)
+        while True:
+            await asyncio.sleep(policy.healthCheckInterval)
+            client = self._clients.get(server_name)
+            if client is None:
+                break
+            try:
+                await asyncio.wait_for(client.send_ping(), policy.healthCheckTimeout)
+            except Exception as e:
+                logger.warning(f"Health check of server '{server_name}' failed: {e!r}")
+                breaker.record_failure(e)
+                if is_connection_lost(e):
+                    pooled = self._pooled.get(server_name)
+                    if pooled is not None:
+                        self._stdio_pool.discard(pooled)
+                    await self.disconnect_server(server_name)
+                    break
+            else:
+                breaker.record_success()
+
+    def get_circuit_states(self) -> dict[str, dict[str, Any]]:
+        """Return the circuit breaker state of every server that has one.
+
+        Returns:
+            Mapping of server name to state ("closed", "open" or "half_open"),
+            consecutive failures, times opened, rejected calls, seconds until
+            a probe is allowed and the last error
+        """
+        return {name: breaker.snapshot() for name, breaker in sorted(self._breakers.items())}
+
+    def _resolve_config(self, server_name: str, config: ServerConfig) -> ServerConfig:
+        """Expand ${VAR} placeholders in a server's env and headers.
+
+        The parsed templates are kept per server until cleanup(), so repeated
+        connects only re-expand when a referenced variable has changed.
+        """
+        resolver = self._config_resolvers.get(server_name)
+        if resolver is None or resolver.config is not config:
+            resolver = self._config_resolvers[server_name] = ServerConfigResolver(config)
+        return resolver.resolve()
+
+    async def _connect_stdio(self, server_name: str, config: ServerConfig) -> None:
+        """Connect to stdio MCP server, sharing a pooled process when possible."""
+        pooled = await self._stdio_pool.acquire(server_name, config, open_stdio_server)
+        self._pooled[server_name] = pooled
+        self._clients[server_name] = pooled.client
 
     async def _connect_sse(self, server_name: str, config: ServerConfig) -> None:
         """Connect to SSE MCP server."""
-        # Establish SSE connection
-        sse_ctx = sse_client(url=config.url, headers=config.headers or {})
-        streams = await sse_ctx.__aenter__()
-        read_stream, write_stream = streams
-
-        # Store the context manager for cleanup
-        self._stdio_contexts[server_name] = sse_ctx
-        self._read_streams[server_name] = read_stream
-        self._write_streams[server_name] = write_stream
-
-        # Create and initialize session
-        session = ClientSession(read_stream, write_stream)
-        client = await session.__aenter__()
-        await client.initialize()
 
-        # Store client and session context
-        self._clients[server_name] = client
-        self._session_contexts[server_name] = session
+        async def enter(stack: AsyncExitStack) -> ClientSession:
+            sse_ctx = _sdk("sse_client")(
+                url=config.url, headers=config.headers or {}, **http_transport_kwargs(config.http)
+            )
+            read_stream, write_stream = await enter_context(stack, sse_ctx)
+            session = _sdk("ClientSession")(read_stream, write_stream)
+            client = await enter_context(stack, session)
+            await client.initialize()
+            return client
+
+        # The host task owns the transport and session until the server is closed
+        host = ContextHost(server_name)
+        self._clients[server_name] = await host.start(enter)
+        self._stdio_contexts[server_name] = host
 
     async def _connect_http(self, server_name: str, config: ServerConfig) -> None:
-        """Connect to Streamable HTTP MCP server."""
-        # Establish HTTP connection
-        http_ctx = streamablehttp_client(url=config.url, headers=config.headers or {})
-        result = await http_ctx.__aenter__()
-        # streamablehttp_client returns (read, write, get_session_id)
-        read_stream, write_stream, _get_session_id = result
-
-        # Store the context manager for cleanup
-        self._stdio_contexts[server_name] = http_ctx
-        self._read_streams[server_name] = read_stream
-        self._write_streams[server_name] = write_stream
-
-        # Create and initialize session
-        session = ClientSession(read_stream, write_stream)
-        client = await session.__aenter__()
-        await client.initialize()
+        """Connect to Streamable HTTP MCP server, resuming its last session if possible.
 
-        # Store client and session context
+        When the server issued a session ID on an earlier connection, the new
+        connection sends it and checks the session with a ping instead of
+        running initialize. A server that no longer knows the session gets a
+        fresh connection and initialize.
+        """
+        options = config.http
+        resumed = self._http_sessions.get(server_name) if options.resumeSession else None
+        headers = dict(config.headers or {})
+        if resumed is not None:
+            headers.update(resumed.headers())
+
+        async def enter(stack: AsyncExitStack) -> ClientSession:
+            # Sessions kept for resumption are only terminated by cleanup(),
+            # not when a connection is dropped
+            http_ctx = _sdk("streamablehttp_client")(
+                url=config.url,
+                headers=headers,
+                terminate_on_close=not options.resumeSession,
+                **http_transport_kwargs(options),
+            )
+            # streamablehttp_client returns (read, write, get_session_id)
+            read_stream, write_stream, get_session_id = await enter_context(stack, http_ctx)
+            session = _sdk("ClientSession")(read_stream, write_stream)
+            client = await enter_context(stack, session)
+            if resumed is not None:
+                await asyncio.wait_for(client.send_ping(), options.timeout)
+                return client
+
+            init_result = await client.initialize()
+            session_id = get_session_id()
+            if options.resumeSession and session_id:
+                self._http_sessions[server_name] = HttpSession(
+                    session_id, str(init_result.protocolVersion)
+                )
+            return client
+
+        # The host task owns the transport and session until the server is closed
+        host = ContextHost(server_name)
+        try:
+            client = await host.start(enter)
+        except Exception as e:
+            if resumed is None:
+                raise
+            logger.info(f"Could not resume session of '{server_name}' ({e!r}), reinitializing")
+            del self._http_sessions[server_name]
+            await self._connect_http(server_name, config)
+            return
+        if resumed is not None:
+            logger.info(f"Resumed session {resumed.session_id} of server '{server_name}'")
         self._clients[server_name] = client
-        self._session_contexts[server_name] = session
+        self._stdio_contexts[server_name] = host
 
     async def _get_server_tools(self, server_name: str) -> list[Tool]:
         """Get list of tools from a server, using cache if available.
@@ -381,6 +697,25 @@ class McpClientManager:
             logger.debug(f"Using cached tools for server: {server_name}")
             return self._tool_cache[server_name]
 
+        async with self._server_lock(server_name):
+            # Another caller may have listed tools while we waited
+            if server_name in self._tool_cache:
+                return self._tool_cache[server_name]
+
+            tools = await self._list_server_tools(server_name)
+
+        server_config = self._config.get_server(server_name) if self._config else None
+        if self._schema_cache and server_config:
+            await self._schema_cache.store(server_name, server_config, tools)
+
+        return tools
+
+    async def _list_server_tools(self, server_name: str) -> list[Tool]:
+        """Query a connected server for its tools and cache them in memory.
+
+        Raises:
+            ServerConnectionError: If not connected or listing fails
+        """
         # Ensure we're connected
         if server_name not in self._clients:
             raise ServerConnectionError(f"Not connected to server: {server_name}")
@@ -388,48 +723,77 @@ class McpClientManager:
         # Query server for tools
         try:
             client = self._clients[server_name]
+            start = time.perf_counter()
             result = await client.list_tools()
+            self._metrics.record_list_tools(server_name, time.perf_counter() - start)
 
             # Defensive unwrapping: handle response.tools
             tools: list[Tool] = result.tools if hasattr(result, "tools") else []
 
             # Cache the results
-            self._tool_cache[server_name] = tools
+            self._cache_tools(server_name, tools)
             logger.debug(f"Cached {len(tools)} tools for server: {server_name}")
 
-            return tools
-
         except Exception as e:
             logger.error(f"Failed to list tools from server '{server_name}': {e}")
             raise ServerConnectionError(f"Could not list tools from server '{server_name}': {e}")
 
-    async def call_tool(
-        self, tool_identifier: str, params: dict[str, Any], max_retries: int = 1
-    ) -> Any:
-        """Call an MCP tool with lazy server connection and automatic retry.
+        return tools
 
-        This is the core method that implements lazy loading. Servers are only
-        connected when their tools are first invoked. On failure, automatically
-        retries up to max_retries times before raising an error.
+    async def _load_cached_tools(self, server_name: str, config: ServerConfig) -> bool:
+        """Populate the in-memory tool cache from the on-disk cache.
 
-        Tool Identifier Format: "serverName__toolName"
+        Args:
+            server_name: Name of the server
+            config: Server configuration (its fingerprint must match the entry)
+
+        Returns:
+            True if tools for the server are now cached in memory
+        """
+        if server_name in self._tool_cache:
+            return True
+        if not self._schema_cache:
+            return False
+
+        tools = await self._schema_cache.load(server_name, config)
+        if tools is None:
+            return False
+
+        self._cache_tools(server_name, tools)
+        return True
+
+    def _cache_tools(self, server_name: str, tools: list[Tool]) -> None:
+        """Cache a server's tools in memory along with their name index."""
+        self._tool_cache[server_name] = tools
+        self._tool_index[server_name] = {tool.name: tool for tool in tools}
+
+    def _forget_tools(self, server_name: str) -> None:
+        """Drop a server's in-memory tool cache and index."""
+        self._tool_cache.pop(server_name, None)
+        self._tool_index.pop(server_name, None)
+
+    def _tool_lookup(self, server_name: str) -> dict[str, Tool]:
+        """Return the name -> Tool index for a server with cached tools."""
+        index = self._tool_index.get(server_name)
+        if index is None:
+            index = {tool.name: tool for tool in self._tool_cache.get(server_name, [])}
+            self._tool_index[server_name] = index
+        return index
+
+    def _parse_tool_identifier(self, tool_identifier: str) -> tuple[str, str, ServerConfig]:
+        """Split a tool identifier and look up its enabled server configuration.
 
         Args:
             tool_identifier: Tool identifier in format "serverName__toolName"
-            params: Dictionary of parameters to pass to the tool
-            max_retries: Maximum number of retry attempts on failure (default: 1)
 
         Returns:
-            The tool execution result (unwrapped from response)
+            Tuple of (server_name, tool_name, server_config)
 
         Raises:
-            ConfigurationError: If manager not initialized
-            ToolNotFoundError: If tool doesn't exist on the specified server
-            ToolExecutionError: If tool execution fails after all retries
-            ServerConnectionError: If unable to connect to server
+            ConfigurationError: If configuration is not loaded
+            ToolNotFoundError: If the identifier is malformed or the server is
+                unknown or disabled
         """
-        self._validate_state_at_least(ConnectionState.INITIALIZED, "call tool")
-
         if not self._config:
             raise ConfigurationError("Configuration not loaded")
 
@@ -453,92 +817,432 @@ class McpClientManager:
         if server_config.disabled:
             raise ToolNotFoundError(f"Server '{server_name}' is disabled in configuration")
 
-        # Lazy connection: connect to server if not already connected
-        if server_name not in self._clients:
-            logger.debug(f"Lazy connecting to server '{server_name}' for tool '{tool_name}'")
+        return server_name, tool_name, server_config
+
+    async def _resolve_tool(
+        self, server_name: str, tool_name: str, server_config: ServerConfig
+    ) -> Tool:
+        """Look up a tool by name, connecting to list tools only on a cache miss.
+
+        Lookup order: in-memory index, persistent cache, live list_tools. A
+        tool absent from a persisted list may just mean the entry is stale, so
+        that entry is dropped and refreshed from the server.
+
+        Raises:
+            ToolNotFoundError: If the server does not expose the tool
+            ServerConnectionError: If connecting or listing fails
+        """
+        if server_name not in self._clients and await self._load_cached_tools(
+            server_name, server_config
+        ):
+            if tool_name not in self._tool_lookup(server_name):
+                logger.debug(f"Tool '{tool_name}' missing from cached tools, refreshing")
+                self._forget_tools(server_name)
+
+        if server_name not in self._tool_cache and server_name not in self._clients:
+            logger.debug(f"Connecting to server '{server_name}' to list tools")
             await self._connect_to_server(server_name, server_config)
 
-        # Verify tool exists on server
-        tools = await self._get_server_tools(server_name)
-        tool_names = [tool.name for tool in tools]
+        await self._get_server_tools(server_name)
+        tool = self._tool_lookup(server_name).get(tool_name)
 
-        if tool_name not in tool_names:
+        if tool is None:
             raise ToolNotFoundError(
                 f"Tool '{tool_name}' not found on server '{server_name}'. "
-                f"Available tools: {tool_names}"
+                f"Available tools: {sorted(self._tool_lookup(server_name))}"
             )
+        return tool
+
+    async def get_tool_input_schema(self, tool_identifier: str) -> dict[str, Any]:
+        """Return a tool's JSON Schema for its parameters.
 
-        # Execute the tool with retry logic
-        last_error: Exception | None = None
+        Served from the tool index (or persistent cache) when available, so
+        callers can validate parameters locally without a server round trip.
+
+        Args:
+            tool_identifier: Tool identifier in format "serverName__toolName"
+
+        Returns:
+            The tool's inputSchema
+
+        Raises:
+            ConfigurationError: If manager not initialized
+            ToolNotFoundError: If the tool does not exist
+            ServerConnectionError: If tools must be listed and the server is unreachable
+        """
+        self._validate_state_at_least(ConnectionState.INITIALIZED, "get tool schema")
+
+        server_name, tool_name, server_config = self._parse_tool_identifier(tool_identifier)
+        tool = await self._resolve_tool(server_name, tool_name, server_config)
+        return tool.inputSchema
+
+    async def call_tool(
+        self, tool_identifier: str, params: dict[str, Any], max_retries: int | None = None
+    ) -> Any:
+        """Call an MCP tool with lazy server connection and automatic retry.
+
+        This is the core method that implements lazy loading. Servers are only
+        connected when their tools are first invoked. Transient failures (lost
+        transports, timeouts) are retried up to max_retries times (by default
+        the server's retry.maxRetries) with the exponential backoff of its
+        RetryPolicy, reconnecting the server
+        if its session died; other failures are raised immediately.
+
+        Tool Identifier Format: "serverName__toolName"
+
+        Args:
+            tool_identifier: Tool identifier in format "serverName__toolName"
+            params: Dictionary of parameters to pass to the tool
+            max_retries: Maximum number of retry attempts on transient failure
+                (default: the server's retry.maxRetries)
+
+        Returns:
+            The tool execution result (unwrapped from response)
+
+        Raises:
+            ConfigurationError: If manager not initialized
+            ToolNotFoundError: If tool doesn't exist on the specified server
+            ToolExecutionError: If tool execution fails after all retries
+            ServerConnectionError: If unable to connect to server
+            CircuitOpenError: If the server's circuit breaker is open
+        """
+        self._validate_state_at_least(ConnectionState.INITIALIZED, "call tool")
+
+        server_name, tool_name, server_config = self._parse_tool_identifier(tool_identifier)
+        probe = self._admit_call(server_name, server_config)
+        try:
+            # Verify tool exists on server (from cache when possible)
+            tool = await self._resolve_tool(server_name, tool_name, server_config)
+
+            # Serve repeated idempotent reads from the result cache (opt-in)
+            result_cache = self._result_cache
+            if result_cache is not None and not result_cache.is_cacheable(tool_identifier, tool):
+                result_cache = None
+            if result_cache is not None:
+                hit, cached_value = result_cache.get(tool_identifier, params)
+                if hit:
+                    logger.debug(f"Result cache hit: {tool_identifier}")
+                    return cached_value
+
+            # Lazy connection: connect to server if not already connected
+            if server_name not in self._clients:
+                logger.debug(f"Lazy connecting to server '{server_name}' for tool '{tool_name}'")
+                await self._connect_to_server(server_name, server_config)
+
+            result = await self._execute_tool(
+                server_name, tool_name, tool_identifier, params, server_config, max_retries
+            )
+        finally:
+            # A probe that never reached the server (cache hit, unknown tool)
+            # must not keep other calls out until resetTimeout
+            if probe:
+                self._circuit(server_name, server_config).release_probe()
+
+        value = self._unwrap_result(result, self._spill_threshold)
+        self._track_spilled(value)
+
+        if result_cache is not None and not self._spilled_in(value):
+            result_cache.put(tool_identifier, params, value)
+
+        return value
+
+    async def _execute_tool(
+        self,
+        server_name: str,
+        tool_name: str,
+        tool_identifier: str,
+        params: dict[str, Any],
+        server_config: ServerConfig,
+        max_retries: int | None,
+    ) -> Any:
+        """Execute a tool with retries governed by the server's RetryPolicy.
+
+        Only transient failures (lost transports, timeouts, network errors) are
+        retried, after an exponential backoff with jitter. When the session's
+        transport is found closed, the server is disconnected and transparently
+        reconnected before the next attempt, so a crashed server does not keep
+        failing subsequent calls. Other errors fail immediately. The call's
+        total latency (including retries), payload sizes and outcome are
+        recorded in the metrics registry.
+
+        Returns:
+            The raw CallToolResult
+
+        Raises:
+            ToolExecutionError: If execution fails with a non-transient error
+                or after all retries
+            ServerConnectionError: If reconnecting to the server fails
+        """
+        policy = server_config.retry
+        breaker = self._circuit(server_name, server_config)
+        attempts = (policy.maxRetries if max_retries is None else max_retries) + 1
+        attempt = 0
+        start = time.perf_counter()
+        request_bytes = payload_size(params)
+        self._used_servers.add(server_name)
+
+        while True:
+            # Reconnect if a previous attempt found the transport closed
+            if server_name not in self._clients:
+                logger.info(f"Reconnecting to server '{server_name}'")
+                await self._connect_to_server(server_name, server_config)
 
-        for attempt in range(max_retries + 1):
             try:
                 client = self._clients[server_name]
                 logger.info(f"Executing tool: {tool_identifier}" + (f" (attempt {attempt + 1})" if attempt > 0 else ""))
                 logger.debug(f"Tool parameters: {params}")
 
-                result = await client.call_tool(tool_name, params)
+                async with self._request_semaphore(server_name, server_config):
+                    result = await client.call_tool(tool_name, params)
 
-                # Defensive unwrapping: try multiple strategies to get the actual result
-                # 1. Try result.value (most common)
-                if hasattr(result, "value"):
-                    unwrapped = result.value
-                # 2. Try result.content (alternative response format)
-                elif hasattr(result, "content"):
-                    unwrapped = result.content
-                # 3. Fall back to result itself
-                else:
-                    unwrapped = result
-
-                # Additional unwrapping for text responses
-                if isinstance(unwrapped, list) and len(unwrapped) > 0:
-                    first_item = unwrapped[0]
-                    if hasattr(first_item, "text"):
-                        text_content = first_item.text
-                        # Try to parse as JSON if it looks like JSON
-                        if isinstance(text_content, str) and text_content.strip().startswith(
-                            ("{", "[")
-                        ):
-                            try:
-                                return json.loads(text_content)
-                            except json.JSONDecodeError:
-                                return text_content
-                        return text_content
-
-                logger.debug(f"Tool execution result: {unwrapped}")
-                return unwrapped
+                self._metrics.record_call(
+                    server_name,
+                    tool_identifier,
+                    time.perf_counter() - start,
+                    request_bytes=request_bytes,
+                    response_bytes=payload_size(result),
+                )
+                breaker.record_success()
+                return result
 
             except Exception as e:
-                last_error = e
-                if attempt < max_retries:
-                    print(f"⚠️  MCP call failed (attempt {attempt + 1}/{max_retries + 1}), retrying in 1s...", file=sys.stderr)
-                    logger.warning(f"Tool execution attempt {attempt + 1} failed for '{tool_identifier}': {e}")
-                    await asyncio.sleep(1)  # Brief delay before retry
+                if is_connection_lost(e):
+                    logger.warning(f"Connection to server '{server_name}' lost: {e!r}")
+                    pooled = self._pooled.get(server_name)
+                    if pooled is not None:
+                        self._stdio_pool.discard(pooled)
+                    await self.disconnect_server(server_name)
+
+                attempt += 1
+                transient = is_transient_error(e)
+                if transient:
+                    breaker.record_failure(e)
                 else:
-                    logger.error(f"Tool execution failed after {max_retries + 1} attempts for '{tool_identifier}': {e}")
+                    # The server answered; the failure is the tool's, not the server's
+                    breaker.record_success()
+
+                if not transient:
+                    logger.error(f"Tool execution failed for '{tool_identifier}' (not retryable): {e}")
+                elif not breaker.allows_calls():
+                    logger.error(f"Tool execution failed for '{tool_identifier}' (circuit open): {e!r}")
+                elif attempt < attempts:
+                    delay = policy.compute_delay(attempt - 1)
+                    print(f"⚠️  MCP call failed (attempt {attempt}/{attempts}), retrying in {delay:.1f}s...", file=sys.stderr)
+                    logger.warning(f"Tool execution attempt {attempt} failed for '{tool_identifier}': {e!r}")
+                    self._metrics.record_retry(server_name, tool_identifier)
+                    await asyncio.sleep(delay)
+                    continue
+                else:
+                    logger.error(f"Tool execution failed after {attempts} attempts for '{tool_identifier}': {e!r}")
+
+                self._metrics.record_call(
+                    server_name,
+                    tool_identifier,
+                    time.perf_counter() - start,
+                    request_bytes=request_bytes,
+                    error=e,
+                )
+                print(f"❌ MCP call failed after {attempt} attempt(s): {e}", file=sys.stderr)
+                raise ToolExecutionError(
+                    f"Failed to execute tool '{tool_identifier}' after {attempt} attempt(s): {e}"
+                ) from e
+
+    @staticmethod
+    def _unwrap_result(result: Any, spill_threshold: int | None = None) -> Any:
+        """Defensively unwrap a call_tool response into its payload.
+
+        Args:
+            result: Raw response from ClientSession.call_tool
+            spill_threshold: Spill text items longer than this to temporary
+                files (None: never spill)
+
+        Returns:
+            Parsed JSON or text of the first text item (stream_tool() yields
+            every item), or the unwrapped value
+        """
+        # Defensive unwrapping: try multiple strategies to get the actual result
+        # 1. Try result.value (most common)
+        if hasattr(result, "value"):
+            unwrapped = result.value
+        # 2. Try result.content (alternative response format)
+        elif hasattr(result, "content"):
+            unwrapped = result.content
+        # 3. Fall back to result itself
+        else:
+            unwrapped = result
+
+        # Additional unwrapping for text responses (JSON text is parsed)
+        if isinstance(unwrapped, list) and len(unwrapped) > 0:
+            if hasattr(unwrapped[0], "text"):
+                return unwrap_content(unwrapped[0], spill_threshold)
+
+        logger.debug(f"Tool execution result: {unwrapped}")
+        return unwrapped
+
+    def _track_spilled(self, value: Any) -> None:
+        """Remember spill files in an unwrapped result for removal on cleanup."""
+        items = value if isinstance(value, list) else [value]
+        self._spilled.extend(item for item in items if isinstance(item, SpilledText))
+
+    @staticmethod
+    def _spilled_in(value: Any) -> bool:
+        """Return True if an unwrapped result references spill files."""
+        items = value if isinstance(value, list) else [value]
+        return any(isinstance(item, SpilledText) for item in items)
+
+    async def stream_tool(
+        self,
+        tool_identifier: str,
+        params: dict[str, Any],
+        max_retries: int | None = None,
+        spill_threshold: int | None = DEFAULT_SPILL_THRESHOLD,
+        json_items: bool = False,
+    ) -> AsyncIterator[Any]:
+        """Call an MCP tool and yield its content items one at a time.
+
+        Unlike call_tool(), every content item is yielded (not just the
+        first), text longer than ``spill_threshold`` characters is spilled to
+        a temporary file and yielded as a SpilledText handle, and with
+        ``json_items`` a text item holding a JSON array is parsed
+        incrementally, yielding each array element (text that only starts
+        with "[" is yielded as text). Results are never served
+        from or stored in the result cache.
+
+        Example:
+            async for page in manager.stream_tool(
+                "firecrawl__crawl", {"url": url}, json_items=True
+            ):
+                process(page)
+
+        Args:
+            tool_identifier: Tool identifier in format "serverName__toolName"
+            params: Dictionary of parameters to pass to the tool
+            max_retries: Maximum number of retry attempts on transient failure
+            spill_threshold: Maximum inline text length (None: no limit)
+            json_items: Yield elements of JSON-array text items individually
+
+        Yields:
+            Unwrapped content items (parsed JSON, text, SpilledText, or the
+            raw item for non-text content)
+
+        Raises:
+            ConfigurationError: If manager not initialized
+            ToolNotFoundError: If tool doesn't exist on the specified server
+            ToolExecutionError: If tool execution fails after all retries, or
+                a JSON array item turns out malformed after elements of it
+                were yielded
+            ServerConnectionError: If unable to connect to server
+            CircuitOpenError: If the server's circuit breaker is open
+        """
+        self._validate_state_at_least(ConnectionState.INITIALIZED, "stream tool")
+
+        server_name, tool_name, server_config = self._parse_tool_identifier(tool_identifier)
+        probe = self._admit_call(server_name, server_config)
+        try:
+            await self._resolve_tool(server_name, tool_name, server_config)
+
+            if server_name not in self._clients:
+                await self._connect_to_server(server_name, server_config)
+
+            result = await self._execute_tool(
+                server_name, tool_name, tool_identifier, params, server_config, max_retries
+            )
+        finally:
+            if probe:
+                self._circuit(server_name, server_config).release_probe()
+        items = getattr(result, "content", None)
+        if not isinstance(items, list):
+            items = [result]
+
+        for item in items:
+            text = getattr(item, "text", None)
+            if json_items and isinstance(text, str) and text.lstrip().startswith("["):
+                yielded = 0
+                try:
+                    for element in iter_json_array(text):
+                        yielded += 1
+                        yield element
+                    continue
+                except json.JSONDecodeError as e:
+                    if yielded:
+                        raise ToolExecutionError(
+                            f"Malformed JSON array from '{tool_identifier}' "
+                            f"after {yielded} element(s): {e}"
+                        ) from e
+                    # Text that merely starts with "[" is yielded like any other text
+
+            value = unwrap_content(item, spill_threshold)
+            self._track_spilled(value)
+            yield value
+
+    async def call_tools_batch(
+        self,
+        calls: Sequence[ToolCall],
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        max_retries: int | None = None,
+    ) -> list[Any]:
+        """Call many tools concurrently with ordered results and partial failures.
+
+        Calls are grouped by server and interleaved across servers; each server
+        is connected once and its requests are pipelined over one session
+        (still bounded by ServerConfig.maxConcurrentRequests). A failing call
+        does not affect the others: its exception is returned in its slot.
+
+        Args:
+            calls: Sequence of (tool_identifier, params) pairs
+            concurrency: Maximum number of calls executing at once
+            max_retries: Maximum number of retry attempts per call
+
+        Returns:
+            List aligned with ``calls``: each entry is the tool result or the
+            Exception raised for that call (check with isinstance)
+
+        Raises:
+            ConfigurationError: If manager not initialized or concurrency < 1
+        """
+        self._validate_state_at_least(ConnectionState.INITIALIZED, "call tools batch")
+
+        async def call(tool_identifier: str, params: dict[str, Any]) -> Any:
+            return await self.call_tool(tool_identifier, params, max_retries=max_retries)
 
-        # All retries exhausted
-        print(f"❌ MCP call failed after {max_retries + 1} attempts: {last_error}", file=sys.stderr)
-        raise ToolExecutionError(f"Failed to execute tool '{tool_identifier}' after {max_retries + 1} attempts: {last_error}")
+        return await _run_batch(calls, call, concurrency)
 
-    async def list_all_tools(self) -> list[Tool]:
+    async def list_all_tools(
+        self,
+        concurrency: int = DEFAULT_SERVER_CONCURRENCY,
+        timeout: float | None = DEFAULT_SERVER_TIMEOUT,
+    ) -> list[Tool]:
         """List all available tools from all enabled servers.
 
-        This method connects to all enabled servers to retrieve their tool lists.
-        Results are cached per server to avoid repeated queries.
+        Servers whose tools are in the persistent cache are not contacted at
+        all. The rest are connected and queried concurrently (bounded by
+        ``concurrency``), so cold start costs roughly the slowest server rather
+        than the sum of all of them. Each server gets its own ``timeout``; a
+        slow, hung or failing server is logged and skipped without blocking
+        the others. Results are cached per server to avoid repeated queries.
+
+        Per-server wall-clock timings are available afterwards via
+        get_server_timings().
+
+        Args:
+            concurrency: Maximum number of servers to connect/query at once
+            timeout: Per-server timeout in seconds (None disables the timeout)
 
         Returns:
-            List of all available tools across all enabled servers
+            List of all available tools across all enabled servers, in
+            configuration order
 
         Raises:
-            ConfigurationError: If manager not initialized
-            ServerConnectionError: If unable to connect to any server
+            ConfigurationError: If manager not initialized or concurrency < 1
         """
         self._validate_state_at_least(ConnectionState.INITIALIZED, "list all tools")
 
         if not self._config:
             raise ConfigurationError("Configuration not loaded")
 
+        if concurrency < 1:
+            raise ConfigurationError(f"concurrency must be at least 1, got {concurrency}")
+
         all_tools: list[Tool] = []
         enabled_servers = self._config.get_enabled_servers()
 
@@ -546,83 +1250,298 @@ class McpClientManager:
             logger.warning("No enabled servers configured")
             return all_tools
 
-        logger.info(f"Listing tools from {len(enabled_servers)} enabled servers")
+        logger.info(
+            f"Listing tools from {len(enabled_servers)} enabled servers "
+            f"(concurrency: {concurrency}, timeout: {timeout}s)"
+        )
 
-        for server_name, server_config in enabled_servers.items():
-            try:
-                # Connect to server if not already connected
-                if server_name not in self._clients:
-                    await self._connect_to_server(server_name, server_config)
+        semaphore = asyncio.Semaphore(concurrency)
 
-                # Get tools from server (uses cache if available)
-                tools = await self._get_server_tools(server_name)
-                all_tools.extend(tools)
-                logger.debug(f"Server '{server_name}': {len(tools)} tools")
+        async def list_server(server_name: str, server_config: ServerConfig) -> list[Tool]:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    async with asyncio.timeout(timeout):
+                        # Servers with fresh persisted tools need no connection
+                        cached = await self._load_cached_tools(server_name, server_config)
+
+                        # Connect to server if not already connected
+                        if not cached and server_name not in self._clients:
+                            await self._connect_to_server(server_name, server_config)
+
+                        # Get tools from server (uses cache if available)
+                        tools = await self._get_server_tools(server_name)
+                    logger.debug(f"Server '{server_name}': {len(tools)} tools")
+                    return tools
+
+                except TimeoutError:
+                    logger.error(
+                        f"Timed out listing tools from server '{server_name}' after {timeout}s"
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to list tools from server '{server_name}': {e}")
+                    # Continue with other servers rather than failing completely
+                finally:
+                    self._server_timings[server_name] = time.perf_counter() - start
+                return []
+
+        results = await asyncio.gather(
+            *(list_server(name, config) for name, config in enabled_servers.items())
+        )
+        for tools in results:
+            all_tools.extend(tools)
 
-            except Exception as e:
-                logger.error(f"Failed to list tools from server '{server_name}': {e}")
-                # Continue with other servers rather than failing completely
+        for server_name, elapsed in sorted(
+            self._server_timings.items(), key=lambda item: item[1], reverse=True
+        ):
+            if server_name in enabled_servers:
+                logger.info(f"Server '{server_name}' ready in {elapsed:.2f}s")
 
         logger.info(f"Total tools available: {len(all_tools)}")
         return all_tools
 
-    async def cleanup(self) -> None:
+    def get_server_timings(self) -> dict[str, float]:
+        """Return wall-clock seconds spent connecting and listing tools per server.
+
+        Populated by list_all_tools(); useful for finding which server
+        dominates startup.
+
+        Returns:
+            Mapping of server name to elapsed seconds (copy)
+        """
+        return dict(self._server_timings)
+
+    @property
+    def metrics(self) -> MetricsRegistry:
+        """Latency, payload-size, retry and error metrics per server and tool.
+
+        Metrics survive cleanup(); call metrics.reset() to start over.
+        """
+        return self._metrics
+
+    @property
+    def result_cache(self) -> ResultCache | None:
+        """The result memoization cache, or None if disabled."""
+        return self._result_cache
+
+    def set_result_cache(self, result_cache: ResultCache | None) -> None:
+        """Enable (or disable with None) memoization of SAFE tool results.
+
+        Args:
+            result_cache: Cache to use for subsequent calls
+        """
+        self._result_cache = result_cache
+
+    @property
+    def connected_servers(self) -> list[str]:
+        """Names of servers with an active session."""
+        return list(self._clients)
+
+    def get_shutdown_timings(self) -> dict[str, float]:
+        """Return wall-clock seconds each server took to shut down.
+
+        Populated by cleanup() and disconnect_server(); useful for finding
+        servers that stall process exit.
+
+        Returns:
+            Mapping of server name to elapsed seconds (copy)
+        """
+        return dict(self._shutdown_timings)
+
+    async def _exit_context(self, server_name: str, ctx: Any, kind: str) -> None:
+        """Exit a session or transport context, tolerating cross-task cancel scopes.
+
+        Args:
+            server_name: Server owning the context (for logging)
+            ctx: Async context manager previously entered via __aenter__
+            kind: Context kind used in log messages ("session" or "stdio")
+        """
+        await exit_context(server_name, ctx, kind)
+
+    async def _exit_server_contexts(
+        self,
+        server_name: str,
+        session_ctx: Any | None,
+        stdio_ctx: Any | None,
+        http_session: HttpSession | None = None,
+    ) -> None:
+        """Exit a server's session context, then its transport context.
+
+        A Streamable HTTP session kept for resumption is terminated last.
+        """
+        if session_ctx is not None:
+            await self._exit_context(server_name, session_ctx, "session")
+        if stdio_ctx is not None:
+            await self._exit_context(server_name, stdio_ctx, "stdio")
+        if http_session is not None and self._config is not None:
+            config = self._config.mcpServers.get(server_name)
+            if config is not None and config.url:
+                config = self._resolve_config(server_name, config)
+                await terminate_http_session(config.url, config.headers, http_session, config.http)
+
+    async def _close_server(
+        self, server_name: str, grace_period: float, end_session: bool = True
+    ) -> float:
+        """Close one server, escalating to SIGTERM and SIGKILL after the grace period.
+
+        Pooled stdio servers are released; the process is only closed when
+        no other manager holds it. See close_with_escalation for the
+        escalation steps.
+
+        Args:
+            server_name: Name of the server to close
+            grace_period: Seconds the server may take to close on its own
+            end_session: Terminate a Streamable HTTP session kept for
+                resumption; False keeps it for the next connection
+
+        Returns:
+            Seconds the shutdown took
+        """
+        health_task = self._health_tasks.pop(server_name, None)
+        if (
+            health_task is not None
+            and health_task is not asyncio.current_task()
+            and _on_running_loop(health_task)
+        ):
+            health_task.cancel()
+        pooled = self._pooled.pop(server_name, None)
+        session_ctx = self._session_contexts.pop(server_name, None)
+        stdio_ctx = self._stdio_contexts.pop(server_name, None)
+        self._clients.pop(server_name, None)
+
+        http_session = self._http_sessions.pop(server_name, None) if end_session else None
+
+        start = time.perf_counter()
+        if pooled is not None:
+            outcome = await self._stdio_pool.release(pooled, grace_period)
+        else:
+            outcome = await close_with_escalation(
+                server_name,
+                self._exit_server_contexts(server_name, session_ctx, stdio_ctx, http_session),
+                None,
+                grace_period,
+            )
+
+        elapsed = time.perf_counter() - start
+        self._shutdown_timings[server_name] = elapsed
+        self._metrics.record_shutdown(server_name, elapsed)
+        log = logger.info if outcome in ("closed", "released") else logger.warning
+        log(f"Server '{server_name}' {outcome} in {elapsed:.2f}s")
+        return elapsed
+
+    async def disconnect_server(self, server_name: str) -> None:
+        """Close the connection to a single server, keeping its cached tools.
+
+        The server reconnects lazily on its next tool call, resuming its
+        Streamable HTTP session if it has one. Used to evict idle servers
+        from long-lived processes such as the connection daemon.
+
+        Args:
+            server_name: Name of the server to disconnect
+        """
+        async with self._server_lock(server_name):
+            await self._close_server(server_name, self._shutdown_grace, end_session=False)
+        logger.info(f"Disconnected from server: {server_name}")
+
+    async def cleanup(self, grace_period: float | None = None) -> None:
         """Close all connections and reset manager to uninitialized state.
 
-        This method gracefully closes all active server connections and clears
-        all cached data, returning the manager to UNINITIALIZED state.
+        All servers are closed concurrently, each bounded by the grace period
+        (see _close_server), so exit takes about as long as the slowest
+        server rather than the sum of all of them. Per-server shutdown times
+        are logged and available from get_shutdown_timings().
+
+        Args:
+            grace_period: Seconds each server may take to close before it is
+                terminated (default: the manager's shutdown_grace)
         """
         logger.info("Cleaning up MCP Client Manager")
+        grace = self._shutdown_grace if grace_period is None else grace_period
+
+        # Stop warmups still connecting (their servers are closed below) and health
+        # checks. Tasks of another (possibly closed) loop cannot be awaited here.
+        background = [
+            task
+            for task in (*self._warmup_tasks, *self._health_tasks.values())
+            if _on_running_loop(task)
+        ]
+        if background:
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+        self._health_tasks.clear()
+
+        if self._usage_stats is not None and self._config is not None:
+            self._usage_stats.record_run(
+                self._used_servers, known=self._config.get_enabled_servers()
+            )
 
-        # Properly exit all session contexts
-        for server_name in list(self._session_contexts.keys()):
-            try:
-                session_ctx = self._session_contexts[server_name]
-                await session_ctx.__aexit__(None, None, None)
-                logger.debug(f"Closed session context for server: {server_name}")
-            except (RuntimeError, asyncio.CancelledError) as e:
-                # Ignore cancel scope errors that can occur when contexts are entered
-                # and exited in different event loop tasks (e.g., when scripts call asyncio.run())
-                if "cancel scope" in str(e).lower() or isinstance(e, asyncio.CancelledError):
-                    logger.debug(
-                        f"Ignoring cancel scope error during cleanup for '{server_name}': {e}"
-                    )
-                else:
-                    logger.error(f"Error closing session context for '{server_name}': {e}")
-            except Exception as e:
-                logger.error(f"Error closing session context for '{server_name}': {e}")
-
-        # Properly exit all stdio contexts
-        for server_name in list(self._stdio_contexts.keys()):
-            try:
-                stdio_ctx = self._stdio_contexts[server_name]
-                await stdio_ctx.__aexit__(None, None, None)
-                logger.debug(f"Closed stdio context for server: {server_name}")
-            except (RuntimeError, asyncio.CancelledError) as e:
-                # Ignore cancel scope errors that can occur when contexts are entered
-                # and exited in different event loop tasks (e.g., when scripts call asyncio.run())
-                if "cancel scope" in str(e).lower() or isinstance(e, asyncio.CancelledError):
-                    logger.debug(
-                        f"Ignoring cancel scope error during cleanup for '{server_name}': {e}"
-                    )
-                else:
-                    logger.error(f"Error closing stdio context for '{server_name}': {e}")
-            except Exception as e:
-                logger.error(f"Error closing stdio context for '{server_name}': {e}")
+        server_names = list(
+            dict.fromkeys(chain(self._pooled, self._session_contexts, self._stdio_contexts))
+        )
+        if server_names:
+            start = time.perf_counter()
+            self._shutdown_timings.clear()
+            await asyncio.gather(*(self._close_server(name, grace) for name in server_names))
+            logger.info(
+                f"Closed {len(server_names)} server(s) in {time.perf_counter() - start:.2f}s"
+            )
 
         # Clear all state
         self._clients.clear()
         self._session_contexts.clear()
         self._stdio_contexts.clear()
+        self._pooled.clear()
+        self._http_sessions.clear()
+        self._breakers.clear()
         self._tool_cache.clear()
-        self._read_streams.clear()
-        self._write_streams.clear()
+        self._tool_index.clear()
+        if self._result_cache is not None:
+            self._result_cache.clear()
+        for spilled in self._spilled:
+            spilled.unlink()
+        self._spilled.clear()
+        self._server_timings.clear()
+        self._server_locks.clear()
+        self._request_semaphores.clear()
         self._config = None
+        self._config_resolvers.clear()
+        self._used_servers.clear()
         self._mark_uninitialized()
 
         logger.info("Cleanup complete")
 
 
+async def open_stdio_server(server_name: str, config: ServerConfig) -> PooledServer:
+    """Spawn a stdio server and initialize its session (StdioServerPool opener).
+
+    Args:
+        server_name: Name of the server (for logging)
+        config: Resolved server configuration
+
+    Returns:
+        The live server, not yet referenced by any holder
+    """
+    server_params = _sdk("StdioServerParameters")(
+        command=config.command,
+        args=config.args,
+        env=config.env,
+    )
+
+    async def enter(stack: AsyncExitStack) -> tuple[ClientSession, int | None]:
+        stdio_ctx = _sdk("stdio_client")(server_params)
+        read_stream, write_stream = await enter_context(stack, stdio_ctx)
+        session = _sdk("ClientSession")(read_stream, write_stream)
+        client = await enter_context(stack, session)
+        await client.initialize()
+        return client, stdio_process_pid(stdio_ctx)
+
+    # The host task owns the process and session until the last holder releases it
+    host = ContextHost(server_name)
+    client, pid = await host.start(enter)
+    return PooledServer(server_name, host, client, pid)
+
+
 # Singleton pattern using lru_cache (thread-safe)
 @lru_cache(maxsize=1)
 def get_mcp_client_manager() -> McpClientManager:
@@ -630,26 +1549,56 @@ def get_mcp_client_manager() -> McpClientManager:
 
     This function uses functools.lru_cache to ensure only one instance
     of the manager exists, providing thread-safe singleton behavior.
+    The singleton persists tool schemas under .claude/cache/ unless
+    MCP_TOOL_CACHE_TTL=0, memoizes SAFE tool results when
+    MCP_RESULT_CACHE_TTL is set to a positive number of seconds, and spills
+    text results longer than MCP_RESULT_SPILL_THRESHOLD characters to disk.
+    MCP_SHUTDOWN_GRACE sets the seconds each server may take to shut down.
 
     Returns:
         The singleton McpClientManager instance
     """
     logger.debug("Getting MCP Client Manager singleton")
-    return McpClientManager()
+    return McpClientManager(
+        schema_cache=ToolSchemaCache.from_env(),
+        result_cache=ResultCache.from_env(),
+        spill_threshold=spill_threshold_from_env(),
+        shutdown_grace=shutdown_grace_from_env(),
+        config_cache=get_config_cache(),
+        usage_stats=UsageStats.from_env(),
+    )
+
+
+@lru_cache(maxsize=1)
+def _daemon_caller() -> Callable[..., Awaitable[Any]]:
+    """Return daemon.call_via_daemon, importing it on first use.
+
+    runtime.daemon imports this module, so it cannot be imported at the top.
+    """
+    from .daemon import call_via_daemon
+
+    return call_via_daemon
 
 
 async def call_mcp_tool(
-    tool_identifier: str, params: dict[str, Any], max_retries: int = 1
+    tool_identifier: str, params: dict[str, Any], max_retries: int | None = None
 ) -> Any:
     """Convenience function for calling MCP tools using the singleton manager.
 
     This is a high-level API that automatically uses the singleton manager instance.
-    On failure, automatically retries once before raising an error.
+    When an MCP daemon (runtime.daemon) is listening for the current project,
+    the call is routed through it so warm server sessions are reused; otherwise
+    servers are connected in-process. Set MCP_DAEMON=0 to disable routing.
+    Calls routed through the daemon are recorded in the singleton's metrics
+    with their end-to-end latency and the sizes of the daemon's request and
+    response frames. Transient failures are retried up to max_retries times
+    with backoff (see McpClientManager.call_tool()) before an error is raised.
 
     Args:
         tool_identifier: Tool identifier in format "serverName__toolName"
         params: Dictionary of parameters to pass to the tool
-        max_retries: Maximum number of retry attempts on failure (default: 1)
+        max_retries: Maximum number of retry attempts on failure
+            (default: the server's retry.maxRetries)
 
     Returns:
         The tool execution result
@@ -659,6 +1608,104 @@ async def call_mcp_tool(
         ToolNotFoundError: If tool doesn't exist
         ToolExecutionError: If tool execution fails after all retries
         ServerConnectionError: If unable to connect to server
+        CircuitOpenError: If the server's circuit breaker is open
     """
     manager = get_mcp_client_manager()
+    server_name = tool_identifier.split("__", 1)[0]
+    call_via_daemon = _daemon_caller()
+    sizes: dict[str, int] = {}
+    start = time.perf_counter()
+    try:
+        value = await call_via_daemon(tool_identifier, params, max_retries=max_retries, sizes=sizes)
+    except DaemonUnavailableError:
+        pass
+    except Exception as e:
+        manager.metrics.record_call(
+            server_name,
+            tool_identifier,
+            time.perf_counter() - start,
+            request_bytes=sizes.get("request_bytes", 0),
+            error=e,
+        )
+        raise
+    else:
+        manager.metrics.record_call(
+            server_name,
+            tool_identifier,
+            time.perf_counter() - start,
+            request_bytes=sizes["request_bytes"],
+            response_bytes=sizes["response_bytes"],
+        )
+        return value
+
     return await manager.call_tool(tool_identifier, params, max_retries=max_retries)
+
+
+async def stream_mcp_tool(
+    tool_identifier: str,
+    params: dict[str, Any],
+    max_retries: int | None = None,
+    spill_threshold: int | None = DEFAULT_SPILL_THRESHOLD,
+    json_items: bool = False,
+) -> AsyncIterator[Any]:
+    """Convenience function for streaming a tool result using the singleton manager.
+
+    Streaming always runs in-process (it is not routed through the daemon).
+    See McpClientManager.stream_tool() for the arguments.
+
+    Example:
+        async for item in stream_mcp_tool("fetch__fetch", {"url": url}):
+            if isinstance(item, SpilledText):
+                with item.open() as f:
+                    ...
+
+    Yields:
+        Unwrapped content items
+    """
+    manager = get_mcp_client_manager()
+    async for item in manager.stream_tool(
+        tool_identifier,
+        params,
+        max_retries=max_retries,
+        spill_threshold=spill_threshold,
+        json_items=json_items,
+    ):
+        yield item
+
+
+async def call_mcp_tools(
+    calls: Sequence[ToolCall],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    max_retries: int | None = None,
+) -> list[Any]:
+    """Convenience function for calling many MCP tools concurrently.
+
+    Batch counterpart of call_mcp_tool(): each call is routed the same way
+    (through the daemon when running, otherwise the singleton manager).
+    Results are returned in input order; a failed call yields its exception
+    in place of a result instead of aborting the batch.
+
+    Example:
+        results = await call_mcp_tools(
+            [("fetch__fetch", {"url": url}) for url in urls], concurrency=10
+        )
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                print(f"{url} failed: {result}")
+
+    Args:
+        calls: Sequence of (tool_identifier, params) pairs
+        concurrency: Maximum number of calls executing at once
+        max_retries: Maximum number of retry attempts per call
+
+    Returns:
+        List aligned with ``calls`` of results or Exceptions
+
+    Raises:
+        ConfigurationError: If concurrency < 1
+    """
+
+    async def call(tool_identifier: str, params: dict[str, Any]) -> Any:
+        return await call_mcp_tool(tool_identifier, params, max_retries=max_retries)
+
+    return await _run_batch(calls, call, concurrency)
@@ -0,0 +1,347 @@
+"""In-process metrics for MCP server connections and tool calls.
+
+MetricsRegistry records, per server and per tool, how long connects,
+list_tools, call_tool and shutdown take, request/response payload sizes,
+retries and errors. McpClientManager feeds it as a side effect of normal operation; the
+harness writes a JSON snapshot at exit so slow servers can be identified
+after the fact.
+
+Recording is cheap (a few dict lookups and a bisect per sample) and the
+registry holds only aggregates, never payloads.
+"""
+
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("mcp_execution.metrics")
+
+# Upper bounds (seconds) of latency histogram buckets; a final overflow bucket is implicit
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# Environment variables controlling the harness metrics dump
+METRICS_ENV = "MCP_METRICS"
+METRICS_FILE_ENV = "MCP_METRICS_FILE"
+
+
+def default_metrics_path() -> Path:
+    """Return the path of the JSON metrics dump (MCP_METRICS_FILE overrides)."""
+    override = os.environ.get(METRICS_FILE_ENV)
+    if override:
+        return Path(override).expanduser()
+    return Path.cwd() / ".claude" / "cache" / "mcp-metrics.json"
+
+
+def payload_size(value: Any) -> int:
+    """Approximate the wire size of a request or response in UTF-8 bytes.
+
+    Tool results (values with a ``content`` list, e.g. CallToolResult) are
+    measured by the size of their content items' text and base64 data, and
+    strings by their own size, so multi-MB results are never serialized
+    again just to be measured. Other values (e.g. request parameters) are
+    measured by their compact JSON encoding, falling back to repr().
+    """
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return _utf8_size(value)
+    content = getattr(value, "content", None)
+    if isinstance(content, list):
+        return sum(_content_size(item) for item in content)
+    try:
+        text = json.dumps(value, default=str, separators=(",", ":"), ensure_ascii=False)
+    except (TypeError, ValueError):
+        text = repr(value)
+    return len(text.encode("utf-8"))
+
+
+def _content_size(item: Any) -> int:
+    """Return the length of a content item's text or data (0 if it has none)."""
+    resource = getattr(item, "resource", None)
+    if resource is not None:
+        item = resource
+    size = 0
+    for attr in ("text", "data", "blob"):
+        field = getattr(item, attr, None)
+        if isinstance(field, str):
+            size += _utf8_size(field)
+    return size
+
+
+def _utf8_size(text: str) -> int:
+    """Return the UTF-8 size of text, without encoding it when it is ASCII."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations in seconds.
+
+    Attributes:
+        counts: Sample counts per bucket of LATENCY_BUCKETS, plus overflow
+        count: Total number of samples
+        total: Sum of all samples
+        min: Smallest sample (0.0 when empty)
+        max: Largest sample (0.0 when empty)
+    """
+
+    def __init__(self) -> None:
+        """Create an empty histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one sample."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        if self.count == 0 or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th percentile (0-100) as the upper bound of its bucket.
+
+        The estimate is clamped to the observed maximum, so it is exact for
+        the slowest sample and never exceeds it.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count:
+                bound = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summarize the histogram as JSON-serializable data."""
+        buckets = {
+            f"le_{bound}": self.counts[index] for index, bound in enumerate(LATENCY_BUCKETS)
+        }
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+            "min": round(self.min, 6),
+            "max": round(self.max, 6),
+            "p50": round(self.percentile(50), 6),
+            "p95": round(self.percentile(95), 6),
+            "p99": round(self.percentile(99), 6),
+            "buckets": buckets,
+        }
+
+
+class ToolMetrics:
+    """Aggregates for one tool identifier."""
+
+    def __init__(self) -> None:
+        """Create empty aggregates."""
+        self.latency = Histogram()
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.error_types: Counter[str] = Counter()
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.max_response_bytes = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summarize as JSON-serializable data."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "error_types": dict(self.error_types),
+            "latency": self.latency.to_dict(),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "max_response_bytes": self.max_response_bytes,
+        }
+
+
+class ServerMetrics:
+    """Aggregates for one server (calls are summed over its tools)."""
+
+    def __init__(self) -> None:
+        """Create empty aggregates."""
+        self.connect = Histogram()
+        self.list_tools = Histogram()
+        self.shutdown = Histogram()
+        self.latency = Histogram()
+        self.connect_errors = 0
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.circuit_state = "closed"
+        self.circuit_opens = 0
+        self.circuit_rejections = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summarize as JSON-serializable data."""
+        return {
+            "connects": self.connect.count,
+            "connect_errors": self.connect_errors,
+            "connect_seconds": self.connect.to_dict(),
+            "list_tools_seconds": self.list_tools.to_dict(),
+            "shutdown_seconds": self.shutdown.to_dict(),
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "latency": self.latency.to_dict(),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "circuit_state": self.circuit_state,
+            "circuit_opens": self.circuit_opens,
+            "circuit_rejections": self.circuit_rejections,
+        }
+
+
+class MetricsRegistry:
+    """Per-server and per-tool metrics for one McpClientManager.
+
+    All record_* methods are synchronous and safe to call from any task of
+    the manager's event loop.
+
+    Example:
+        snapshot = get_mcp_client_manager().metrics.snapshot()
+        slowest = max(snapshot["servers"].items(), key=lambda s: s[1]["latency"]["p95"])
+    """
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self._servers: dict[str, ServerMetrics] = {}
+        self._tools: dict[str, ToolMetrics] = {}
+        self._started_at = time.time()
+
+    def _server(self, server_name: str) -> ServerMetrics:
+        metrics = self._servers.get(server_name)
+        if metrics is None:
+            metrics = self._servers[server_name] = ServerMetrics()
+        return metrics
+
+    def _tool(self, tool_identifier: str) -> ToolMetrics:
+        metrics = self._tools.get(tool_identifier)
+        if metrics is None:
+            metrics = self._tools[tool_identifier] = ToolMetrics()
+        return metrics
+
+    def record_connect(self, server_name: str, seconds: float, ok: bool = True) -> None:
+        """Record a connection attempt (transport setup plus session initialize)."""
+        server = self._server(server_name)
+        server.connect.observe(seconds)
+        if not ok:
+            server.connect_errors += 1
+
+    def record_list_tools(self, server_name: str, seconds: float) -> None:
+        """Record a live list_tools round trip."""
+        self._server(server_name).list_tools.observe(seconds)
+
+    def record_shutdown(self, server_name: str, seconds: float) -> None:
+        """Record how long closing a server's session and transport took."""
+        self._server(server_name).shutdown.observe(seconds)
+
+    def record_call(
+        self,
+        server_name: str,
+        tool_identifier: str,
+        seconds: float,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        error: BaseException | None = None,
+    ) -> None:
+        """Record one completed tool call, including all of its retries.
+
+        Args:
+            server_name: Server that executed the call
+            tool_identifier: Tool identifier in format "serverName__toolName"
+            seconds: Wall-clock latency of the call
+            request_bytes: Size of the request parameters
+            response_bytes: Size of the response (0 on failure)
+            error: Exception the call failed with, if any
+        """
+        server = self._server(server_name)
+        tool = self._tool(tool_identifier)
+
+        for metrics in (server, tool):
+            metrics.latency.observe(seconds)
+            metrics.calls += 1
+            metrics.request_bytes += request_bytes
+            metrics.response_bytes += response_bytes
+        tool.max_response_bytes = max(tool.max_response_bytes, response_bytes)
+
+        if error is not None:
+            server.errors += 1
+            tool.errors += 1
+            tool.error_types[type(error).__name__] += 1
+
+    def record_retry(self, server_name: str, tool_identifier: str) -> None:
+        """Record that a call is being retried."""
+        self._server(server_name).retries += 1
+        self._tool(tool_identifier).retries += 1
+
+    def record_circuit_state(self, server_name: str, state: str) -> None:
+        """Record a circuit breaker transition ("closed", "open" or "half_open")."""
+        server = self._server(server_name)
+        server.circuit_state = state
+        if state == "open":
+            server.circuit_opens += 1
+
+    def record_circuit_rejection(self, server_name: str) -> None:
+        """Record a call failed fast by an open circuit."""
+        self._server(server_name).circuit_rejections += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return all metrics as JSON-serializable data.
+
+        Returns:
+            Dict with "started_at"/"generated_at" Unix timestamps, "servers"
+            and "tools" mappings of per-name aggregates
+        """
+        return {
+            "started_at": self._started_at,
+            "generated_at": time.time(),
+            "servers": {name: m.to_dict() for name, m in sorted(self._servers.items())},
+            "tools": {name: m.to_dict() for name, m in sorted(self._tools.items())},
+        }
+
+    def is_empty(self) -> bool:
+        """Return True if nothing has been recorded."""
+        return not self._servers and not self._tools
+
+    def reset(self) -> None:
+        """Discard all recorded metrics."""
+        self._servers.clear()
+        self._tools.clear()
+        self._started_at = time.time()
+
+    def dump(self, path: Path | None = None) -> Path:
+        """Write the snapshot as JSON, atomically.
+
+        Args:
+            path: Destination file (default: default_metrics_path())
+
+        Returns:
+            The path written
+        """
+        path = path or default_metrics_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self.snapshot(), indent=2))
+        os.replace(tmp_path, path)
+        return path
@@ -0,0 +1,189 @@
+"""Opt-in memoization of idempotent MCP tool results.
+
+Many tools are pure reads called repeatedly with identical parameters within
+a session (git status, doc reads, fetches). ResultCache stores their results
+keyed by tool identifier plus the canonical JSON of the parameters, with a
+TTL per tool and an LRU bound on both entry count and approximate size.
+
+Only tools tool_safety.is_read_only() accepts (readOnlyHint, or a SAFE
+classification backed by a safe name pattern) are cached, so tools with side
+effects are always executed.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import time
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from .tool_safety import is_read_only
+
+if TYPE_CHECKING:
+    from mcp.types import Tool
+
+logger = logging.getLogger("mcp_execution.result_cache")
+
+DEFAULT_RESULT_TTL = 60.0  # seconds
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Environment variable enabling the cache for the singleton manager (TTL in seconds)
+RESULT_CACHE_TTL_ENV = "MCP_RESULT_CACHE_TTL"
+
+
+def make_cache_key(tool_identifier: str, params: dict[str, Any]) -> str:
+    """Build the cache key for a call: tool identifier plus canonical JSON params."""
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{tool_identifier}:{canonical}"
+
+
+class ResultCache:
+    """LRU + TTL cache of tool results for SAFE tools.
+
+    Results are deep-copied on the way in and out so callers may mutate what
+    they receive without corrupting the cache.
+
+    Attributes:
+        default_ttl: TTL in seconds for tools without an override
+        tool_ttls: Per-tool TTL overrides keyed by tool identifier (0 disables)
+        max_entries: Maximum number of cached results
+        max_bytes: Maximum approximate total size of cached results
+        hits: Cache hits per tool identifier
+        misses: Cache misses per tool identifier
+    """
+
+    def __init__(
+        self,
+        default_ttl: float = DEFAULT_RESULT_TTL,
+        tool_ttls: dict[str, float] | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        """Create an empty result cache."""
+        self.default_ttl = default_ttl
+        self.tool_ttls = dict(tool_ttls or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        # key -> (expires_at, size, value)
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._total_bytes = 0
+        self._cacheable: dict[str, bool] = {}
+
+    @classmethod
+    def from_env(cls) -> ResultCache | None:
+        """Build a cache if MCP_RESULT_CACHE_TTL is set to a positive number.
+
+        Returns:
+            A ResultCache with that default TTL, or None (caching disabled)
+        """
+        raw = os.environ.get(RESULT_CACHE_TTL_ENV)
+        if not raw:
+            return None
+        try:
+            ttl = float(raw)
+        except ValueError:
+            logger.warning(f"Ignoring invalid {RESULT_CACHE_TTL_ENV}={raw!r}")
+            return None
+        return cls(default_ttl=ttl) if ttl > 0 else None
+
+    def ttl_for(self, tool_identifier: str) -> float:
+        """Return the TTL applying to a tool."""
+        return self.tool_ttls.get(tool_identifier, self.default_ttl)
+
+    def is_cacheable(self, tool_identifier: str, tool: Tool) -> bool:
+        """Return True if results of this tool may be memoized.
+
+        A tool is cacheable when is_read_only() accepts it and its TTL is
+        positive. The classification is computed once per tool identifier.
+        """
+        cacheable = self._cacheable.get(tool_identifier)
+        if cacheable is None:
+            cacheable = is_read_only(
+                tool.name,
+                getattr(tool, "description", None),
+                getattr(tool, "annotations", None),
+            )
+            self._cacheable[tool_identifier] = cacheable
+            logger.debug(f"Result caching for '{tool_identifier}': {cacheable}")
+        return cacheable and self.ttl_for(tool_identifier) > 0
+
+    def get(self, tool_identifier: str, params: dict[str, Any]) -> tuple[bool, Any]:
+        """Look up a cached result.
+
+        Returns:
+            Tuple of (hit, value); value is None on a miss
+        """
+        key = make_cache_key(tool_identifier, params)
+        entry = self._entries.get(key)
+
+        if entry is not None and entry[0] <= time.monotonic():
+            self._evict(key)
+            entry = None
+
+        if entry is None:
+            self.misses[tool_identifier] += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits[tool_identifier] += 1
+        return True, copy.deepcopy(entry[2])
+
+    def put(self, tool_identifier: str, params: dict[str, Any], value: Any) -> None:
+        """Store a result, evicting least recently used entries as needed."""
+        key = make_cache_key(tool_identifier, params)
+        try:
+            size = len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            size = len(repr(value))
+
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {size}-byte result of '{tool_identifier}'")
+            return
+
+        if key in self._entries:
+            self._evict(key)
+
+        expires_at = time.monotonic() + self.ttl_for(tool_identifier)
+        self._entries[key] = (expires_at, size, copy.deepcopy(value))
+        self._total_bytes += size
+
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key: str) -> None:
+        """Remove one entry and account for its size."""
+        _expires_at, size, _value = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def clear(self) -> None:
+        """Drop all cached results (counters are kept)."""
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache statistics.
+
+        Returns:
+            Dict with total hits/misses, hit rate, entry count, approximate
+            bytes and per-tool hit/miss counters
+        """
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "per_tool": {
+                tool: {"hits": self.hits[tool], "misses": self.misses[tool]}
+                for tool in sorted(set(self.hits) | set(self.misses))
+            },
+        }
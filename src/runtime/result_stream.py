@@ -0,0 +1,234 @@
+"""Incremental access to large MCP tool results.
+
+Tools such as fetch or firecrawl can return multi-megabyte text content.
+Parsing all of it with json.loads (and keeping the parsed copy alongside the
+raw string) multiplies peak memory. This module provides:
+
+- unwrap_content(): per-item unwrapping with an optional size guard that
+  spills oversized text to a temporary file and returns a SpilledText handle
+- iter_json_array(): incremental parsing of a top-level JSON array from a
+  string or a stream of chunks, yielding one element at a time
+"""
+
+import json
+import logging
+import mmap
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+logger = logging.getLogger("mcp_execution.result_stream")
+
+# Text items larger than this (in characters) are spilled to disk when streaming
+DEFAULT_SPILL_THRESHOLD = 1024 * 1024
+
+# Environment variable enabling the size guard for call_tool (threshold in characters)
+SPILL_THRESHOLD_ENV = "MCP_RESULT_SPILL_THRESHOLD"
+
+# Read size used when parsing spilled files incrementally
+_READ_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+class SpilledText:
+    """Handle to tool result text that was written to a temporary file.
+
+    The file is UTF-8 encoded and is removed by unlink() (the manager unlinks
+    files it spilled during cleanup()).
+
+    Attributes:
+        path: Location of the temporary file
+        length: Length of the text in characters
+    """
+
+    def __init__(self, path: Path, length: int) -> None:
+        """Wrap an existing spill file."""
+        self.path = path
+        self.length = length
+
+    def __repr__(self) -> str:
+        return f"SpilledText(path={str(self.path)!r}, length={self.length})"
+
+    def open(self) -> IO[str]:
+        """Open the spilled text for reading."""
+        return self.path.open(encoding="utf-8")
+
+    def read_text(self) -> str:
+        """Load the full text into memory."""
+        return self.path.read_text(encoding="utf-8")
+
+    def mmap(self) -> mmap.mmap:
+        """Memory-map the raw UTF-8 bytes read-only (caller closes the map)."""
+        with self.path.open("rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def iter_json(self, chunk_size: int = _READ_CHUNK_SIZE) -> Iterator[Any]:
+        """Parse the text incrementally (see iter_json_array)."""
+        with self.open() as f:
+            yield from iter_json_array(iter(lambda: f.read(chunk_size), ""))
+
+    def unlink(self) -> None:
+        """Delete the temporary file (idempotent)."""
+        self.path.unlink(missing_ok=True)
+
+
+def spill_text(text: str, directory: Path | None = None) -> SpilledText:
+    """Write text to a new temporary file.
+
+    Args:
+        text: Text to write
+        directory: Directory for the file (default: the system temp directory)
+
+    Returns:
+        Handle to the written file
+    """
+    fd, name = tempfile.mkstemp(prefix="mcp-result-", suffix=".txt", dir=directory)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    logger.debug(f"Spilled {len(text)}-character tool result to {name}")
+    return SpilledText(Path(name), len(text))
+
+
+def spill_threshold_from_env() -> int | None:
+    """Read the call_tool size guard from MCP_RESULT_SPILL_THRESHOLD.
+
+    Returns:
+        Threshold in characters, or None when unset, invalid or not positive
+    """
+    raw = os.environ.get(SPILL_THRESHOLD_ENV)
+    if not raw:
+        return None
+    try:
+        threshold = int(raw)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {SPILL_THRESHOLD_ENV}={raw!r}")
+        return None
+    return threshold if threshold > 0 else None
+
+
+def unwrap_content(item: Any, spill_threshold: int | None = None) -> Any:
+    """Unwrap one content item of a tool result.
+
+    Text that looks like JSON is parsed; other text is returned as is. Text
+    longer than spill_threshold is neither parsed nor returned inline but
+    spilled to a temporary file. Non-text items (images, resources) are
+    returned unchanged.
+
+    Args:
+        item: Content item (e.g. TextContent)
+        spill_threshold: Maximum inline text length in characters (None: no limit)
+
+    Returns:
+        Parsed JSON, text, a SpilledText handle, or the item itself
+    """
+    text = getattr(item, "text", None)
+    if not isinstance(text, str):
+        return item
+
+    if spill_threshold is not None and len(text) > spill_threshold:
+        return spill_text(text)
+
+    if text.strip().startswith(("{", "[")):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return text
+    return text
+
+
+def iter_json_array(source: str | Iterable[str]) -> Iterator[Any]:
+    """Parse a JSON document incrementally, yielding top-level array elements.
+
+    Elements are decoded one at a time, so callers can process (and drop)
+    each element before the next is parsed instead of materializing the whole
+    list. A document that is not an array is yielded as a single value.
+
+    Args:
+        source: Complete JSON text, or an iterable of text chunks
+
+    Yields:
+        Each element of the top-level array
+
+    Raises:
+        json.JSONDecodeError: If the document is malformed
+    """
+    chunks = iter((source,) if isinstance(source, str) else source)
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    exhausted = False
+
+    def read_more() -> bool:
+        # Grow the unconsumed data at least twofold so that re-decoding a
+        # large element after a short read stays amortized linear.
+        nonlocal buffer, exhausted
+        before = len(buffer)
+        target = before + max(before - pos, 1)
+        parts = [buffer]
+        size = before
+        while size < target:
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+                break
+            parts.append(chunk)
+            size += len(chunk)
+        buffer = "".join(parts)
+        return len(buffer) > before
+
+    def skip_whitespace() -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or exhausted or not read_more():
+                return
+
+    skip_whitespace()
+    if pos >= len(buffer):
+        raise json.JSONDecodeError("Expecting value", buffer, pos)
+
+    if buffer[pos] != "[":
+        yield json.loads(buffer[pos:] + "".join(chunks))
+        return
+    pos += 1
+
+    first = True
+    while True:
+        # Drop the consumed prefix once it dominates the buffer
+        if pos > len(buffer) // 2:
+            buffer = buffer[pos:]
+            pos = 0
+
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise json.JSONDecodeError("Unterminated array", buffer, pos)
+        if buffer[pos] == "]":
+            return
+        if not first:
+            if buffer[pos] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            skip_whitespace()
+        first = False
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if exhausted or not read_more():
+                    raise
+                continue
+            # A value not yet followed by a delimiter (e.g. "-500" of
+            # "-500.25") may continue in the next chunk
+            complete = end < len(buffer) and buffer[end] in _DELIMITERS
+            if not complete and not exhausted and read_more():
+                continue
+            break
+
+        pos = end
+        yield value
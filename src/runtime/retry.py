@@ -0,0 +1,48 @@
+"""Classification of tool call failures for retry decisions.
+
+Only transient failures are worth retrying: lost or broken transports,
+timeouts and network errors. Errors reported by the server itself (invalid
+parameters, unknown methods, tool errors) fail the same way every time.
+
+The SDK, anyio and httpx are imported inside the functions, i.e. only once
+a call has failed, so importing this module stays cheap.
+"""
+
+# JSON-RPC error code for a timed-out request (httpx.codes.REQUEST_TIMEOUT)
+_REQUEST_TIMEOUT = 408
+
+
+def is_connection_lost(error: BaseException) -> bool:
+    """Return True if the error means the server's transport is closed.
+
+    The session cannot recover from this; it must be reconnected.
+    """
+    import anyio
+    from mcp.shared.exceptions import McpError
+    from mcp.types import CONNECTION_CLOSED
+
+    if isinstance(error, McpError):
+        return error.error.code == CONNECTION_CLOSED
+    return isinstance(
+        error,
+        (
+            anyio.ClosedResourceError,
+            anyio.BrokenResourceError,
+            anyio.EndOfStream,
+            BrokenPipeError,
+            ConnectionResetError,
+        ),
+    )
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Return True if retrying the failed call may succeed."""
+    import httpx
+    from mcp.shared.exceptions import McpError
+    from mcp.types import CONNECTION_CLOSED
+
+    if is_connection_lost(error):
+        return True
+    if isinstance(error, McpError):
+        return error.error.code in (CONNECTION_CLOSED, _REQUEST_TIMEOUT)
+    return isinstance(error, (TimeoutError, ConnectionError, httpx.TransportError))
@@ -2,15 +2,481 @@
 JSON Schema to Pydantic model conversion utilities.
 
 Converts MCP tool schemas (JSON Schema format) to Pydantic model definitions.
+
+SchemaCompiler walks the whole schema graph: objects with properties become
+nested models, ``$ref``s into ``$defs``/``definitions`` are resolved once
+per reference, ``anyOf``/``oneOf`` become unions and ``allOf`` members are
+merged. Identical object subschemas share one model, so a generated module
+defines each model once.
 """
 
+import json
+import keyword
+import re
 from typing import Any
 
+# JSON Schema primitive types and their Python equivalents
+TYPE_MAPPING = {
+    "string": "str",
+    "number": "float",
+    "integer": "int",
+    "boolean": "bool",
+    "null": "None",
+}
+
+# Names generated modules import; models must not shadow them
+RESERVED_NAMES = {"Any", "BaseModel", "Dict", "Field", "List", "Literal", "Optional", "Union"}
+
+# Keys that make a schema describe a type rather than only add constraints
+_TYPE_KEYS = {"type", "$ref", "properties", "items", "enum", "const", "anyOf", "oneOf", "allOf"}
+
+# Keys ignored when merging a parent schema into its anyOf/oneOf members
+_ANNOTATION_KEYS = {"anyOf", "oneOf", "description", "title", "default", "examples"}
+
+
+def _pascal_case(name: str) -> str:
+    """Convert a property or definition name to a class name ("my-field" -> "MyField")."""
+    parts = re.split(r"[^0-9a-zA-Z]+", name)
+    result = "".join(part[:1].upper() + part[1:] for part in parts)
+    if not result or result[0].isdigit():
+        result = f"Model{result}"
+    return result
+
+
+def _field_name(name: str, taken: set[str]) -> str:
+    """Return a valid Pydantic field name for a property (aliased if it differs)."""
+    if name.isidentifier() and not keyword.iskeyword(name) and not name.startswith("_"):
+        field = name
+    else:
+        field = re.sub(r"\W", "_", name).lstrip("_") or "field"
+        if field[0].isdigit():
+            field = f"field_{field}"
+        if keyword.iskeyword(field):
+            field += "_"
+    base, n = field, 2
+    while field in taken:
+        field, n = f"{base}_{n}", n + 1
+    return field
+
+
+def _docstring(text: str) -> str:
+    """Escape text for use inside a triple-quoted docstring."""
+    text = text.replace("\\", "\\\\").replace('"""', '\\"\\"\\"')
+    return text[:-1] + '\\"' if text.endswith('"') else text
+
+
+def _literal(value: Any) -> str | None:
+    """Render an enum/const value as a Literal argument (None if unsupported)."""
+    if isinstance(value, str):
+        return json.dumps(value)
+    if value is None or isinstance(value, bool | int | float):
+        return repr(value)
+    return None
+
+
+def _optional(type_hint: str, required: bool) -> str:
+    if required or type_hint.startswith("Optional["):
+        return type_hint
+    return f"Optional[{type_hint}]"
+
+
+class SchemaCompiler:
+    """Compiles JSON Schemas into Pydantic model source code.
+
+    Use one compiler per generated module: models compiled through it are
+    de-duplicated and each is rendered once, after the models it uses.
+    Recursive references become a string forward reference when a model
+    refers to itself, and Dict[str, Any] when they go through other models.
+
+    Example:
+        compiler = SchemaCompiler()
+        compiler.add_model("SearchParams", tool.inputSchema, "Parameters for search")
+        code = compiler.render()
+
+    Attributes:
+        nested_models: Generate models for objects with properties; if
+            False they are typed Dict[str, Any]
+    """
+
+    def __init__(self, nested_models: bool = True, reserved: set[str] | None = None) -> None:
+        """Create a compiler.
+
+        Args:
+            nested_models: Generate models for nested objects
+            reserved: Class names nested models must not take (e.g. the
+                root model names of other tools in the same module)
+        """
+        self.nested_models = nested_models
+        self._reserved = RESERVED_NAMES | (reserved or set())
+        self._models: dict[str, str] = {}  # name -> code, dependencies first
+        self._dependencies: dict[str, list[str]] = {}
+        self._by_signature: dict[str, str] = {}  # canonical subschema -> model name
+        self._root: dict[str, Any] = {}
+        self._root_key = ""
+        self._ref_types: dict[str, tuple[str, bool, str | None]] = {}
+        self._resolving: dict[str, str | None] = {}  # $ref being compiled -> model name
+        self._building: list[str] = []
+        self._used: list[set[str]] = []
+
+    @property
+    def model_names(self) -> list[str]:
+        """Names of all compiled models, dependencies first."""
+        return list(self._models)
+
+    def code(self, model_name: str) -> str:
+        """Return the class definition of a compiled model."""
+        return self._models[model_name]
+
+    def dependencies(self, model_name: str, transitive: bool = False) -> list[str]:
+        """Return the models a model's fields use (in render order).
+
+        Args:
+            model_name: A compiled model
+            transitive: Include the dependencies of dependencies
+
+        Returns:
+            Model names, excluding model_name itself
+        """
+        direct = self._dependencies[model_name]
+        if not transitive:
+            return list(direct)
+        needed: set[str] = set()
+        pending = list(direct)
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self._dependencies[name])
+        needed.discard(model_name)
+        return [name for name in self._models if name in needed]
+
+    def render(self, model_names: list[str] | None = None) -> str:
+        """Return class definitions, each model after the models it uses.
+
+        Args:
+            model_names: Render only these models and their dependencies
+                (default: all compiled models)
+
+        Returns:
+            Python code for the models
+        """
+        if model_names is None:
+            selected = list(self._models)
+        else:
+            wanted = set(model_names)
+            for name in model_names:
+                wanted.update(self.dependencies(name, transitive=True))
+            selected = [name for name in self._models if name in wanted]
+        return "\n\n\n".join(self._models[name] for name in selected)
+
+    def add_model(
+        self, model_name: str, schema: dict[str, Any], description: str | None = None
+    ) -> str:
+        """Compile a root model, such as a tool's parameters.
+
+        $refs in schema and its subschemas are resolved against schema.
+
+        Args:
+            model_name: Class name of the model
+            schema: JSON Schema of an object
+            description: Model docstring
+
+        Returns:
+            model_name
+        """
+        self._set_root(schema)
+        self._reserved.add(model_name)
+        self._compile_model(model_name, schema, description, root=True)
+        return model_name
+
+    def type_for(
+        self,
+        schema: Any,
+        required: bool = True,
+        name_hint: str = "Model",
+        root: dict[str, Any] | None = None,
+    ) -> str:
+        """Return the Python type hint for a schema, compiling models it needs.
+
+        Args:
+            schema: JSON Schema definition
+            required: Whether the value is required
+            name_hint: Class name for a model generated for the schema
+            root: Schema $refs are resolved against (default: that of the
+                last add_model call)
+
+        Returns:
+            Python type hint string
+        """
+        if root is not None:
+            self._set_root(root)
+        base, nullable = self._base_type(schema, name_hint)
+        return _optional(base, required and not nullable)
+
+    def _set_root(self, schema: dict[str, Any]) -> None:
+        self._root = schema
+        definitions = {key: schema.get(key) for key in ("$defs", "definitions")}
+        self._root_key = json.dumps(definitions, sort_keys=True, default=str)
+        self._ref_types = {}
+
+    def _use(self, model_name: str) -> str:
+        """Record that the model being compiled uses model_name."""
+        if self._used:
+            self._used[-1].add(model_name)
+        return model_name
+
+    def _signature(self, schema: dict[str, Any]) -> str:
+        text = json.dumps(schema, sort_keys=True, default=str)
+        # $refs mean different things under different roots
+        return f"{text}|{self._root_key}" if '"$ref"' in text else text
+
+    def _unique_name(self, base: str) -> str:
+        name, n = base, 2
+        while name in self._reserved:
+            name, n = f"{base}{n}", n + 1
+        self._reserved.add(name)
+        return name
+
+    def _base_type(self, schema: Any, hint: str) -> tuple[str, bool]:
+        """Return (type hint, nullable) for a schema."""
+        if not isinstance(schema, dict):
+            return "Any", False  # boolean schemas
+        if "$ref" in schema:
+            return self._ref_type(schema["$ref"], hint)
+        for key in ("anyOf", "oneOf"):
+            if isinstance(schema.get(key), list):
+                return self._union_type(schema, schema[key], hint)
+        if isinstance(schema.get("allOf"), list):
+            return self._base_type(self._merge_all_of(schema, set()), hint)
+        if "const" in schema:
+            value = _literal(schema["const"])
+            return (f"Literal[{value}]", False) if value is not None else ("Any", False)
+        if "enum" in schema and isinstance(schema["enum"], list):
+            return self._enum_type(schema["enum"])
+
+        schema_type = schema.get("type", "object" if "properties" in schema else None)
+        if isinstance(schema_type, list):
+            types = [t for t in schema_type if t != "null"]
+            members = [self._base_type({**schema, "type": t}, hint)[0] for t in types]
+            nullable = len(types) < len(schema_type)
+            if not members:
+                return "None", False
+            if len(members) == 1:
+                return members[0], nullable
+            return f"Union[{', '.join(dict.fromkeys(members))}]", nullable
+
+        if schema_type in TYPE_MAPPING:
+            return TYPE_MAPPING[schema_type], False
+        if schema_type == "array":
+            items = schema.get("items")
+            item_type = self.type_for(items, True, f"{hint}Item") if items is not None else "Any"
+            return f"List[{item_type}]", False
+        if schema_type == "object":
+            return self._object_type(schema, hint), False
+        return "Any", False
+
+    def _enum_type(self, values: list[Any]) -> tuple[str, bool]:
+        literals = [_literal(v) for v in values if v is not None]
+        if not literals or None in literals:
+            return "Any", False
+        return f"Literal[{', '.join(literals)}]", None in values
+
+    def _object_type(self, schema: dict[str, Any], hint: str) -> str:
+        if schema.get("properties") and self.nested_models:
+            signature = self._signature(schema)
+            existing = self._by_signature.get(signature)
+            if existing is not None:
+                return self._use(existing)
+            name = self._unique_name(hint)
+            self._by_signature[signature] = name
+            self._compile_model(name, schema, schema.get("description"), root=False)
+            return self._use(name)
+        additional = schema.get("additionalProperties")
+        if isinstance(additional, dict):
+            return f"Dict[str, {self.type_for(additional, True, f'{hint}Value')}]"
+        return "Dict[str, Any]"
+
+    def _union_type(
+        self, schema: dict[str, Any], members: list[Any], hint: str
+    ) -> tuple[str, bool]:
+        # Members that only add constraints (e.g. alternative "required" sets)
+        if not any(isinstance(m, dict) and _TYPE_KEYS & m.keys() for m in members):
+            base = {k: v for k, v in schema.items() if k not in ("anyOf", "oneOf")}
+            return self._base_type(base, hint)
+
+        shared = {k: v for k, v in schema.items() if k not in _ANNOTATION_KEYS}
+        types: list[str] = []
+        nullable = False
+        for i, member in enumerate(members, start=1):
+            if isinstance(member, dict):
+                if member.get("type") == "null":
+                    nullable = True
+                    continue
+                if shared and "$ref" not in member:
+                    member = {**shared, **member}
+            member_type, member_nullable = self._base_type(
+                member, hint if len(members) == 1 else f"{hint}{i}"
+            )
+            nullable = nullable or member_nullable
+            if member_type not in types:
+                types.append(member_type)
+        if not types:
+            return "None", False
+        if "Any" in types:
+            return "Any", nullable
+        if len(types) == 1:
+            return types[0], nullable
+        return f"Union[{', '.join(types)}]", nullable
+
+    def _merge_all_of(self, schema: dict[str, Any], seen: set[str]) -> dict[str, Any]:
+        """Merge allOf members (resolving $refs) into one schema."""
+        merged = {k: v for k, v in schema.items() if k != "allOf"}
+        for member in schema["allOf"]:
+            if isinstance(member, dict) and "$ref" in member:
+                ref = member["$ref"]
+                if ref in seen:
+                    continue
+                seen = seen | {ref}
+                member = self._resolve(ref) or {}
+            if not isinstance(member, dict):
+                continue
+            if isinstance(member.get("allOf"), list):
+                member = self._merge_all_of(member, seen)
+            for key, value in member.items():
+                if key == "properties" and isinstance(value, dict):
+                    merged["properties"] = {**merged.get("properties", {}), **value}
+                elif key == "required" and isinstance(value, list):
+                    required = merged.get("required", [])
+                    merged["required"] = required + [r for r in value if r not in required]
+                else:
+                    merged.setdefault(key, value)
+        return merged
+
+    def _resolve(self, ref: str) -> Any:
+        """Resolve a local JSON pointer ("#/$defs/Name") against the root schema."""
+        if not ref.startswith("#"):
+            return None
+        target: Any = self._root
+        for token in ref[1:].lstrip("/").split("/"):
+            if not token:
+                continue
+            token = token.replace("~1", "/").replace("~0", "~")
+            if not isinstance(target, dict) or token not in target:
+                return None
+            target = target[token]
+        return target
+
+    def _ref_type(self, ref: str, hint: str) -> tuple[str, bool]:
+        memo = self._ref_types.get(ref)
+        if memo is not None:
+            type_hint, nullable, model = memo
+            if model is not None:
+                self._use(model)
+            return type_hint, nullable
+
+        if ref in self._resolving:
+            model = self._resolving[ref]
+            if model is not None and self._building and self._building[-1] == model:
+                return f'"{model}"', False
+            return ("Dict[str, Any]" if model is not None else "Any"), False
+
+        target = self._resolve(ref)
+        if not isinstance(target, dict):
+            return "Any", False
+        name = _pascal_case(ref.rsplit("/", 1)[-1])
+
+        model = None
+        if (
+            self.nested_models
+            and target.get("properties")
+            and target.get("type", "object") == "object"
+            and not (_TYPE_KEYS - {"type", "properties"}) & target.keys()
+        ):
+            signature = self._signature(target)
+            model = self._by_signature.get(signature)
+            if model is None:
+                model = self._unique_name(name)
+                self._by_signature[signature] = model
+                self._resolving[ref] = model
+                try:
+                    self._compile_model(model, target, target.get("description"), root=False)
+                finally:
+                    del self._resolving[ref]
+            result = (self._use(model), False)
+        else:
+            self._resolving[ref] = None
+            try:
+                result = self._base_type(target, name)
+            finally:
+                del self._resolving[ref]
+        self._ref_types[ref] = (*result, model)
+        return result
+
+    def _compile_model(
+        self, name: str, schema: dict[str, Any], description: str | None, root: bool
+    ) -> None:
+        properties = schema.get("properties", {})
+        required_fields = set(schema.get("required", []))
+
+        self._building.append(name)
+        self._used.append(set())
+        fields: list[str] = []
+        aliased = False
+        taken: set[str] = set()
+        try:
+            for prop, prop_schema in properties.items():
+                is_required = prop in required_fields
+                field_type = self.type_for(prop_schema, is_required, f"{name}{_pascal_case(prop)}")
+                field_name = _field_name(prop, taken)
+                taken.add(field_name)
+
+                if field_name != prop:
+                    aliased = True
+                    default = "..." if is_required else "None"
+                    field = f"Field({default}, alias={json.dumps(prop)})"
+                    fields.append(f"    {field_name}: {field_type} = {field}")
+                elif is_required:
+                    fields.append(f"    {field_name}: {field_type}")
+                else:
+                    fields.append(f"    {field_name}: {field_type} = None")
+
+                field_desc = isinstance(prop_schema, dict) and prop_schema.get("description")
+                if field_desc:
+                    fields.append(f'    """{_docstring(field_desc)}"""')
+        finally:
+            self._building.pop()
+            used = self._used.pop()
+
+        lines = [f"class {name}(BaseModel):"]
+        lines.append(f'    """{_docstring(description or "Generated Pydantic model.")}"""')
+
+        config = {}
+        if aliased:
+            config["populate_by_name"] = True
+        if not root:
+            # Nested objects accept extra keys unless the schema forbids them,
+            # as they did when typed Dict[str, Any]
+            config["extra"] = "forbid" if schema.get("additionalProperties") is False else "allow"
+        if config:
+            items = ", ".join(
+                f"{json.dumps(k)}: {v if isinstance(v, bool) else json.dumps(v)}"
+                for k, v in config.items()
+            )
+            lines.append(f"    model_config = {{{items}}}")
+
+        lines.extend(fields or ["    pass"])
+        used.discard(name)
+        self._models[name] = "\n".join(lines)
+        self._dependencies[name] = [m for m in self._models if m in used]
+
 
 def json_schema_to_python_type(schema: dict[str, Any], required: bool = True) -> str:
     """
     Convert JSON Schema type to Python type hint string.
 
+    Nested objects are typed Dict[str, Any]; use SchemaCompiler to generate
+    models for them.
+
     Args:
         schema: JSON Schema definition
         required: Whether field is required
@@ -26,77 +492,30 @@ def json_schema_to_python_type(schema: dict[str, Any], required: bool = True) ->
         >>> json_schema_to_python_type({"type": "array", "items": {"type": "string"}})
         'List[str]'
     """
-    # Handle union types: ["string", "null"]
-    if isinstance(schema.get("type"), list):
-        types = schema["type"]
-        if "null" in types:
-            required = False
-            types = [t for t in types if t != "null"]
-            if len(types) == 1:
-                schema = {"type": types[0]}
-
-    # Handle enum
-    if "enum" in schema:
-        enum_values = schema["enum"]
-        # Use Literal type
-        literal_values = ", ".join([f'"{v}"' for v in enum_values])
-        base_type = f"Literal[{literal_values}]"
-        return f"Optional[{base_type}]" if not required else base_type
-
-    # Get base type
-    schema_type = schema.get("type", "object")
-
-    type_mapping = {
-        "string": "str",
-        "number": "float",
-        "integer": "int",
-        "boolean": "bool",
-        "null": "None",
-    }
-
-    if schema_type in type_mapping:
-        base_type = type_mapping[schema_type]
-        return f"Optional[{base_type}]" if not required else base_type
-
-    elif schema_type == "array":
-        items_schema = schema.get("items", {"type": "object"})
-        item_type = json_schema_to_python_type(items_schema, required=True)
-        base_type = f"List[{item_type}]"
-        return f"Optional[{base_type}]" if not required else base_type
-
-    elif schema_type == "object":
-        # Check for additionalProperties (Dict type)
-        if "additionalProperties" in schema:
-            value_schema = schema["additionalProperties"]
-            if isinstance(value_schema, bool):
-                value_type = "Any"
-            else:
-                value_type = json_schema_to_python_type(value_schema, required=True)
-            base_type = f"Dict[str, {value_type}]"
-            return f"Optional[{base_type}]" if not required else base_type
-
-        # Otherwise, nested Pydantic model (will be generated separately)
-        return "Dict[str, Any]" if required else "Optional[Dict[str, Any]]"
-
-    # Fallback
-    return "Any" if required else "Optional[Any]"
+    return SchemaCompiler(nested_models=False).type_for(schema, required, root=schema)
 
 
 def generate_pydantic_model(
     model_name: str,
     schema: dict[str, Any],
     description: str | None = None,
+    compiler: SchemaCompiler | None = None,
 ) -> str:
     """
     Generate Pydantic model class from JSON Schema.
 
+    Nested objects, $refs and combinators are compiled into models defined
+    before the class that uses them.
+
     Args:
         model_name: Name of the Pydantic model class
         schema: JSON Schema definition
         description: Optional model description
+        compiler: Compiler shared by the models of one module (default: a
+            new one)
 
     Returns:
-        Python code for Pydantic model
+        Python code for the Pydantic model and the nested models it uses
 
     Example:
         >>> schema = {
@@ -113,35 +532,9 @@ def generate_pydantic_model(
             name: str
             age: Optional[int] = None
     """
-    properties = schema.get("properties", {})
-    required_fields = set(schema.get("required", []))
-
-    lines = [f"class {model_name}(BaseModel):"]
-
-    # Add docstring
-    if description:
-        lines.append(f'    """{description}"""')
-    else:
-        lines.append('    """Generated Pydantic model."""')
-
-    # Generate fields
-    if not properties:
-        lines.append("    pass")
-    else:
-        for field_name, field_schema in properties.items():
-            is_required = field_name in required_fields
-            field_type = json_schema_to_python_type(field_schema, is_required)
-            field_desc = field_schema.get("description", "")
-
-            if is_required:
-                lines.append(f"    {field_name}: {field_type}")
-            else:
-                lines.append(f"    {field_name}: {field_type} = None")
-
-            if field_desc:
-                lines.append(f'    """{field_desc}"""')
-
-    return "\n".join(lines)
+    compiler = compiler or SchemaCompiler()
+    compiler.add_model(model_name, schema, description)
+    return compiler.render([model_name])
 
 
 def sanitize_name(name: str) -> str:
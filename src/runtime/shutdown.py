@@ -0,0 +1,177 @@
+"""Time-bounded shutdown of MCP server processes.
+
+Closing a stdio session in the SDK closes the server's stdin and then waits
+up to several seconds before terminating the process tree, and a server
+that hangs while the session shuts down can stall exit indefinitely. The
+manager closes all servers concurrently and, when a server exceeds its grace
+period, close_with_escalation() escalates: SIGTERM to the server's process
+group, then SIGKILL.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import time
+from collections.abc import Coroutine
+from typing import Any
+
+logger = logging.getLogger("mcp_execution.shutdown")
+
+# Seconds a server may take to close its session and transport on its own
+DEFAULT_SHUTDOWN_GRACE = 2.0
+
+# Seconds to wait after SIGTERM (and again after SIGKILL) before giving up
+DEFAULT_KILL_TIMEOUT = 1.0
+
+# Environment variable overriding the grace period of the singleton manager
+SHUTDOWN_GRACE_ENV = "MCP_SHUTDOWN_GRACE"
+
+SIGKILL = getattr(signal, "SIGKILL", signal.SIGTERM)
+
+
+def shutdown_grace_from_env() -> float:
+    """Read the shutdown grace period from MCP_SHUTDOWN_GRACE.
+
+    Returns:
+        Grace period in seconds (DEFAULT_SHUTDOWN_GRACE when unset or invalid)
+    """
+    raw = os.environ.get(SHUTDOWN_GRACE_ENV)
+    if not raw:
+        return DEFAULT_SHUTDOWN_GRACE
+    try:
+        grace = float(raw)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {SHUTDOWN_GRACE_ENV}={raw!r}")
+        return DEFAULT_SHUTDOWN_GRACE
+    return max(grace, 0.0)
+
+
+def stdio_process_pid(stdio_ctx: Any) -> int | None:
+    """Return the PID of the server process behind an entered stdio_client.
+
+    The SDK does not expose the process it spawns; while the context is
+    entered, stdio_client is suspended at its yield with the process in a
+    local variable. Anything unexpected (other transports, mocks, a changed
+    SDK) yields None, and shutdown then relies on the SDK alone.
+
+    Args:
+        stdio_ctx: Context manager returned by stdio_client(), after __aenter__
+
+    Returns:
+        The process ID, or None if it cannot be determined
+    """
+    frame = getattr(getattr(stdio_ctx, "gen", None), "ag_frame", None)
+    f_locals = getattr(frame, "f_locals", None)
+    if not isinstance(f_locals, dict):
+        return None
+    pid = getattr(f_locals.get("process"), "pid", None)
+    return pid if isinstance(pid, int) else None
+
+
+def signal_process_group(pid: int, sig: int) -> bool:
+    """Send a signal to a server process and its children.
+
+    The SDK starts stdio servers in their own session, so the whole process
+    group is signalled. If the process shares our group (or the platform has
+    no process groups) only the process itself is signalled.
+
+    Args:
+        pid: Server process ID
+        sig: Signal to send
+
+    Returns:
+        True if the signal was delivered, False if the process is gone
+    """
+    try:
+        if hasattr(os, "killpg"):
+            pgid = os.getpgid(pid)
+            if pgid != os.getpgrp():
+                os.killpg(pgid, sig)
+                return True
+        os.kill(pid, sig)
+        return True
+    except ProcessLookupError:
+        return False
+    except OSError as e:
+        logger.debug(f"Could not send signal {sig} to process {pid}: {e}")
+        return False
+
+
+async def exit_context(server_name: str, ctx: Any, kind: str) -> None:
+    """Exit a session or transport context, tolerating cross-task cancel scopes.
+
+    Args:
+        server_name: Server owning the context (for logging)
+        ctx: Async context manager previously entered via __aenter__
+        kind: Context kind used in log messages ("session" or "stdio")
+    """
+    try:
+        await ctx.__aexit__(None, None, None)
+        logger.debug(f"Closed {kind} context for server: {server_name}")
+    except (RuntimeError, asyncio.CancelledError) as e:
+        # Ignore cancel scope errors that can occur when contexts are entered
+        # and exited in different event loop tasks (e.g., when scripts call asyncio.run())
+        if "cancel scope" in str(e).lower() or isinstance(e, asyncio.CancelledError):
+            logger.debug(f"Ignoring cancel scope error during cleanup for '{server_name}': {e}")
+        else:
+            logger.error(f"Error closing {kind} context for '{server_name}': {e}")
+    except Exception as e:
+        logger.error(f"Error closing {kind} context for '{server_name}': {e}")
+
+
+async def close_with_escalation(
+    label: str,
+    close: Coroutine[Any, Any, None],
+    pid: int | None,
+    grace_period: float,
+    kill_timeout: float = DEFAULT_KILL_TIMEOUT,
+) -> str:
+    """Run a server's close coroutine, escalating if it exceeds its grace period.
+
+    The close runs in the calling task, since the transport's cancel scopes
+    must be exited by the task that entered them. A watchdog task sends
+    SIGTERM to the process group of pid once grace_period has passed and
+    SIGKILL kill_timeout seconds later; a close still running kill_timeout
+    seconds after that is cancelled. Without a pid (SSE/HTTP transports) the
+    close is cancelled right after the grace period.
+
+    Args:
+        label: Server name used in log messages
+        close: Coroutine exiting the server's session and transport
+        pid: Server process ID, if known
+        grace_period: Seconds the server may take to close on its own
+        kill_timeout: Seconds to wait after each signal
+
+    Returns:
+        "closed", "terminated", "killed" or "abandoned"
+    """
+    start = time.perf_counter()
+    outcome = "closed"
+
+    async def escalate(pid: int) -> None:
+        nonlocal outcome
+        await asyncio.sleep(grace_period)
+        for sig, signalled in ((signal.SIGTERM, "terminated"), (SIGKILL, "killed")):
+            logger.warning(
+                f"Server '{label}' did not shut down within "
+                f"{time.perf_counter() - start:.2f}s, sending {signal.Signals(sig).name}"
+            )
+            if not signal_process_group(pid, sig):
+                return
+            outcome = signalled
+            await asyncio.sleep(kill_timeout)
+
+    watchdog = asyncio.create_task(escalate(pid)) if pid is not None else None
+    deadline = grace_period + (2 * kill_timeout if pid is not None else 0)
+    try:
+        async with asyncio.timeout(deadline) as scope:
+            await close
+    except TimeoutError:
+        pass
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+    if scope.expired():
+        outcome = "abandoned"
+    return outcome
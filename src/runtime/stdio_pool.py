@@ -0,0 +1,197 @@
+"""Process-wide pool of stdio MCP server sessions.
+
+Every McpClientManager (the singleton, managers built by discover_schemas or
+tests, the daemon's) and the wrapper generator used to spawn its own copy of
+each stdio server. The pool keeps one live server per distinct launch
+configuration and hands out its initialized ClientSession by reference:
+ClientSession multiplexes concurrent requests by request ID, so any number
+of holders can share it. The server is closed when its last holder
+releases it.
+
+Entries are keyed by a fingerprint of the resolved command, args and env,
+and by event loop: sessions are bound to the loop their transport runs on,
+so callers on different loops get separate servers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import weakref
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from .config import ServerConfig
+from .shutdown import DEFAULT_SHUTDOWN_GRACE, close_with_escalation, exit_context
+
+if TYPE_CHECKING:
+    from mcp import ClientSession
+
+logger = logging.getLogger("mcp_execution.stdio_pool")
+
+
+def stdio_fingerprint(config: ServerConfig) -> str:
+    """Compute the pool key of a resolved stdio server configuration.
+
+    Args:
+        config: Server configuration with ${VAR} placeholders already expanded
+
+    Returns:
+        Hex SHA-256 digest of the command, args and env
+    """
+    launch = {"command": config.command, "args": config.args, "env": config.env}
+    canonical = json.dumps(launch, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PooledServer:
+    """A live stdio server and its initialized session.
+
+    Attributes:
+        label: Name of the server that spawned it (for logging)
+        fingerprint: Pool key of its launch configuration
+        client: The initialized ClientSession shared by all holders
+        pid: Server process ID, if known
+        refcount: Number of holders
+        broken: True once a holder found the transport closed
+    """
+
+    def __init__(
+        self,
+        label: str,
+        host: Any,
+        client: ClientSession,
+        pid: int | None = None,
+    ) -> None:
+        """Wrap a server whose transport and session are held open by host.
+
+        Args:
+            label: Name of the server that spawned it
+            host: ContextHost (or any entered context) owning the transport
+                and session; exiting it stops the process
+            client: The initialized session
+            pid: Server process ID, if known
+        """
+        self.label = label
+        self.fingerprint = ""
+        self.client = client
+        self.pid = pid
+        self.refcount = 0
+        self.broken = False
+        self._host = host
+
+    async def aclose(self) -> None:
+        """Exit the session and transport (which stops the process)."""
+        await exit_context(self.label, self._host, "stdio")
+
+
+# Opens a new server for a resolved config: (server name, config) -> PooledServer
+ServerOpener = Callable[[str, ServerConfig], Awaitable[PooledServer]]
+
+
+class StdioServerPool:
+    """Reference-counted stdio servers shared within one process.
+
+    Example:
+        pool = get_stdio_pool()
+        server = await pool.acquire("fs", config, open_stdio_server)
+        try:
+            tools = await server.client.list_tools()
+        finally:
+            await pool.release(server)
+    """
+
+    def __init__(self) -> None:
+        """Create an empty pool."""
+        self._servers: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, PooledServer]
+        ] = weakref.WeakKeyDictionary()
+        self._locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Lock]
+        ] = weakref.WeakKeyDictionary()
+
+    def _loop_servers(self) -> dict[str, PooledServer]:
+        """Return the servers of the running event loop."""
+        return self._servers.setdefault(asyncio.get_running_loop(), {})
+
+    async def acquire(
+        self, server_name: str, config: ServerConfig, opener: ServerOpener
+    ) -> PooledServer:
+        """Return a live server for config, spawning it if none is pooled.
+
+        Args:
+            server_name: Name of the requesting server (used if one is spawned)
+            config: Resolved stdio server configuration
+            opener: Coroutine function spawning and initializing a server
+
+        Returns:
+            The pooled server; pass it to release() when done
+
+        Raises:
+            Exception: Whatever opener raises when spawning fails
+        """
+        fingerprint = stdio_fingerprint(config)
+        locks = self._locks.setdefault(asyncio.get_running_loop(), {})
+        lock = locks.setdefault(fingerprint, asyncio.Lock())
+
+        async with lock:
+            servers = self._loop_servers()
+            server = servers.get(fingerprint)
+            if server is None or server.broken:
+                server = await opener(server_name, config)
+                server.fingerprint = fingerprint
+                servers[fingerprint] = server
+            else:
+                logger.debug(
+                    f"Reusing pooled server '{server.label}' for '{server_name}' "
+                    f"({server.refcount} other holder(s))"
+                )
+            server.refcount += 1
+            return server
+
+    def discard(self, server: PooledServer) -> None:
+        """Stop handing out a server whose transport was found closed.
+
+        Current holders keep their reference until they release it; the next
+        acquire() spawns a fresh server.
+        """
+        server.broken = True
+        self._forget(server)
+
+    def _forget(self, server: PooledServer) -> None:
+        """Remove a server from the index if it is the indexed one."""
+        servers = self._loop_servers()
+        if servers.get(server.fingerprint) is server:
+            del servers[server.fingerprint]
+
+    async def release(
+        self, server: PooledServer, grace_period: float = DEFAULT_SHUTDOWN_GRACE
+    ) -> str:
+        """Drop one reference, closing the server when it was the last.
+
+        Args:
+            server: Server returned by acquire()
+            grace_period: Seconds the server may take to close before it is
+                terminated (see close_with_escalation)
+
+        Returns:
+            "released" if other holders remain, otherwise the close outcome
+        """
+        server.refcount -= 1
+        if server.refcount > 0:
+            return "released"
+        self._forget(server)
+        return await close_with_escalation(server.label, server.aclose(), server.pid, grace_period)
+
+    def active_servers(self) -> list[PooledServer]:
+        """Return the pooled servers of the running event loop."""
+        return list(self._loop_servers().values())
+
+
+@lru_cache(maxsize=1)
+def get_stdio_pool() -> StdioServerPool:
+    """Return the process-wide stdio server pool."""
+    return StdioServerPool()
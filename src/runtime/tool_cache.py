@@ -0,0 +1,188 @@
+"""Persistent on-disk cache of MCP tool schemas.
+
+Listing tools requires a live server connection and a list_tools round trip.
+This module stores each server's Tool list under .claude/cache/ so later
+processes can resolve and validate tools without contacting the server.
+
+Entries are keyed by a fingerprint of the server's ServerConfig: any change
+to the configuration (command, args, env, url, ...) invalidates the entry.
+Entries also expire after a configurable TTL.
+
+aiofiles and the MCP SDK types are imported on first load/store so that
+importing the runtime does not pay for them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .config import ServerConfig
+
+if TYPE_CHECKING:
+    from mcp.types import Tool
+
+logger = logging.getLogger("mcp_execution.tool_cache")
+
+# Bump when the on-disk entry layout changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_TOOL_CACHE_TTL = 24 * 60 * 60.0  # seconds
+
+# Environment variable overriding the TTL (seconds); "0" disables the cache
+TOOL_CACHE_TTL_ENV = "MCP_TOOL_CACHE_TTL"
+
+
+def default_cache_dir() -> Path:
+    """Return the default tool cache directory (.claude/cache/mcp-tools in cwd)."""
+    return Path.cwd() / ".claude" / "cache" / "mcp-tools"
+
+
+def config_fingerprint(config: ServerConfig) -> str:
+    """Compute a stable hash of a server configuration.
+
+    Args:
+        config: Server configuration to fingerprint
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON form of the config
+    """
+    canonical = json.dumps(config.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ToolSchemaCache:
+    """On-disk Tool list cache, one JSON file per server.
+
+    Attributes:
+        cache_dir: Directory holding the cache entries
+        ttl: Entry lifetime in seconds (None means entries never expire)
+    """
+
+    def __init__(
+        self, cache_dir: Path | None = None, ttl: float | None = DEFAULT_TOOL_CACHE_TTL
+    ) -> None:
+        """Create a cache rooted at cache_dir (default: .claude/cache/mcp-tools)."""
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.ttl = ttl
+
+    @classmethod
+    def from_env(cls) -> ToolSchemaCache | None:
+        """Build a cache honouring MCP_TOOL_CACHE_TTL.
+
+        Returns:
+            A ToolSchemaCache, or None if the cache is disabled ("0")
+        """
+        raw = os.environ.get(TOOL_CACHE_TTL_ENV)
+        if raw is None:
+            return cls()
+        try:
+            ttl = float(raw)
+        except ValueError:
+            logger.warning(f"Ignoring invalid {TOOL_CACHE_TTL_ENV}={raw!r}")
+            return cls()
+        if ttl <= 0:
+            return None
+        return cls(ttl=ttl)
+
+    def _entry_path(self, server_name: str) -> Path:
+        """Return the cache file path for a server."""
+        return self.cache_dir / f"{server_name}.json"
+
+    async def load(self, server_name: str, config: ServerConfig) -> list[Tool] | None:
+        """Load cached tools for a server if the entry is fresh and matches config.
+
+        Stale, mismatched or unreadable entries are treated as misses.
+
+        Args:
+            server_name: Name of the server
+            config: Current server configuration
+
+        Returns:
+            Cached tools, or None on a miss
+        """
+        path = self._entry_path(server_name)
+        if not path.exists():
+            return None
+
+        import aiofiles
+        from mcp.types import Tool
+
+        try:
+            async with aiofiles.open(path) as f:
+                entry = json.loads(await f.read())
+
+            if entry.get("version") != CACHE_FORMAT_VERSION:
+                return None
+            if entry.get("fingerprint") != config_fingerprint(config):
+                logger.debug(f"Tool cache for '{server_name}' invalidated by config change")
+                return None
+            if self.ttl is not None and time.time() - entry.get("created_at", 0) > self.ttl:
+                logger.debug(f"Tool cache for '{server_name}' expired")
+                return None
+
+            tools = [Tool.model_validate(tool) for tool in entry["tools"]]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable tool cache entry {path}: {e}")
+            return None
+
+        logger.debug(f"Loaded {len(tools)} cached tools for server: {server_name}")
+        return tools
+
+    async def store(self, server_name: str, config: ServerConfig, tools: list[Tool]) -> None:
+        """Persist tools for a server.
+
+        The entry is written to a temporary file and atomically renamed so
+        concurrent readers never observe a partial file. Failures are logged
+        and otherwise ignored: the cache is an optimization only.
+
+        Args:
+            server_name: Name of the server
+            config: Server configuration the tools were listed with
+            tools: Tools returned by the server
+        """
+        import aiofiles
+
+        path = self._entry_path(server_name)
+        try:
+            entry = {
+                "version": CACHE_FORMAT_VERSION,
+                "fingerprint": config_fingerprint(config),
+                "created_at": time.time(),
+                "tools": [
+                    tool.model_dump(mode="json", by_alias=True, exclude_none=True)
+                    for tool in tools
+                ],
+            }
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            async with aiofiles.open(tmp_path, "w") as f:
+                await f.write(json.dumps(entry))
+            os.replace(tmp_path, path)
+            logger.debug(f"Stored {len(tools)} tools in cache for server: {server_name}")
+        except Exception as e:
+            logger.warning(f"Failed to write tool cache for '{server_name}': {e}")
+
+    def invalidate(self, server_name: str | None = None) -> None:
+        """Remove cached entries.
+
+        Args:
+            server_name: Server to invalidate, or None to clear every entry
+        """
+        if server_name:
+            paths = [self._entry_path(server_name)]
+        elif self.cache_dir.exists():
+            paths = list(self.cache_dir.glob("*.json"))
+        else:
+            paths = []
+
+        for path in paths:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Failed to remove tool cache entry {path}: {e}")
@@ -0,0 +1,144 @@
+"""Safety classification of MCP tools.
+
+Tools are classified as SAFE (read-only), DANGEROUS (side effects) or UNKNOWN
+from their names and descriptions. Used to pick tools for schema discovery
+and to decide which tool results may be memoized.
+"""
+
+import re
+from enum import Enum
+from typing import Any
+
+
+class ToolSafety(str, Enum):
+    """Safety classification for tools."""
+
+    SAFE = "safe"
+    DANGEROUS = "dangerous"
+    UNKNOWN = "unknown"
+
+
+# Regex patterns for tool classification
+SAFE_PATTERNS = [
+    r"^get_",
+    r"^list_",
+    r"^search_",
+    r"^describe_",
+    r"^fetch",
+    r"^read_",
+    r"^show_",
+    r"^view_",
+    r"^find_",
+    r"^query_",
+    r"^git_(?:status|log|diff|show)",
+]
+
+DANGEROUS_PATTERNS = [
+    r"^delete_",
+    r"^remove_",
+    r"^drop_",
+    r"^destroy_",
+    r"^kill_",
+    r"^create_.*table",
+    r"^update_",
+    r"^write_",
+    r"^execute_",
+    r"^run_",
+    r"^modify_",
+    r"^set_",
+    r"^put_",
+    r"^post_",
+]
+
+SAFE_KEYWORDS = [
+    "get",
+    "list",
+    "read",
+    "fetch",
+    "search",
+    "query",
+    "show",
+    "view",
+    "find",
+    "describe",
+]
+
+DANGEROUS_KEYWORDS = [
+    "delete",
+    "remove",
+    "drop",
+    "destroy",
+    "kill",
+    "update",
+    "write",
+    "execute",
+    "modify",
+    "truncate",
+]
+
+# Safe keywords match as words: "get" must not match "target", nor "read"
+# "thread". Dangerous keywords match anywhere ("overwrites", "undeleted"), so
+# a doubtful description errs on the dangerous side.
+_SAFE_KEYWORD_RE = re.compile(rf"\b(?:{'|'.join(SAFE_KEYWORDS)})(?:s|es)?\b")
+_DANGEROUS_KEYWORD_RE = re.compile("|".join(DANGEROUS_KEYWORDS))
+
+
+def classify_tool(tool_name: str, description: str | None = None) -> ToolSafety:
+    """
+    Classify a tool as SAFE, DANGEROUS, or UNKNOWN based on patterns and description.
+
+    Classification strategy:
+    1. Check description for dangerous keywords (overrides all else)
+    2. Check against explicit regex patterns
+    3. Fall back to description keywords
+    4. Default to UNKNOWN if no signals
+
+    Args:
+        tool_name: Name of the tool
+        description: Optional tool description
+
+    Returns:
+        ToolSafety classification
+    """
+    # First priority: dangerous keywords in description override everything
+    if description and _DANGEROUS_KEYWORD_RE.search(description.lower()):
+        return ToolSafety.DANGEROUS
+
+    # Check dangerous patterns (high priority)
+    if any(re.match(pattern, tool_name, re.IGNORECASE) for pattern in DANGEROUS_PATTERNS):
+        return ToolSafety.DANGEROUS
+
+    # Check safe patterns
+    if any(re.match(pattern, tool_name, re.IGNORECASE) for pattern in SAFE_PATTERNS):
+        return ToolSafety.SAFE
+
+    # Fall back to description safe keywords
+    if description and _SAFE_KEYWORD_RE.search(description.lower()):
+        return ToolSafety.SAFE
+
+    return ToolSafety.UNKNOWN
+
+
+def is_read_only(tool_name: str, description: str | None = None, annotations: Any = None) -> bool:
+    """
+    Decide whether a tool is read-only with enough confidence to skip calls to it.
+
+    Stricter than classify_tool(): a tool counts as read-only if the server
+    sets annotations.readOnlyHint, or if it is classified SAFE and its name
+    matches a safe pattern. Safe keywords in the description alone are not
+    enough, so result caching never skips a call with side effects.
+
+    Args:
+        tool_name: Name of the tool
+        description: Optional tool description
+        annotations: Optional MCP ToolAnnotations of the tool
+
+    Returns:
+        True if the tool is read-only
+    """
+    read_only_hint = getattr(annotations, "readOnlyHint", None)
+    if read_only_hint is not None:
+        return bool(read_only_hint)
+    if classify_tool(tool_name, description) != ToolSafety.SAFE:
+        return False
+    return any(re.match(pattern, tool_name, re.IGNORECASE) for pattern in SAFE_PATTERNS)
@@ -0,0 +1,144 @@
+"""Per-server usage frequency across runs, for predicted warmup.
+
+Servers configured with ``"warmup": "predicted"`` are connected in the
+background at initialize() when they were used often enough in recent runs.
+Usage is tracked as an exponentially decayed score per server, stored in
+.claude/cache/mcp-usage.json: after each run,
+
+    score = decay * score + (1 - decay) * (1 if the server was called else 0)
+
+so the score approximates the fraction of recent runs that called the
+server, with older runs counting less.
+
+The file is rewritten atomically; concurrent runs may lose each other's
+update, which only delays a prediction by a run.
+"""
+
+import json
+import logging
+import os
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+logger = logging.getLogger("mcp_execution.usage_stats")
+
+# Bump when the on-disk layout changes
+USAGE_STATS_FORMAT_VERSION = 1
+
+# Weight of past runs in the score (closer to 1 = longer memory)
+DEFAULT_DECAY = 0.8
+
+# Minimum score for a server to be predicted (two consecutive runs reach 0.36)
+DEFAULT_PREDICT_THRESHOLD = 0.3
+
+# Environment variable disabling usage tracking ("0")
+USAGE_STATS_ENV = "MCP_USAGE_STATS"
+
+
+def default_usage_stats_path() -> Path:
+    """Return the default stats file (.claude/cache/mcp-usage.json in cwd)."""
+    return Path.cwd() / ".claude" / "cache" / "mcp-usage.json"
+
+
+class UsageStats:
+    """Decayed per-server usage scores persisted across runs.
+
+    Attributes:
+        path: JSON file holding the scores
+        decay: Weight of past runs in the score
+        threshold: Minimum score for predicted() to select a server
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        decay: float = DEFAULT_DECAY,
+        threshold: float = DEFAULT_PREDICT_THRESHOLD,
+    ) -> None:
+        """Create stats backed by path (default: .claude/cache/mcp-usage.json)."""
+        self.path = path or default_usage_stats_path()
+        self.decay = decay
+        self.threshold = threshold
+
+    @classmethod
+    def from_env(cls) -> "UsageStats | None":
+        """Build stats honouring MCP_USAGE_STATS.
+
+        Returns:
+            A UsageStats, or None if tracking is disabled ("0")
+        """
+        if os.environ.get(USAGE_STATS_ENV) == "0":
+            return None
+        return cls()
+
+    def load(self) -> dict[str, float]:
+        """Return the current score per server.
+
+        Missing, outdated or unreadable files yield no scores.
+        """
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable usage stats {self.path}: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != USAGE_STATS_FORMAT_VERSION:
+            return {}
+        scores = data.get("servers", {})
+        return {
+            str(name): float(score)
+            for name, score in scores.items()
+            if isinstance(score, (int, float))
+        }
+
+    def predicted(self, server_names: Iterable[str]) -> list[str]:
+        """Select the servers worth warming up.
+
+        Args:
+            server_names: Candidate servers (those configured as predicted)
+
+        Returns:
+            Candidates whose score reaches the threshold, most used first
+        """
+        scores = self.load()
+        selected = [name for name in server_names if scores.get(name, 0.0) >= self.threshold]
+        return sorted(selected, key=lambda name: -scores[name])
+
+    def record_run(self, used: Iterable[str], known: Iterable[str]) -> None:
+        """Fold one run into the scores and persist them.
+
+        Failures are logged and otherwise ignored: the stats only steer
+        warmup.
+
+        Args:
+            used: Servers that executed at least one tool call in the run
+            known: Servers currently configured (others are dropped)
+        """
+        used_set = set(used)
+        scores = self.load()
+        updated = {}
+        for name in known:
+            score = self.decay * scores.get(name, 0.0)
+            if name in used_set:
+                score += 1 - self.decay
+            if score >= 0.001:
+                updated[name] = round(score, 6)
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f"{self.path.suffix}.{os.getpid()}.tmp")
+            tmp_path.write_text(
+                json.dumps(
+                    {
+                        "version": USAGE_STATS_FORMAT_VERSION,
+                        "updated_at": time.time(),
+                        "servers": dict(sorted(updated.items())),
+                    },
+                    indent=2,
+                )
+            )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to write usage stats {self.path}: {e}")
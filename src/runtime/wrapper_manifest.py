@@ -0,0 +1,199 @@
+"""Per-server manifests of generated wrappers.
+
+Regenerating wrappers used to rewrite every file of every server, changing
+mtimes, invalidating __pycache__ and forcing re-imports even when no tool
+changed. Each generated server directory now holds a manifest
+(servers/<name>/.manifest.json) recording a hash of each tool's name,
+description and inputSchema. Comparing the tools a server lists against
+its manifest tells which wrappers are new, changed or removed, so only
+those files are written or deleted, and ``mcp-generate --check`` can report
+drift without writing anything.
+
+Manifests also record GENERATOR_VERSION, the generation target (one file
+per tool, or a single bundle module) and the server's normalization
+strategy; wrappers generated by another version, for another target or
+with another strategy are treated as changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("mcp_execution.wrapper_manifest")
+
+MANIFEST_FILE = ".manifest.json"
+
+# Bump when the generated code changes, so existing wrappers are rewritten
+GENERATOR_VERSION = 3
+
+# Generation targets: one module per tool, or one lazily loading module per server
+TARGETS = ("package", "bundle")
+DEFAULT_TARGET = "package"
+
+
+def tool_hash(tool: Any) -> str:
+    """Hash the parts of a tool definition that wrappers are generated from.
+
+    Args:
+        tool: Tool definition from MCP
+
+    Returns:
+        Hex SHA-256 digest of the tool's name, description and inputSchema
+    """
+    canonical = json.dumps(
+        {
+            "name": tool.name,
+            "description": getattr(tool, "description", None),
+            "inputSchema": getattr(tool, "inputSchema", None),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class WrapperManifest:
+    """Tool hashes of a server's generated wrappers.
+
+    Attributes:
+        version: GENERATOR_VERSION the wrappers were generated with
+        tools: Tool name -> tool_hash() of its definition
+        target: Generation target, one of TARGETS
+        normalization: Normalization strategy of the server
+    """
+
+    def __init__(
+        self,
+        tools: dict[str, str] | None = None,
+        version: int = GENERATOR_VERSION,
+        target: str = DEFAULT_TARGET,
+        normalization: str = "none",
+    ) -> None:
+        """Create a manifest (empty by default)."""
+        self.version = version
+        self.tools = tools or {}
+        self.target = target
+        self.normalization = normalization
+
+    @classmethod
+    def for_tools(
+        cls, tools: list[Any], target: str = DEFAULT_TARGET, normalization: str = "none"
+    ) -> WrapperManifest:
+        """Build the manifest describing wrappers generated from tools."""
+        hashes = {tool.name: tool_hash(tool) for tool in tools}
+        return cls(hashes, target=target, normalization=normalization)
+
+    @classmethod
+    def load(cls, server_dir: Path) -> WrapperManifest | None:
+        """Read a server directory's manifest.
+
+        Args:
+            server_dir: Directory of the server's generated wrappers
+
+        Returns:
+            The manifest, or None if there is none or it cannot be read
+        """
+        path = server_dir / MANIFEST_FILE
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return cls(
+                dict(data["tools"]),
+                int(data["version"]),
+                data.get("target", DEFAULT_TARGET),
+                data.get("normalization", "none"),
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable wrapper manifest {path}: {e}")
+            return None
+
+    def to_json(self) -> str:
+        """Serialize the manifest (stable key order, for version control)."""
+        data = {
+            "version": self.version,
+            "target": self.target,
+            "normalization": self.normalization,
+            "tools": self.tools,
+        }
+        return json.dumps(data, indent=2, sort_keys=True) + "\n"
+
+
+class ManifestDiff:
+    """Differences between a server's tools and its generated wrappers.
+
+    Attributes:
+        added: Tools without a wrapper
+        changed: Tools whose definition (or generator version, target or
+            normalization strategy) changed, or whose wrapper file is missing
+        removed: Wrapped tools the server no longer lists
+        unchanged: Tools whose wrapper is up to date
+        stale_files: Other generated files (__init__.py, README.md,
+            manifest) whose content is out of date
+    """
+
+    def __init__(self) -> None:
+        """Create an empty diff."""
+        self.added: list[str] = []
+        self.changed: list[str] = []
+        self.removed: list[str] = []
+        self.unchanged: list[str] = []
+        self.stale_files: list[str] = []
+
+    @property
+    def has_changes(self) -> bool:
+        """True if any generated file is missing, out of date or obsolete."""
+        return bool(self.added or self.changed or self.removed or self.stale_files)
+
+    def summary(self) -> str:
+        """Describe the changes, e.g. ``+1 added, ~2 changed, -1 removed``."""
+        parts = []
+        if self.added:
+            parts.append(f"+{len(self.added)} added")
+        if self.changed:
+            parts.append(f"~{len(self.changed)} changed")
+        if self.removed:
+            parts.append(f"-{len(self.removed)} removed")
+        if self.stale_files and not parts:
+            parts.append(f"stale {', '.join(self.stale_files)}")
+        return ", ".join(parts) or "up to date"
+
+
+def diff_tools(
+    manifest: WrapperManifest | None,
+    current: WrapperManifest,
+    wrapper_path: Callable[[str], Path],
+) -> ManifestDiff:
+    """Compare a server's current tools against its manifest.
+
+    Args:
+        manifest: Manifest of the generated wrappers (None if there is none,
+            e.g. wrappers generated before manifests existed)
+        current: Manifest built from the tools the server lists now
+        wrapper_path: Function mapping a tool name to its wrapper file
+
+    Returns:
+        The tools to add, change and remove (stale_files is left empty)
+    """
+    diff = ManifestDiff()
+    previous = manifest.tools if manifest is not None else {}
+    outdated = manifest is not None and (
+        manifest.version != current.version
+        or manifest.target != current.target
+        or manifest.normalization != current.normalization
+    )
+    for name, digest in current.tools.items():
+        if name not in previous:
+            diff.added.append(name)
+        elif outdated or previous[name] != digest or not wrapper_path(name).exists():
+            diff.changed.append(name)
+        else:
+            diff.unchanged.append(name)
+    diff.removed = [name for name in previous if name not in current.tools]
+    return diff
@@ -1,5 +1,7 @@
 """Integration tests for script harness."""
 
+import json
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -100,3 +102,173 @@ def test_harness_script_not_found():
     # Verify error
     assert result.returncode == 1
     assert "not found" in result.stderr.lower()
+
+
+def test_harness_batch_exit_codes(tmp_path: Path):
+    """Test batch mode runs every script and reports per-script exit codes."""
+    scripts = {
+        tmp_path / "batch_ok.py": 'print("batch ok")\n',
+        tmp_path / "batch_exit.py": "import sys\nsys.exit(3)\n",
+        tmp_path / "batch_error.py": 'raise Exception("batch error")\n',
+    }
+    for path, code in scripts.items():
+        path.write_text(code)
+
+    result = subprocess.run(
+        [PYTHON_EXECUTABLE, "-m", "runtime.harness", "--batch", *map(str, scripts)],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 1
+    assert "batch ok" in result.stdout
+    assert "batch error" in result.stderr
+    assert "1 succeeded, 2 failed" in result.stderr
+    assert "exit 3" in result.stderr
+
+
+def test_harness_batch_manifest_from_stdin(tmp_path: Path):
+    """Test batch mode reads script paths from stdin and captures concurrent output."""
+    for name in ("a", "b"):
+        (tmp_path / f"manifest_{name}.py").write_text(f'print("manifest {name}")\n')
+
+    result = subprocess.run(
+        [PYTHON_EXECUTABLE, "-m", "runtime.harness", "--batch", "--concurrency", "2"],
+        input=f"# scripts\n{tmp_path / 'manifest_a.py'}\n\n{tmp_path / 'manifest_b.py'}\n",
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0
+    assert "manifest a" in result.stdout
+    assert "manifest b" in result.stdout
+    assert "===== " in result.stdout
+    assert "2 succeeded, 0 failed" in result.stderr
+
+
+def test_harness_awaits_async_main(tmp_path: Path):
+    """Test harness awaits an async main() the script does not run itself."""
+    test_script = tmp_path / "async_main.py"
+    test_script.write_text(
+        """
+import asyncio
+
+async def main():
+    print(f"main ran on harness loop: {asyncio.get_running_loop() is LOOP}")
+
+LOOP = asyncio.get_event_loop()
+"""
+    )
+
+    result = subprocess.run(
+        [PYTHON_EXECUTABLE, "-m", "runtime.harness", str(test_script)],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0
+    assert "main ran on harness loop: True" in result.stdout
+
+
+def test_harness_async_main_shares_loop_across_asyncio_run(tmp_path: Path):
+    """Test asyncio.run() calls of an async-main script share one loop and run once."""
+    test_script = tmp_path / "async_main_guarded.py"
+    test_script.write_text(
+        """
+import asyncio
+
+loops = []
+
+async def main():
+    loops.append(asyncio.get_running_loop())
+
+if __name__ == "__main__":
+    asyncio.run(main())
+    asyncio.run(main())
+    print(f"runs: {len(loops)}, same loop: {loops[0] is loops[1]}")
+"""
+    )
+
+    result = subprocess.run(
+        [PYTHON_EXECUTABLE, "-m", "runtime.harness", str(test_script)],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0
+    assert "runs: 2, same loop: True" in result.stdout
+
+
+def test_harness_async_main_run_until_complete_runs_once(tmp_path: Path):
+    """Test main() driven by loop.run_until_complete() is not awaited again."""
+    test_script = tmp_path / "async_main_loop.py"
+    test_script.write_text(
+        """
+import asyncio
+
+async def main():
+    print("main ran")
+
+if __name__ == "__main__":
+    asyncio.get_event_loop().run_until_complete(main())
+"""
+    )
+
+    result = subprocess.run(
+        [PYTHON_EXECUTABLE, "-m", "runtime.harness", str(test_script)],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0
+    assert result.stdout.count("main ran") == 1
+
+
+def test_harness_legacy_script_calls_tool(tmp_path: Path):
+    """Test a legacy script calling a tool inside asyncio.run() exits cleanly.
+
+    The tool's server is connected on the script's own asyncio.run() loop,
+    which is closed before the harness cleans up on its persistent loop.
+    """
+    (tmp_path / "echo_server.py").write_text(
+        """
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP("echo")
+
+@server.tool()
+def echo(text: str) -> str:
+    return text
+
+server.run()
+"""
+    )
+    config = {"mcpServers": {"echo": {"command": PYTHON_EXECUTABLE, "args": ["echo_server.py"]}}}
+    (tmp_path / ".mcp.json").write_text(json.dumps(config))
+    test_script = tmp_path / "legacy_tool_call.py"
+    test_script.write_text(
+        """
+import asyncio
+from runtime.mcp_client import call_mcp_tool
+
+async def run():
+    print(f"echo: {await call_mcp_tool('echo__echo', {'text': 'hi'})}")
+
+asyncio.run(run())
+"""
+    )
+
+    src_path = str(Path(__file__).resolve().parents[2] / "src")
+    pythonpath = os.pathsep.join(filter(None, [src_path, os.environ.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [PYTHON_EXECUTABLE, "-m", "runtime.harness", str(test_script)],
+        capture_output=True,
+        text=True,
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": pythonpath, "MCP_DAEMON": "0"},
+        timeout=60,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "echo: hi" in result.stdout
+    assert "Cleanup failed" not in result.stderr
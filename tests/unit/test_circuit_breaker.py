@@ -0,0 +1,131 @@
+"""Unit tests for per-server circuit breakers."""
+
+import pytest
+
+from runtime.circuit_breaker import CircuitBreaker, CircuitState
+from runtime.config import CircuitBreakerPolicy
+from runtime.exceptions import CircuitOpenError, ServerConnectionError
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary time."""
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Create a fake clock."""
+    return FakeClock()
+
+
+def make_breaker(clock: FakeClock, **policy: object) -> CircuitBreaker:
+    """Build a breaker opening after 2 failures with a 10s reset timeout."""
+    settings = {"failureThreshold": 2, "resetTimeout": 10.0, **policy}
+    return CircuitBreaker("srv", CircuitBreakerPolicy(**settings), clock=clock)
+
+
+class TestCircuitBreaker:
+    """Test state transitions."""
+
+    def test_opens_after_consecutive_failures(self, clock: FakeClock) -> None:
+        """failureThreshold consecutive failures open the circuit."""
+        breaker = make_breaker(clock)
+        breaker.record_failure(TimeoutError("slow"))
+        breaker.record_success()
+        breaker.record_failure(TimeoutError("slow"))
+        assert breaker.state is CircuitState.CLOSED
+
+        breaker.record_failure(TimeoutError("slow"))
+        assert breaker.state is CircuitState.OPEN
+        with pytest.raises(CircuitOpenError, match="TimeoutError: slow"):
+            breaker.before_call()
+        assert breaker.rejected == 1
+
+    def test_open_error_is_a_connection_error(self) -> None:
+        """Existing ServerConnectionError handlers also catch open circuits."""
+        assert issubclass(CircuitOpenError, ServerConnectionError)
+
+    def test_half_open_admits_one_probe(self, clock: FakeClock) -> None:
+        """After resetTimeout one probe is let through; its success closes the circuit."""
+        breaker = make_breaker(clock)
+        breaker.record_failure()
+        breaker.record_failure()
+
+        clock.now += 10
+        assert breaker.state is CircuitState.HALF_OPEN
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError, match="probe"):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state is CircuitState.CLOSED
+        breaker.before_call()
+
+    def test_released_probe_admits_next_call(self, clock: FakeClock) -> None:
+        """A probe released without an outcome lets the next call become the probe."""
+        breaker = make_breaker(clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now += 10
+
+        assert breaker.before_call() is True
+        breaker.release_probe()
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert breaker.before_call() is True
+        with pytest.raises(CircuitOpenError, match="probe"):
+            breaker.before_call()
+
+    def test_failed_probe_reopens(self, clock: FakeClock) -> None:
+        """A failing probe reopens the circuit for another resetTimeout."""
+        breaker = make_breaker(clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now += 10
+        breaker.before_call()
+
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.retry_after() == 10
+        assert breaker.opened == 2
+
+    def test_abandoned_probe_is_replaced(self, clock: FakeClock) -> None:
+        """A probe whose outcome is never recorded does not block forever."""
+        breaker = make_breaker(clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now += 10
+        breaker.before_call()
+
+        clock.now += 10
+        breaker.before_call()
+
+    def test_disabled_breaker_never_rejects(self, clock: FakeClock) -> None:
+        """With enabled=false, calls pass even while failures accumulate."""
+        breaker = make_breaker(clock, enabled=False)
+        for _ in range(5):
+            breaker.record_failure()
+        breaker.before_call()
+        assert breaker.allows_calls()
+
+    def test_transitions_are_reported(self, clock: FakeClock) -> None:
+        """on_transition sees every state change."""
+        seen = []
+        breaker = CircuitBreaker(
+            "srv",
+            CircuitBreakerPolicy(failureThreshold=1, resetTimeout=5),
+            clock=clock,
+            on_transition=lambda name, state: seen.append((name, state.value)),
+        )
+        breaker.record_failure()
+        clock.now += 5
+        breaker.before_call()
+        breaker.record_success()
+        assert seen == [("srv", "open"), ("srv", "half_open"), ("srv", "closed")]
+        assert breaker.snapshot()["state"] == "closed"
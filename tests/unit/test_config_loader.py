@@ -0,0 +1,112 @@
+"""Unit tests for shared config loading and the config snapshot cache."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from runtime.config import McpConfig
+from runtime.config_loader import ConfigSnapshotCache, get_config_cache, load_mcp_config
+from runtime.exceptions import ConfigurationError
+
+
+def write_config(path: Path, servers: dict[str, Any]) -> None:
+    """Write a config file with the given servers."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"mcpServers": servers}))
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """An empty project directory as cwd, with an isolated home directory."""
+    home = tmp_path / "home"
+    project_dir = tmp_path / "project"
+    home.mkdir()
+    project_dir.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.chdir(project_dir)
+    return project_dir
+
+
+class TestLoadMcpConfig:
+    """Test config resolution and merging."""
+
+    async def test_project_overrides_global(self, project: Path) -> None:
+        """Project servers should replace global servers of the same name."""
+        write_config(
+            Path.home() / ".claude" / "mcp_config.json",
+            {"shared": {"command": "global-cmd"}, "only-global": {"command": "g"}},
+        )
+        write_config(project / "mcp_config.json", {"shared": {"command": "project-cmd"}})
+
+        config = await load_mcp_config()
+
+        assert sorted(config.mcpServers) == ["only-global", "shared"]
+        assert config.mcpServers["shared"].command == "project-cmd"
+
+    async def test_invalid_global_is_skipped(self, project: Path) -> None:
+        """A broken global config should not prevent loading the project config."""
+        global_file = Path.home() / ".claude" / "mcp_config.json"
+        global_file.parent.mkdir(parents=True)
+        global_file.write_text("{ not json")
+        write_config(project / ".mcp.json", {"srv": {"command": "node"}})
+
+        config = await load_mcp_config()
+        assert list(config.mcpServers) == ["srv"]
+
+    async def test_invalid_project_raises(self, project: Path) -> None:
+        """A broken project config is an error."""
+        (project / ".mcp.json").write_text("{ not json")
+        with pytest.raises(ConfigurationError, match="Invalid JSON"):
+            await load_mcp_config()
+
+    async def test_no_config_raises(self, project: Path) -> None:
+        """Missing configs should raise ConfigurationError."""
+        with pytest.raises(ConfigurationError, match="No config file found"):
+            await load_mcp_config()
+
+
+class TestConfigSnapshotCache:
+    """Test reuse and invalidation of config snapshots."""
+
+    async def test_snapshot_skips_validation(self, project: Path) -> None:
+        """A second load from the same cache should not re-validate."""
+        write_config(
+            project / "mcp_config.json",
+            {"srv": {"command": "node", "args": ["a.js"], "retry": {"maxDelay": 3}}},
+        )
+        cache = ConfigSnapshotCache()
+        first = await load_mcp_config(cache=cache)
+
+        with patch.object(
+            McpConfig, "model_validate_json", side_effect=AssertionError("validated")
+        ):
+            second = await load_mcp_config(cache=cache)
+
+        assert second is first
+        assert second.mcpServers["srv"].retry.maxDelay == 3
+
+    async def test_rebuilt_when_source_changes(self, project: Path) -> None:
+        """Editing a config or adding a preferred project file invalidates the snapshot."""
+        config_file = project / "mcp_config.json"
+        write_config(config_file, {"a": {"command": "node"}})
+        cache = ConfigSnapshotCache()
+        assert list((await load_mcp_config(cache=cache)).mcpServers) == ["a"]
+
+        write_config(config_file, {"a": {"command": "node"}, "b": {"command": "python"}})
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert sorted((await load_mcp_config(cache=cache)).mcpServers) == ["a", "b"]
+
+        write_config(project / ".mcp.json", {"c": {"command": "deno"}})
+        assert list((await load_mcp_config(cache=cache)).mcpServers) == ["c"]
+
+    async def test_nothing_written_to_disk(self, project: Path) -> None:
+        """Snapshots (which include env secrets) stay out of the project directory."""
+        write_config(project / "mcp_config.json", {"srv": {"command": "node"}})
+        await load_mcp_config(cache=get_config_cache())
+        assert get_config_cache() is get_config_cache()
+        assert not (project / ".claude").exists()
@@ -0,0 +1,76 @@
+"""Unit tests for ContextHost."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import anyio
+import pytest
+
+from runtime.context_host import ContextHost, enter_context
+
+
+@asynccontextmanager
+async def task_group_context(events: list[str]) -> AsyncIterator[str]:
+    """Context holding an anyio task group, like the SDK transports."""
+    async with anyio.create_task_group():
+        events.append("entered")
+        try:
+            yield "value"
+        finally:
+            events.append("exited")
+
+
+@asynccontextmanager
+async def recording_context(events: list[str]) -> AsyncIterator[str]:
+    """Context recording when it is entered and exited."""
+    events.append("entered")
+    try:
+        yield "value"
+    finally:
+        events.append("exited")
+
+
+class TestContextHost:
+    """Test entering and exiting contexts in a dedicated task."""
+
+    async def test_close_from_another_task(self) -> None:
+        """Closing from a gather() child must not cancel the opening task."""
+        events: list[str] = []
+        host = ContextHost("srv")
+
+        async def enter(stack: AsyncExitStack) -> str:
+            return await enter_context(stack, task_group_context(events))
+
+        assert await host.start(enter) == "value"
+        await asyncio.gather(host.aclose())
+        await asyncio.sleep(0)
+
+        assert events == ["entered", "exited"]
+
+    async def test_enter_failure_propagates(self) -> None:
+        """Errors from enter() reach start() after unwinding entered contexts."""
+        events: list[str] = []
+        host = ContextHost("srv")
+
+        async def enter(stack: AsyncExitStack) -> str:
+            await enter_context(stack, recording_context(events))
+            raise ConnectionError("handshake failed")
+
+        with pytest.raises(ConnectionError, match="handshake failed"):
+            await host.start(enter)
+        assert events == ["entered", "exited"]
+
+    async def test_abandoned_start_unwinds(self) -> None:
+        """A start() cancelled by a timeout exits what was already entered."""
+        events: list[str] = []
+        host = ContextHost("srv")
+
+        async def enter(stack: AsyncExitStack) -> str:
+            await enter_context(stack, task_group_context(events))
+            await asyncio.sleep(10)
+            return "never"
+
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(host.start(enter), 0.05)
+        assert events == ["entered", "exited"]
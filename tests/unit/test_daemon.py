@@ -0,0 +1,177 @@
+"""Unit tests for the MCP connection daemon."""
+
+import asyncio
+import json
+import os
+import shutil
+import stat
+import tempfile
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from runtime.daemon import McpDaemon, call_via_daemon, daemon_request, daemon_socket_path
+from runtime.exceptions import DaemonUnavailableError, ToolNotFoundError
+from runtime.mcp_client import call_mcp_tool
+
+
+@pytest.fixture
+def socket_path() -> Iterator[Path]:
+    """Short socket path (Unix socket paths are limited to ~108 bytes)."""
+    directory = tempfile.mkdtemp(prefix="mcpd-")
+    yield Path(directory) / "d.sock"
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def mock_manager() -> Mock:
+    """Manager double recording calls."""
+    manager = Mock()
+    manager.initialize = AsyncMock()
+    manager.cleanup = AsyncMock()
+    manager.disconnect_server = AsyncMock()
+    manager.call_tool = AsyncMock(return_value={"status": "clean"})
+    manager.connected_servers = []
+    return manager
+
+
+@pytest.fixture
+async def daemon(socket_path: Path, mock_manager: Mock) -> AsyncIterator[McpDaemon]:
+    """Running daemon backed by the mock manager."""
+    daemon = McpDaemon(socket_path, idle_timeout=60, manager=mock_manager)
+    await daemon.start()
+    yield daemon
+    await daemon.stop()
+
+
+class TestSocketPath:
+    """Test socket path resolution."""
+
+    def test_env_override(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        """MCP_DAEMON_SOCKET should override the computed path."""
+        monkeypatch.setenv("MCP_DAEMON_SOCKET", str(tmp_path / "x.sock"))
+        assert daemon_socket_path() == tmp_path / "x.sock"
+
+    def test_path_is_per_project(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        """Different project directories should get different sockets."""
+        monkeypatch.delenv("MCP_DAEMON_SOCKET", raising=False)
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        assert daemon_socket_path(tmp_path / "a") != daemon_socket_path(tmp_path / "b")
+
+    def test_default_path_in_per_user_directory(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Without an override the socket lives in a directory named for the user."""
+        monkeypatch.delenv("MCP_DAEMON_SOCKET", raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        assert daemon_socket_path().parent == tmp_path / f"mcp-daemon-{os.getuid()}"
+
+
+class TestDaemon:
+    """Test request handling."""
+
+    async def test_call_tool_round_trip(
+        self, daemon: McpDaemon, socket_path: Path, mock_manager: Mock
+    ) -> None:
+        """Tool calls should be forwarded to the manager."""
+        result = await daemon_request(
+            {"op": "call_tool", "tool": "git__git_status", "params": {"repo_path": "."}},
+            socket_path,
+        )
+        assert result == {"status": "clean"}
+        mock_manager.call_tool.assert_awaited_once_with(
+            "git__git_status", {"repo_path": "."}, max_retries=None
+        )
+
+    async def test_errors_reraised_by_type(
+        self, daemon: McpDaemon, socket_path: Path, mock_manager: Mock
+    ) -> None:
+        """Manager exceptions should be re-raised client-side with their type."""
+        mock_manager.call_tool.side_effect = ToolNotFoundError("no such tool")
+        with pytest.raises(ToolNotFoundError, match="no such tool"):
+            await daemon_request({"op": "call_tool", "tool": "git__nope"}, socket_path)
+
+    async def test_frame_sizes_reported(self, daemon: McpDaemon, socket_path: Path) -> None:
+        """daemon_request should report the request and response frame sizes."""
+        sizes: dict[str, int] = {}
+        await daemon_request({"op": "ping"}, socket_path, sizes=sizes)
+        assert sizes["request_bytes"] == len(json.dumps({"op": "ping"}).encode())
+        assert sizes["response_bytes"] > 0
+
+    async def test_ping(self, daemon: McpDaemon, socket_path: Path) -> None:
+        """Ping should report daemon status."""
+        status = await daemon_request({"op": "ping"}, socket_path)
+        assert status["connected"] == []
+        assert "pid" in status
+
+    async def test_shutdown(self, daemon: McpDaemon, socket_path: Path, mock_manager: Mock) -> None:
+        """Shutdown should stop the daemon and remove the socket."""
+        await daemon_request({"op": "shutdown"}, socket_path)
+        await asyncio.wait_for(daemon.serve_forever(), timeout=2)
+        mock_manager.cleanup.assert_awaited_once()
+        assert not socket_path.exists()
+
+    async def test_idle_servers_evicted(self, socket_path: Path, mock_manager: Mock) -> None:
+        """Servers idle past the timeout should be disconnected."""
+        daemon = McpDaemon(socket_path, idle_timeout=0.05, manager=mock_manager)
+        await daemon.start()
+        try:
+            await daemon_request({"op": "call_tool", "tool": "git__git_status"}, socket_path)
+            mock_manager.connected_servers = ["git"]
+            await asyncio.sleep(0.2)
+            mock_manager.disconnect_server.assert_awaited_with("git")
+        finally:
+            await daemon.stop()
+
+    async def test_warmed_servers_evicted(self, socket_path: Path, mock_manager: Mock) -> None:
+        """Servers connected by warmup but never called should be evicted too."""
+        daemon = McpDaemon(socket_path, idle_timeout=0.05, manager=mock_manager)
+        mock_manager.connected_servers = ["git"]
+        await daemon.start()
+        try:
+            await asyncio.sleep(0.2)
+            mock_manager.disconnect_server.assert_awaited_with("git")
+        finally:
+            await daemon.stop()
+
+
+class TestRouting:
+    """Test transparent routing in call_mcp_tool."""
+
+    async def test_unavailable_without_socket(self, socket_path: Path) -> None:
+        """A missing socket should raise DaemonUnavailableError."""
+        with pytest.raises(DaemonUnavailableError):
+            await daemon_request({"op": "ping"}, socket_path)
+
+    async def test_socket_private_to_user(self, daemon: McpDaemon, socket_path: Path) -> None:
+        """The socket is created 0600, and a socket others can reach is refused."""
+        assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+        socket_path.chmod(0o666)
+        with pytest.raises(DaemonUnavailableError, match="not private"):
+            await daemon_request({"op": "ping"}, socket_path)
+
+    async def test_routing_disabled(
+        self, monkeypatch: pytest.MonkeyPatch, daemon: McpDaemon, socket_path: Path
+    ) -> None:
+        """MCP_DAEMON=0 should bypass a running daemon."""
+        monkeypatch.setenv("MCP_DAEMON_SOCKET", str(socket_path))
+        monkeypatch.setenv("MCP_DAEMON", "0")
+        with pytest.raises(DaemonUnavailableError):
+            await call_via_daemon("git__git_status", {})
+
+    async def test_call_mcp_tool_uses_daemon(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        daemon: McpDaemon,
+        socket_path: Path,
+        mock_manager: Mock,
+    ) -> None:
+        """call_mcp_tool should route through a running daemon."""
+        monkeypatch.setenv("MCP_DAEMON_SOCKET", str(socket_path))
+        monkeypatch.delenv("MCP_DAEMON", raising=False)
+        result = await call_mcp_tool("git__git_status", {"repo_path": "."})
+        assert result == {"status": "clean"}
+        mock_manager.call_tool.assert_awaited_once()
@@ -66,6 +66,65 @@ class TestEnvExpansion:
         assert result == config
 
 
+class TestEnvTemplate:
+    """Test pre-parsed ${VAR} templates."""
+
+    def test_segments(self):
+        """Templates should be split into literals and variables once."""
+        from runtime.env_utils import EnvTemplate
+
+        template = EnvTemplate("Bearer ${TOKEN} for ${USER:-anon}!")
+        assert template.segments == ("Bearer ", ("TOKEN", None), " for ", ("USER", "anon"), "!")
+        assert template.variables == {"TOKEN", "USER"}
+        assert template.expand({"TOKEN": "t"}) == "Bearer t for anon!"
+        assert EnvTemplate("plain").expand({}) == "plain"
+
+
+class TestServerConfigResolver:
+    """Test env and header expansion of server configs."""
+
+    def test_expands_env_and_headers(self, monkeypatch):
+        """Both stdio env and HTTP headers should be expanded."""
+        from runtime.config import ServerConfig
+        from runtime.env_utils import ServerConfigResolver
+
+        monkeypatch.setenv("RESOLVER_TOKEN", "abc")
+        stdio = ServerConfig(command="node", env={"API_KEY": "${RESOLVER_TOKEN}"})
+        http = ServerConfig(
+            type="http",
+            url="https://example.com/mcp",
+            headers={"Authorization": "Bearer ${RESOLVER_TOKEN}"},
+        )
+
+        assert ServerConfigResolver(stdio).resolve().env == {"API_KEY": "abc"}
+        assert ServerConfigResolver(http).resolve().headers == {"Authorization": "Bearer abc"}
+        assert http.headers == {"Authorization": "Bearer ${RESOLVER_TOKEN}"}
+
+    def test_reexpands_only_when_environment_changes(self, monkeypatch):
+        """The expanded config is reused until a referenced variable changes."""
+        from runtime.config import ServerConfig
+        from runtime.env_utils import ServerConfigResolver
+
+        monkeypatch.setenv("RESOLVER_KEY", "one")
+        config = ServerConfig(command="node", env={"KEY": "${RESOLVER_KEY}"})
+        resolver = ServerConfigResolver(config)
+
+        first = resolver.resolve()
+        monkeypatch.setenv("UNRELATED_VAR", "x")
+        assert resolver.resolve() is first
+
+        monkeypatch.setenv("RESOLVER_KEY", "two")
+        assert resolver.resolve().env == {"KEY": "two"}
+
+    def test_config_without_placeholders_is_returned_as_is(self):
+        """Configs without placeholders need no copy."""
+        from runtime.config import ServerConfig
+        from runtime.env_utils import ServerConfigResolver
+
+        config = ServerConfig(command="node", env={"MODE": "prod"})
+        assert ServerConfigResolver(config).resolve() is config
+
+
 class TestDotenvLoading:
     """Test .env file loading."""
 
@@ -63,6 +63,19 @@ class TestToolClassification:
         assert classify_tool("process_data") == ToolSafety.UNKNOWN
         assert classify_tool("handle_request") == ToolSafety.UNKNOWN
 
+    def test_description_keywords_match_whole_words(self) -> None:
+        """Keywords inside other words ("target", "thread") are not signals."""
+        description = "Create a new issue in the target repository"
+        assert classify_tool("create_issue", description) == ToolSafety.UNKNOWN
+        assert classify_tool("send_message", "Post a reply to a Slack thread") == ToolSafety.UNKNOWN
+        assert classify_tool("tool_xyz", "Lists open pull requests") == ToolSafety.SAFE
+        assert classify_tool("tool_xyz", "Deletes the branch") == ToolSafety.DANGEROUS
+
+    def test_dangerous_keywords_match_inside_words(self) -> None:
+        """Dangerous keywords count even inside longer words ("overwrites")."""
+        description = "Fetches a URL and overwrites the local copy"
+        assert classify_tool("fetch_and_save", description) == ToolSafety.DANGEROUS
+
     def test_classify_dangerous_overrides_safe_keyword(self) -> None:
         """Dangerous keyword in description overrides safe pattern."""
         # Even though description has safe keyword, dangerous keyword wins
@@ -1,6 +1,24 @@
 """Unit tests for wrapper generation."""
 
+import asyncio
+import importlib
+import importlib.util
+import json
+import os
+import sys
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from pydantic import ValidationError
+
+from runtime.generate_wrappers import (
+    format_generation_summary,
+    generate_server_module,
+    generate_wrappers,
+)
+from runtime.normalize_fields import NORMALIZATION_CONFIG
 from runtime.schema_utils import (
+    SchemaCompiler,
     generate_pydantic_model,
     json_schema_to_python_type,
     sanitize_name,
@@ -65,8 +83,333 @@ def test_generate_pydantic_model_simple():
     assert "age: Optional[int] = None" in result
 
 
+def _exec_models(code):
+    """Execute generated model code and return its namespace."""
+    namespace = {}
+    header = "from typing import Any, Dict, List, Literal, Optional, Union\n"
+    header += "from pydantic import BaseModel, Field\n"
+    exec(header + code, namespace)
+    return namespace
+
+
+def test_nested_objects_become_models():
+    """Nested objects should be validated by generated models, shared when identical."""
+    point = {"type": "object", "properties": {"x": {"type": "number"}}, "required": ["x"]}
+    schema = {
+        "type": "object",
+        "properties": {
+            "start": point,
+            "end": dict(point),
+            "tags": {"type": "array", "items": point},
+        },
+        "required": ["start"],
+    }
+
+    code = generate_pydantic_model("Params", schema)
+
+    assert code.count("class ") == 2
+    assert "start: ParamsStart" in code
+    assert "end: Optional[ParamsStart] = None" in code
+    assert "tags: Optional[List[ParamsStart]] = None" in code
+    params = _exec_models(code)["Params"]
+    with pytest.raises(ValidationError):
+        params.model_validate({"start": {"x": "not a number"}})
+
+
+def test_refs_resolved_once_and_recursion():
+    """$defs should become one model each; self references use forward refs."""
+    schema = {
+        "type": "object",
+        "$defs": {
+            "Node": {
+                "type": "object",
+                "properties": {"children": {"type": "array", "items": {"$ref": "#/$defs/Node"}}},
+            },
+            "Color": {"enum": ["red", "green"]},
+        },
+        "properties": {
+            "a": {"$ref": "#/$defs/Node"},
+            "b": {"$ref": "#/$defs/Node"},
+            "color": {"$ref": "#/$defs/Color"},
+        },
+    }
+    compiler = SchemaCompiler()
+    code = generate_pydantic_model("Params", schema, compiler=compiler)
+
+    assert compiler.model_names == ["Node", "Params"]
+    assert 'children: Optional[List["Node"]] = None' in code
+    assert 'color: Optional[Literal["red", "green"]] = None' in code
+    params = _exec_models(code)["Params"]
+    tree = params.model_validate({"a": {"children": [{"children": []}]}})
+    assert tree.a.children[0].children == []
+
+
+def test_combinators():
+    """anyOf/oneOf should become unions and allOf members should be merged."""
+    schema = {
+        "type": "object",
+        "properties": {
+            "value": {"anyOf": [{"type": "string"}, {"type": "integer"}, {"type": "null"}]},
+            "item": {
+                "allOf": [
+                    {
+                        "type": "object",
+                        "properties": {"id": {"type": "string"}},
+                        "required": ["id"],
+                    },
+                    {"properties": {"label": {"type": "string"}}},
+                ]
+            },
+        },
+    }
+
+    code = generate_pydantic_model("Params", schema)
+
+    assert "value: Optional[Union[str, int]] = None" in code
+    item = _exec_models(code)["ParamsItem"]
+    assert set(item.model_fields) == {"id", "label"}
+    assert item.model_fields["id"].is_required()
+
+
+def test_invalid_property_names_are_aliased():
+    """Keywords and other non-identifiers should become aliased fields."""
+    schema = {"type": "object", "properties": {"from": {"type": "string"}, "max-len": {}}}
+
+    params = _exec_models(generate_pydantic_model("Params", schema))["Params"]
+
+    dumped = params(from_="a", max_len=3).model_dump(exclude_none=True, by_alias=True)
+    assert dumped == {"from": "a", "max-len": 3}
+
+
 def test_sanitize_name():
     """Test name sanitization."""
     assert sanitize_name("my-tool") == "my_tool"
     assert sanitize_name("my.tool") == "my_tool"
     assert sanitize_name("list") == "list_"
+
+
+def _write_config(tmp_path, servers):
+    """Write an mcp_config.json with the given servers."""
+    config_file = tmp_path / "mcp_config.json"
+    config_file.write_text(json.dumps({"mcpServers": servers}))
+    return config_file
+
+
+async def test_generate_wrappers_introspects_servers_concurrently(tmp_path):
+    """Servers should be listed concurrently and failures reported per server."""
+    config_file = _write_config(
+        tmp_path,
+        {
+            "a": {"command": "node"},
+            "b": {"command": "node"},
+            "broken": {"command": "node"},
+            "off": {"command": "node", "disabled": True},
+        },
+    )
+    in_flight = 0
+    peak = 0
+
+    async def fake_list(server_name, server_config):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        if server_name == "broken":
+            raise RuntimeError("spawn failed")
+        tool = Mock(description="Echo", inputSchema={"type": "object", "properties": {}})
+        tool.name = "echo"
+        return [tool]
+
+    with patch("runtime.generate_wrappers.list_server_tools", side_effect=fake_list):
+        results = await generate_wrappers(
+            config_file, output_dir=tmp_path / "servers", concurrency=2
+        )
+
+    assert peak == 2
+    assert [(r.server_name, r.status) for r in results] == [
+        ("a", "generated"),
+        ("b", "generated"),
+        ("broken", "failed"),
+        ("off", "skipped"),
+    ]
+    assert results[2].error == "spawn failed"
+    assert (tmp_path / "servers" / "a" / "echo.py").exists()
+    assert not (tmp_path / "servers" / "broken").exists()
+    assert "2 generated, 1 failed, 1 skipped" in format_generation_summary(results)
+
+
+async def test_generate_wrappers_bounds_slow_servers(tmp_path):
+    """A server exceeding the timeout should fail without delaying the rest."""
+    config_file = _write_config(tmp_path, {"slow": {"command": "node"}})
+
+    async def hang(server_name, server_config):
+        await asyncio.sleep(10)
+
+    with patch("runtime.generate_wrappers.list_server_tools", side_effect=hang):
+        results = await generate_wrappers(
+            config_file, output_dir=tmp_path / "servers", timeout=0.05
+        )
+
+    assert results[0].status == "failed"
+    assert "timed out" in results[0].error
+
+
+def _tool(name, description="A tool", properties=None):
+    """Build a tool definition with an object input schema."""
+    tool = Mock(
+        description=description,
+        inputSchema={"type": "object", "properties": properties or {}},
+    )
+    tool.name = name
+    return tool
+
+
+def test_regeneration_skips_unchanged_wrappers(tmp_path):
+    """Unchanged tools should not be rewritten; removed ones should be deleted."""
+    server_dir = tmp_path / "srv"
+    tools = [_tool("keep"), _tool("edit"), _tool("drop")]
+    diff = generate_server_module("srv", tools, tmp_path)
+    assert diff.added == ["keep", "edit", "drop"]
+
+    for path in server_dir.iterdir():
+        os.utime(path, ns=(0, 0))
+
+    tools = [_tool("keep"), _tool("edit", properties={"q": {"type": "string"}}), _tool("new")]
+    diff = generate_server_module("srv", tools, tmp_path)
+
+    assert (diff.added, diff.changed, diff.removed) == (["new"], ["edit"], ["drop"])
+    assert (server_dir / "keep.py").stat().st_mtime_ns == 0
+    assert (server_dir / "edit.py").stat().st_mtime_ns != 0
+    assert "q: Optional[str] = None" in (server_dir / "edit.py").read_text()
+    assert (server_dir / "new.py").exists()
+    assert not (server_dir / "drop.py").exists()
+    assert "drop" not in (server_dir / "__init__.py").read_text()
+
+    diff = generate_server_module("srv", tools, tmp_path)
+    assert not diff.has_changes
+
+
+def test_check_reports_drift_without_writing(tmp_path):
+    """Check mode should report differences and leave the files alone."""
+    generate_server_module("srv", [_tool("one")], tmp_path)
+    before = {p.name: p.read_text() for p in (tmp_path / "srv").iterdir()}
+
+    diff = generate_server_module(
+        "srv", [_tool("one", description="Changed"), _tool("two")], tmp_path, check=True
+    )
+
+    assert (diff.added, diff.changed) == (["two"], ["one"])
+    assert diff.summary() == "+1 added, ~1 changed"
+    assert {p.name: p.read_text() for p in (tmp_path / "srv").iterdir()} == before
+
+
+def test_missing_wrapper_file_counts_as_changed(tmp_path):
+    """A wrapper deleted by hand should be regenerated."""
+    generate_server_module("srv", [_tool("one")], tmp_path)
+    (tmp_path / "srv" / "one.py").unlink()
+
+    diff = generate_server_module("srv", [_tool("one")], tmp_path)
+
+    assert diff.changed == ["one"]
+    assert (tmp_path / "srv" / "one.py").exists()
+
+
+async def test_generate_wrappers_check_mode(tmp_path):
+    """--check should mark drifted servers and write nothing."""
+    config_file = _write_config(tmp_path, {"a": {"command": "node"}, "b": {"command": "node"}})
+    output_dir = tmp_path / "servers"
+    generate_server_module("a", [_tool("echo")], output_dir)
+
+    async def fake_list(server_name, server_config):
+        return [_tool("echo")]
+
+    with patch("runtime.generate_wrappers.list_server_tools", side_effect=fake_list):
+        results = await generate_wrappers(config_file, output_dir=output_dir, check=True)
+
+    assert [(r.server_name, r.status) for r in results] == [("a", "unchanged"), ("b", "drifted")]
+    assert results[1].changes == "+1 added"
+    assert not (output_dir / "b").exists()
+    assert "1 unchanged, 1 drifted" in format_generation_summary(results)
+
+
+def test_bundle_target_builds_wrappers_lazily(tmp_path, monkeypatch):
+    """A bundle should be one module whose wrappers are built on first access."""
+    output_dir = tmp_path / "bundled"
+    tools = [_tool("search", properties={"q": {"type": "string"}}), _tool("read-file")]
+    generate_server_module("srv", tools, output_dir, target="package")
+
+    diff = generate_server_module("srv", tools, output_dir, target="bundle")
+
+    assert diff.changed == ["search", "read-file"]
+    assert sorted(p.name for p in (output_dir / "srv").iterdir()) == [
+        ".manifest.json",
+        "README.md",
+        "__init__.py",
+    ]
+    monkeypatch.syspath_prepend(str(output_dir))
+    module = importlib.import_module("srv")
+    try:
+        assert module.__all__ == ["search", "read_file"]
+        assert "SearchParams" not in vars(module)
+        assert module.SearchParams(q="x").q == "x"
+        assert "search" in vars(module)
+        assert "ReadFileParams" not in vars(module)
+        with pytest.raises(AttributeError):
+            module.missing
+    finally:
+        del sys.modules["srv"]
+
+    # Without a target, regeneration keeps the bundle
+    assert not generate_server_module("srv", tools, output_dir).has_changes
+
+
+def test_bundle_defines_shared_models_once(tmp_path):
+    """Identical nested models of different tools should be defined once per bundle."""
+    point = {"type": "object", "properties": {"x": {"type": "number"}}}
+    tools = [_tool("a", properties={"p": point}), _tool("b", properties={"q": point})]
+
+    generate_server_module("srv", tools, tmp_path, target="bundle")
+
+    code = (tmp_path / "srv" / "__init__.py").read_text()
+    assert code.count("class AParamsP(BaseModel)") == 1
+    assert "q: Optional[AParamsP] = None" in code
+
+
+def _load_tool_module(path):
+    """Import a generated tool module from its file."""
+    spec = importlib.util.spec_from_file_location(f"generated_{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def test_wrapper_fast_path_for_dicts(tmp_path):
+    """Dict params should be validated strictly and sent without a model round trip."""
+    tool = _tool("search", properties={"query": {"type": "string"}, "from": {"type": "integer"}})
+    generate_server_module("srv", [tool], tmp_path)
+    module = _load_tool_module(tmp_path / "srv" / "search.py")
+    module.call_mcp_tool = AsyncMock(side_effect=lambda tool_id, arguments: arguments)
+
+    result = await module.search({"query": "q", "from": 2, "limit": None, "unknown": 1})
+
+    assert result == {"query": "q", "from": 2}
+    module.call_mcp_tool.assert_awaited_once_with("srv__search", {"query": "q", "from": 2})
+    assert await module.search(module.SearchParams(query="q", from_=2)) == result
+    with pytest.raises(ValidationError):
+        await module.search({"query": 5})
+
+
+def test_normalization_only_generated_when_configured(tmp_path, monkeypatch):
+    """Servers with strategy "none" should not normalize; changing it regenerates."""
+    generate_server_module("srv", [_tool("one")], tmp_path)
+    code = (tmp_path / "srv" / "one.py").read_text()
+    assert "normalize_field_names" not in code
+    assert "from runtime.mcp_client import call_mcp_tool" in code.split("class ")[0]
+
+    monkeypatch.setitem(NORMALIZATION_CONFIG.servers, "srv", "ado-pascal-case")
+    diff = generate_server_module("srv", [_tool("one")], tmp_path)
+
+    assert diff.changed == ["one"]
+    code = (tmp_path / "srv" / "one.py").read_text()
+    assert 'normalize_field_names(unwrapped, "srv")' in code
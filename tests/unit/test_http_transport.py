@@ -0,0 +1,61 @@
+"""Unit tests for HTTP client tuning and session headers."""
+
+from unittest.mock import patch
+
+from runtime.config import HttpOptions, ServerConfig
+from runtime.http_transport import (
+    HttpSession,
+    build_http_client,
+    http2_available,
+    http_transport_kwargs,
+)
+
+
+class TestHttpOptions:
+    """Test the per-server HTTP options."""
+
+    def test_defaults_extend_keepalive(self) -> None:
+        """Servers get HTTP options even when none are configured."""
+        config = ServerConfig(type="http", url="https://example.com/mcp")
+        assert config.http.keepaliveExpiry > 5
+        assert config.http.resumeSession is True
+
+    async def test_client_applies_pool_and_timeouts(self) -> None:
+        """The httpx client should carry the configured limits and timeouts."""
+        options = HttpOptions(connectTimeout=2, readTimeout=90, timeout=15, maxConnections=4)
+        async with build_http_client(options) as client:
+            assert client.timeout.connect == 2
+            assert client.timeout.read == 90
+            assert client.timeout.write == 15
+            pool = client._transport._pool
+            assert pool._max_connections == 4
+            assert pool._keepalive_expiry == options.keepaliveExpiry
+
+    async def test_http2_falls_back_without_h2(self) -> None:
+        """HTTP/2 is only enabled when the h2 package is importable."""
+        http2_available.cache_clear()
+        try:
+            with patch("runtime.http_transport.importlib.util.find_spec", return_value=None):
+                async with build_http_client(HttpOptions(http2=True)) as client:
+                    assert client._transport._pool._http2 is False
+        finally:
+            http2_available.cache_clear()
+
+    def test_transport_kwargs(self) -> None:
+        """Transport arguments forward the timeouts and a client factory."""
+        kwargs = http_transport_kwargs(HttpOptions(timeout=12, readTimeout=40))
+        assert kwargs["timeout"] == 12
+        assert kwargs["sse_read_timeout"] == 40
+        assert callable(kwargs["httpx_client_factory"])
+
+
+class TestHttpSession:
+    """Test resumable session records."""
+
+    def test_headers(self) -> None:
+        """A kept session is continued via its ID and protocol version."""
+        session = HttpSession("abc", "2025-06-18")
+        assert session.headers() == {
+            "mcp-session-id": "abc",
+            "mcp-protocol-version": "2025-06-18",
+        }
@@ -0,0 +1,38 @@
+"""Unit tests for startup import profiling."""
+
+from runtime.import_profile import parse_importtime_line, summarize
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     mcp.types
+import time:        50 |        150 |   mcp
+import time:       200 |        200 |   pydantic
+import time:        10 |        360 | runtime.mcp_client
+import time:        40 |         40 | site
+""".splitlines()
+
+
+def test_parse_line():
+    """Times and nesting depth should be parsed; the header skipped."""
+    assert parse_importtime_line(SAMPLE[0]) is None
+    record = parse_importtime_line(SAMPLE[1])
+    assert record is not None
+    assert (record.module, record.self_us, record.cumulative_us, record.depth) == (
+        "mcp.types",
+        100,
+        100,
+        2,
+    )
+    assert record.package == "mcp"
+    assert parse_importtime_line(SAMPLE[4]).depth == 0
+
+
+def test_summarize_groups_by_package():
+    """The summary should total self time per package and rank direct imports."""
+    records = [r for r in map(parse_importtime_line, SAMPLE) if r is not None]
+    report = summarize(records)
+    lines = report.splitlines()
+    assert "5 modules, 0.4 ms total" in lines[0]
+    assert lines[2].split()[-1] == "pydantic"
+    assert "mcp" in lines[3]
+    direct = lines[lines.index("Top imports (cumulative time, as imported by the program):") + 1 :]
+    assert [line.split()[-1] for line in direct] == ["runtime.mcp_client", "site"]
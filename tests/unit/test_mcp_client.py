@@ -11,14 +11,21 @@ This test suite verifies:
 - Edge cases and error scenarios
 """
 
+import asyncio
 import json
+import os
+import signal
+import subprocess
+import sys
 from pathlib import Path
 from typing import Any
 from unittest.mock import AsyncMock, Mock, patch
 
+import anyio
 import pytest
 
 from runtime.exceptions import (
+    CircuitOpenError,
     ConfigurationError,
     ServerConnectionError,
     ToolExecutionError,
@@ -28,8 +35,11 @@ from runtime.mcp_client import (
     ConnectionState,
     McpClientManager,
     call_mcp_tool,
+    call_mcp_tools,
     get_mcp_client_manager,
 )
+from runtime.result_cache import ResultCache
+from runtime.stdio_pool import PooledServer
 
 
 @pytest.fixture
@@ -184,6 +194,127 @@ class TestLazyInitialization:
             assert manager._config is not None
 
 
+class TestWarmup:
+    """Test background warmup of eager and predicted servers."""
+
+    @pytest.fixture
+    def warmup_config(self, tmp_path: Path) -> Path:
+        """Config with one server per warmup policy."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(
+            json.dumps(
+                {
+                    "mcpServers": {
+                        "eager": {"command": "eager-server", "warmup": "eager"},
+                        "lazy": {"command": "lazy-server"},
+                        "predicted": {"command": "predicted-server", "warmup": "predicted"},
+                    }
+                }
+            )
+        )
+        return config_file
+
+    @staticmethod
+    def _slow_stdio(delay: float) -> Any:
+        """Build a stdio_client replacement whose __aenter__ takes delay seconds."""
+
+        def factory(server_params: Any) -> AsyncMock:
+            async def enter() -> tuple[Mock, Mock]:
+                await asyncio.sleep(delay)
+                return (Mock(), Mock())
+
+            ctx = AsyncMock()
+            ctx.__aenter__ = AsyncMock(side_effect=enter)
+            ctx.__aexit__ = AsyncMock(return_value=None)
+            return ctx
+
+        return factory
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_eager_server_connects_in_background(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        warmup_config: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+    ) -> None:
+        """Initialize should return immediately while eager servers connect."""
+        mock_stdio.side_effect = self._slow_stdio(0.2)
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.list_tools.return_value.tools = [mock_tool]
+        manager = McpClientManager()
+
+        start = asyncio.get_running_loop().time()
+        await manager.initialize(warmup_config)
+        assert asyncio.get_running_loop().time() - start < 0.1
+        assert manager.connected_servers == []
+
+        await manager.wait_for_warmup()
+        assert manager.connected_servers == ["eager"]
+        assert "eager" in manager._tool_cache
+        await manager.cleanup()
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_predicted_server_follows_usage_stats(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        warmup_config: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+        tmp_path: Path,
+    ) -> None:
+        """Predicted servers are warmed once recent runs have used them."""
+        from runtime.usage_stats import UsageStats
+
+        mock_stdio.side_effect = self._slow_stdio(0)
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.list_tools.return_value.tools = [mock_tool]
+        stats = UsageStats(tmp_path / "usage.json")
+
+        for _ in range(2):
+            manager = McpClientManager(usage_stats=stats)
+            await manager.initialize(warmup_config, warmup=False)
+            await manager.call_tool("predicted__test_tool", {})
+            await manager.cleanup()
+
+        manager = McpClientManager(usage_stats=stats)
+        await manager.initialize(warmup_config)
+        await manager.wait_for_warmup()
+        assert sorted(manager.connected_servers) == ["eager", "predicted"]
+        await manager.cleanup()
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_cleanup_cancels_pending_warmup(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        warmup_config: Path,
+        mock_session: AsyncMock,
+    ) -> None:
+        """A warmup still connecting at cleanup must not delay exit."""
+        mock_stdio.side_effect = self._slow_stdio(30)
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        manager = McpClientManager()
+        await manager.initialize(warmup_config)
+        await asyncio.sleep(0)
+
+        start = asyncio.get_running_loop().time()
+        await manager.cleanup()
+        assert asyncio.get_running_loop().time() - start < 1.0
+        assert manager._warmup_tasks == set()
+
+    async def test_warmup_disabled(self, warmup_config: Path) -> None:
+        """warmup=False should leave every server lazy."""
+        manager = McpClientManager()
+        await manager.initialize(warmup_config, warmup=False)
+        assert manager._warmup_tasks == set()
+
+
 class TestLazyConnection:
     """Test lazy connection behavior - servers connect on first tool call."""
 
@@ -218,6 +349,41 @@ class TestLazyConnection:
         assert manager._state == ConnectionState.CONNECTED
         mock_stdio.assert_called_once()
 
+    @patch("runtime.mcp_client.streamablehttp_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_connect_expands_header_placeholders(
+        self,
+        mock_session_class: Mock,
+        mock_http: Mock,
+        manager: McpClientManager,
+        tmp_path: Path,
+        mock_session: AsyncMock,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """${VAR} placeholders in HTTP headers should be expanded on connect."""
+        monkeypatch.setenv("TEST_HTTP_TOKEN", "s3cret")
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(
+            json.dumps(
+                {
+                    "mcpServers": {
+                        "remote": {
+                            "type": "http",
+                            "url": "https://example.com/mcp",
+                            "headers": {"Authorization": "Bearer ${TEST_HTTP_TOKEN}"},
+                        }
+                    }
+                }
+            )
+        )
+        mock_http.return_value.__aenter__ = AsyncMock(return_value=(Mock(), Mock(), Mock()))
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+
+        await manager.initialize(config_file)
+        await manager._connect_to_server("remote", manager._config.mcpServers["remote"])
+
+        assert mock_http.call_args.kwargs["headers"] == {"Authorization": "Bearer s3cret"}
+
     @patch("runtime.mcp_client.stdio_client")
     @patch("runtime.mcp_client.ClientSession")
     async def test_second_call_reuses_connection(
@@ -275,6 +441,144 @@ class TestLazyConnection:
             await manager.call_tool("disabled-server__tool", {})
 
 
+class TestHttpSessionResumption:
+    """Test HTTP transport tuning and session resumption."""
+
+    @pytest.fixture
+    def http_config(self, tmp_path: Path) -> Path:
+        """Config with one Streamable HTTP server."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(
+            json.dumps(
+                {
+                    "mcpServers": {
+                        "remote": {
+                            "type": "http",
+                            "url": "https://example.com/mcp",
+                            "http": {"keepaliveExpiry": 120, "connectTimeout": 3},
+                        }
+                    }
+                }
+            )
+        )
+        return config_file
+
+    @pytest.fixture
+    def mock_http_session(self, mock_session: AsyncMock) -> AsyncMock:
+        """Session whose initialize negotiates a protocol version."""
+        mock_session.initialize.return_value = Mock(protocolVersion="2025-06-18")
+        return mock_session
+
+    @patch("runtime.mcp_client.streamablehttp_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_transport_uses_server_http_options(
+        self,
+        mock_session_class: Mock,
+        mock_http: Mock,
+        manager: McpClientManager,
+        http_config: Path,
+        mock_http_session: AsyncMock,
+    ) -> None:
+        """The transport should get the server's timeouts and a tuned client factory."""
+        mock_http.return_value.__aenter__ = AsyncMock(return_value=(Mock(), Mock(), lambda: None))
+        mock_session_class.return_value.__aenter__.return_value = mock_http_session
+
+        await manager.initialize(http_config)
+        await manager._connect_to_server("remote", manager._config.mcpServers["remote"])
+
+        kwargs = mock_http.call_args.kwargs
+        client = kwargs["httpx_client_factory"](headers={"X": "1"})
+        assert client.timeout.connect == 3
+        assert client.headers["X"] == "1"
+        await client.aclose()
+
+    @patch("runtime.mcp_client.streamablehttp_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_reconnect_resumes_session(
+        self,
+        mock_session_class: Mock,
+        mock_http: Mock,
+        manager: McpClientManager,
+        http_config: Path,
+        mock_http_session: AsyncMock,
+    ) -> None:
+        """A reconnect should send the session ID and skip initialize."""
+        mock_http.return_value.__aenter__ = AsyncMock(
+            return_value=(Mock(), Mock(), lambda: "sess-1")
+        )
+        mock_session_class.return_value.__aenter__.return_value = mock_http_session
+        await manager.initialize(http_config)
+        config = manager._config.mcpServers["remote"]
+
+        await manager._connect_to_server("remote", config)
+        assert mock_http.call_args.kwargs["terminate_on_close"] is False
+        await manager.disconnect_server("remote")
+        await manager._connect_to_server("remote", config)
+
+        assert mock_http.call_args.kwargs["headers"] == {
+            "mcp-session-id": "sess-1",
+            "mcp-protocol-version": "2025-06-18",
+        }
+        mock_http_session.initialize.assert_awaited_once()
+        mock_http_session.send_ping.assert_awaited_once()
+        assert "remote" in manager._clients
+
+    @patch("runtime.mcp_client.streamablehttp_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_expired_session_is_reinitialized(
+        self,
+        mock_session_class: Mock,
+        mock_http: Mock,
+        manager: McpClientManager,
+        http_config: Path,
+        mock_http_session: AsyncMock,
+    ) -> None:
+        """If the server rejects the session, connect afresh and initialize."""
+        mock_http.return_value.__aenter__ = AsyncMock(
+            return_value=(Mock(), Mock(), lambda: "sess-2")
+        )
+        mock_session_class.return_value.__aenter__.return_value = mock_http_session
+        mock_http_session.send_ping.side_effect = RuntimeError("Session terminated")
+        await manager.initialize(http_config)
+        config = manager._config.mcpServers["remote"]
+
+        await manager._connect_to_server("remote", config)
+        await manager.disconnect_server("remote")
+        await manager._connect_to_server("remote", config)
+
+        assert mock_http.call_count == 3
+        assert "mcp-session-id" not in mock_http.call_args.kwargs["headers"]
+        assert mock_http_session.initialize.await_count == 2
+        assert "remote" in manager._clients
+
+    @patch("runtime.mcp_client.terminate_http_session", new_callable=AsyncMock)
+    @patch("runtime.mcp_client.streamablehttp_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_cleanup_terminates_kept_session(
+        self,
+        mock_session_class: Mock,
+        mock_http: Mock,
+        mock_terminate: AsyncMock,
+        manager: McpClientManager,
+        http_config: Path,
+        mock_http_session: AsyncMock,
+    ) -> None:
+        """cleanup() should end sessions that were kept for resumption."""
+        mock_http.return_value.__aenter__ = AsyncMock(
+            return_value=(Mock(), Mock(), lambda: "sess-3")
+        )
+        mock_session_class.return_value.__aenter__.return_value = mock_http_session
+        await manager.initialize(http_config)
+        await manager._connect_to_server("remote", manager._config.mcpServers["remote"])
+
+        await manager.cleanup()
+
+        mock_terminate.assert_awaited_once()
+        url, _headers, session, _options = mock_terminate.await_args.args
+        assert url == "https://example.com/mcp"
+        assert session.session_id == "sess-3"
+
+
 class TestToolCaching:
     """Test tool caching behavior - avoid repeated list_tools calls."""
 
@@ -368,6 +672,315 @@ class TestToolCaching:
         assert second_count == 1
 
 
+class TestToolIndex:
+    """Test the per-server name -> Tool index."""
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_index_built_with_cache(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        manager: McpClientManager,
+        temp_config_file: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+        mock_stdio_context: AsyncMock,
+    ) -> None:
+        """Listing tools should populate the index alongside the cache."""
+        mock_stdio.return_value = mock_stdio_context
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.list_tools.return_value.tools = [mock_tool]
+        mock_session.call_tool.return_value.value = "result"
+
+        await manager.initialize(temp_config_file)
+        await manager.call_tool("test-server__test_tool", {})
+
+        assert manager._tool_index["test-server"] == {"test_tool": mock_tool}
+
+    async def test_get_tool_input_schema_without_round_trip(
+        self, manager: McpClientManager, temp_config_file: Path, mock_tool: Mock
+    ) -> None:
+        """Input schemas of cached tools should be served without connecting."""
+        mock_tool.inputSchema = {"type": "object", "properties": {"q": {"type": "string"}}}
+        await manager.initialize(temp_config_file)
+        manager._cache_tools("test-server", [mock_tool])
+
+        with patch("runtime.mcp_client.stdio_client") as mock_stdio:
+            schema = await manager.get_tool_input_schema("test-server__test_tool")
+
+        assert schema == mock_tool.inputSchema
+        mock_stdio.assert_not_called()
+
+    async def test_unknown_tool_lists_available_names(
+        self, manager: McpClientManager, temp_config_file: Path, mock_tool: Mock
+    ) -> None:
+        """ToolNotFoundError should name the available tools."""
+        await manager.initialize(temp_config_file)
+        manager._clients["test-server"] = Mock()
+        manager._cache_tools("test-server", [mock_tool])
+
+        with pytest.raises(ToolNotFoundError, match=r"Available tools: \['test_tool'\]"):
+            await manager.get_tool_input_schema("test-server__missing")
+
+
+class TestParallelToolListing:
+    """Test concurrent fan-out in list_all_tools."""
+
+    @pytest.fixture
+    def multi_server_config(self, tmp_path: Path) -> Path:
+        """Config with one fast and one hanging stdio server."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(
+            json.dumps(
+                {
+                    "mcpServers": {
+                        "fast": {"command": "fast-server"},
+                        "slow": {"command": "slow-server"},
+                    }
+                }
+            )
+        )
+        return config_file
+
+    @staticmethod
+    def _stdio_factory(delays: dict[str, float]) -> Any:
+        """Build a stdio_client replacement whose __aenter__ sleeps per command."""
+
+        def factory(server_params: Any) -> AsyncMock:
+            async def enter() -> tuple[Mock, Mock]:
+                await asyncio.sleep(delays.get(server_params.command, 0))
+                return (Mock(), Mock())
+
+            ctx = AsyncMock()
+            ctx.__aenter__ = AsyncMock(side_effect=enter)
+            ctx.__aexit__ = AsyncMock(return_value=None)
+            return ctx
+
+        return factory
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_hung_server_does_not_block_others(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        manager: McpClientManager,
+        multi_server_config: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+    ) -> None:
+        """A server exceeding its timeout is skipped; others still return tools."""
+        mock_stdio.side_effect = self._stdio_factory({"slow-server": 10})
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.list_tools.return_value.tools = [mock_tool]
+
+        await manager.initialize(multi_server_config)
+        tools = await manager.list_all_tools(timeout=0.2)
+
+        assert tools == [mock_tool]
+        assert "fast" in manager._clients
+        assert "slow" not in manager._clients
+        timings = manager.get_server_timings()
+        assert set(timings) == {"fast", "slow"}
+        assert timings["slow"] >= 0.2
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_servers_connect_concurrently(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        manager: McpClientManager,
+        multi_server_config: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+    ) -> None:
+        """Total time should track the slowest server, not the sum."""
+        mock_stdio.side_effect = self._stdio_factory({"fast-server": 0.3, "slow-server": 0.3})
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.list_tools.return_value.tools = [mock_tool]
+
+        await manager.initialize(multi_server_config)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tools = await manager.list_all_tools()
+        elapsed = loop.time() - start
+
+        assert len(tools) == 2
+        assert elapsed < 0.55
+
+    async def test_invalid_concurrency(
+        self, manager: McpClientManager, temp_config_file: Path
+    ) -> None:
+        """Concurrency below 1 should be rejected."""
+        await manager.initialize(temp_config_file)
+        with pytest.raises(ConfigurationError, match="concurrency must be at least 1"):
+            await manager.list_all_tools(concurrency=0)
+
+
+class TestConcurrentCalls:
+    """Test concurrent call_tool safety and back-pressure."""
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_concurrent_calls_connect_once(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        manager: McpClientManager,
+        temp_config_file: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+    ) -> None:
+        """Concurrent calls to an unconnected server should spawn it only once."""
+
+        async def slow_enter() -> tuple[Mock, Mock]:
+            await asyncio.sleep(0.05)
+            return (Mock(), Mock())
+
+        mock_stdio.return_value.__aenter__ = AsyncMock(side_effect=slow_enter)
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.list_tools.return_value.tools = [mock_tool]
+        mock_session.call_tool.return_value.value = "result"
+
+        await manager.initialize(temp_config_file)
+        results = await asyncio.gather(
+            *(manager.call_tool("test-server__test_tool", {}) for _ in range(5))
+        )
+
+        assert results == ["result"] * 5
+        mock_stdio.assert_called_once()
+        assert mock_session.list_tools.call_count == 1
+        assert mock_session.call_tool.call_count == 5
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_in_flight_requests_bounded(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        manager: McpClientManager,
+        tmp_path: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+        mock_stdio_context: AsyncMock,
+    ) -> None:
+        """No more than maxConcurrentRequests calls should be in flight per server."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(
+            json.dumps(
+                {"mcpServers": {"test-server": {"command": "node", "maxConcurrentRequests": 2}}}
+            )
+        )
+        in_flight = 0
+        peak = 0
+
+        async def tracked_call(*args: Any) -> Mock:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            response = Mock()
+            response.value = "ok"
+            return response
+
+        mock_stdio.return_value = mock_stdio_context
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.list_tools.return_value.tools = [mock_tool]
+        mock_session.call_tool.side_effect = tracked_call
+
+        await manager.initialize(config_file)
+        await asyncio.gather(*(manager.call_tool("test-server__test_tool", {}) for _ in range(6)))
+
+        assert peak == 2
+
+
+class TestBatchCalls:
+    """Test call_tools_batch / call_mcp_tools."""
+
+    async def test_results_in_input_order_with_partial_failures(
+        self, manager: McpClientManager, temp_config_file: Path
+    ) -> None:
+        """Results should align with inputs, with exceptions captured per item."""
+        await manager.initialize(temp_config_file)
+
+        async def fake_call_tool(tool_id: str, params: dict[str, Any], max_retries: int) -> Any:
+            await asyncio.sleep(0.01 * (5 - params["n"]))
+            if params["n"] == 2:
+                raise ToolExecutionError("boom")
+            return params["n"]
+
+        with patch.object(manager, "call_tool", side_effect=fake_call_tool):
+            results = await manager.call_tools_batch(
+                [("a__tool", {"n": n}) for n in range(5)], concurrency=5
+            )
+
+        assert results[:2] == [0, 1]
+        assert isinstance(results[2], ToolExecutionError)
+        assert results[3:] == [3, 4]
+
+    async def test_calls_interleaved_across_servers(
+        self, manager: McpClientManager, temp_config_file: Path
+    ) -> None:
+        """Calls to different servers should be scheduled round-robin."""
+        await manager.initialize(temp_config_file)
+        order: list[str] = []
+
+        async def fake_call_tool(tool_id: str, params: dict[str, Any], max_retries: int) -> Any:
+            order.append(tool_id)
+            return None
+
+        calls = [("a__t", {}), ("a__t", {}), ("a__t", {}), ("b__t", {})]
+        with patch.object(manager, "call_tool", side_effect=fake_call_tool):
+            await manager.call_tools_batch(calls, concurrency=1)
+
+        assert order == ["a__t", "b__t", "a__t", "a__t"]
+
+    async def test_concurrency_bound(
+        self, manager: McpClientManager, temp_config_file: Path
+    ) -> None:
+        """No more than ``concurrency`` calls should execute at once."""
+        await manager.initialize(temp_config_file)
+        in_flight = 0
+        peak = 0
+
+        async def fake_call_tool(tool_id: str, params: dict[str, Any], max_retries: int) -> Any:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        with patch.object(manager, "call_tool", side_effect=fake_call_tool):
+            await manager.call_tools_batch([("a__t", {})] * 10, concurrency=3)
+
+        assert peak == 3
+
+    async def test_invalid_concurrency(
+        self, manager: McpClientManager, temp_config_file: Path
+    ) -> None:
+        """Concurrency below 1 should be rejected."""
+        await manager.initialize(temp_config_file)
+        with pytest.raises(ConfigurationError, match="concurrency must be at least 1"):
+            await manager.call_tools_batch([("a__t", {})], concurrency=0)
+
+    @patch("runtime.mcp_client.call_mcp_tool")
+    async def test_call_mcp_tools_uses_call_mcp_tool(self, mock_call: AsyncMock) -> None:
+        """call_mcp_tools should dispatch each item through call_mcp_tool."""
+
+        async def echo_id(tool_id: str, params: dict[str, Any], max_retries: int) -> str:
+            return tool_id
+
+        mock_call.side_effect = echo_id
+
+        results = await call_mcp_tools([("a__x", {}), ("b__y", {})], max_retries=0)
+
+        assert results == ["a__x", "b__y"]
+        assert mock_call.call_count == 2
+
+
 class TestDefensiveUnwrapping:
     """Test defensive unwrapping of responses - handle various response formats."""
 
@@ -566,6 +1179,219 @@ class TestCleanup:
         await manager.cleanup()
         assert manager._config is None
 
+    @staticmethod
+    def _context(exit_side_effect: Any) -> AsyncMock:
+        """Build an entered context manager whose __aexit__ runs exit_side_effect."""
+        ctx = AsyncMock()
+        ctx.__aexit__ = AsyncMock(side_effect=exit_side_effect)
+        return ctx
+
+    async def test_cleanup_closes_servers_concurrently(self, manager: McpClientManager) -> None:
+        """Slow servers should shut down in parallel and report their timings."""
+
+        async def slow_exit(*_args: Any) -> None:
+            await asyncio.sleep(0.3)
+
+        for name in ("a", "b", "c"):
+            manager._session_contexts[name] = self._context(slow_exit)
+            manager._stdio_contexts[name] = self._context(None)
+
+        start = asyncio.get_running_loop().time()
+        await manager.cleanup()
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert elapsed < 0.8
+        timings = manager.get_shutdown_timings()
+        assert sorted(timings) == ["a", "b", "c"]
+        assert all(0.25 < seconds < 0.8 for seconds in timings.values())
+        assert manager.metrics.snapshot()["servers"]["a"]["shutdown_seconds"]["count"] == 1
+
+    async def test_hung_server_bounded_by_grace_period(self, manager: McpClientManager) -> None:
+        """A server that never finishes closing should not block cleanup."""
+        hang = asyncio.Event()
+
+        async def hung_exit(*_args: Any) -> None:
+            await hang.wait()
+
+        manager._session_contexts["hung"] = self._context(hung_exit)
+        manager._session_contexts["ok"] = self._context(None)
+
+        start = asyncio.get_running_loop().time()
+        await manager.cleanup(grace_period=0.1)
+
+        assert asyncio.get_running_loop().time() - start < 1.5
+        assert manager.get_shutdown_timings()["ok"] < 0.1
+        assert manager._session_contexts == {}
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX process groups")
+    async def test_escalates_to_sigterm(self, manager: McpClientManager) -> None:
+        """A server still running after the grace period should be terminated."""
+        process = subprocess.Popen(
+            [sys.executable, "-c", "import time; time.sleep(30)"], start_new_session=True
+        )
+
+        async def wait_for_exit(*_args: Any) -> None:
+            while process.poll() is None:
+                await asyncio.sleep(0.02)
+
+        server = PooledServer("stuck", self._context(wait_for_exit), Mock(), process.pid)
+        server.refcount = 1
+        manager._pooled["stuck"] = server
+        try:
+            await manager.cleanup(grace_period=0.1)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+        assert process.returncode == -signal.SIGTERM
+        assert manager.get_shutdown_timings()["stuck"] < 1.0
+        assert manager._pooled == {}
+
+
+class TestCircuitBreaking:
+    """Test fail-fast behavior and health checks driven by circuit breakers."""
+
+    @staticmethod
+    def write_config(tmp_path: Path, health_check_interval: float) -> Path:
+        """Write a config with one stdio server opening its circuit after 2 failures."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(
+            json.dumps(
+                {
+                    "mcpServers": {
+                        "flaky": {
+                            "command": "node",
+                            "retry": {"baseDelay": 0},
+                            "circuitBreaker": {
+                                "failureThreshold": 2,
+                                "resetTimeout": 60,
+                                "healthCheckInterval": health_check_interval,
+                            },
+                        }
+                    }
+                }
+            )
+        )
+        return config_file
+
+    @pytest.fixture
+    def breaker_config(self, tmp_path: Path) -> Path:
+        """Breaker config without health checks."""
+        return self.write_config(tmp_path, 0)
+
+    @patch("runtime.mcp_client.stdio_client")
+    async def test_open_circuit_fails_fast(
+        self, mock_stdio: Mock, manager: McpClientManager, breaker_config: Path
+    ) -> None:
+        """After repeated connect failures, calls fail without connecting."""
+        mock_stdio.side_effect = Exception("spawn failed")
+        await manager.initialize(breaker_config)
+
+        for _ in range(2):
+            with pytest.raises(ServerConnectionError, match="Could not connect"):
+                await manager.call_tool("flaky__tool", {})
+        with pytest.raises(CircuitOpenError, match="flaky"):
+            await manager.call_tool("flaky__tool", {})
+
+        assert mock_stdio.call_count == 2
+        state = manager.get_circuit_states()["flaky"]
+        assert state["state"] == "open"
+        assert state["rejected"] == 1
+        server_metrics = manager.metrics.snapshot()["servers"]["flaky"]
+        assert server_metrics["circuit_state"] == "open"
+        assert server_metrics["circuit_rejections"] == 1
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_open_circuit_stops_retries(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        manager: McpClientManager,
+        breaker_config: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+        mock_stdio_context: AsyncMock,
+    ) -> None:
+        """Retries stop once transient failures open the circuit."""
+        mock_stdio.return_value = mock_stdio_context
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_tool.name = "tool"
+        mock_session.list_tools.return_value.tools = [mock_tool]
+        mock_session.call_tool.side_effect = TimeoutError("slow")
+        await manager.initialize(breaker_config)
+
+        with pytest.raises(ToolExecutionError, match="after 2 attempt"):
+            await manager.call_tool("flaky__tool", {}, max_retries=5)
+        assert mock_session.call_tool.await_count == 2
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_probe_released_without_server_call(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        breaker_config: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+        mock_stdio_context: AsyncMock,
+    ) -> None:
+        """A half-open probe served from the result cache leaves room for the next probe."""
+        mock_stdio.return_value = mock_stdio_context
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_tool.name = "get_status"
+        mock_tool.annotations = None
+        mock_session.list_tools.return_value.tools = [mock_tool]
+        ok = Mock()
+        ok.value = "clean"
+        mock_session.call_tool.return_value = ok
+        manager = McpClientManager(result_cache=ResultCache())
+        await manager.initialize(breaker_config)
+        await manager.call_tool("flaky__get_status", {})
+
+        breaker = manager._circuit("flaky", manager._config.get_server("flaky"))
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker._opened_at -= 60  # resetTimeout elapsed: half-open
+
+        assert await manager.call_tool("flaky__get_status", {}) == "clean"
+        with pytest.raises(ToolNotFoundError):
+            await manager.call_tool("flaky__missing", {})
+        assert manager.get_circuit_states()["flaky"]["state"] == "half_open"
+
+        assert await manager.call_tool("flaky__get_status", {"path": "."}) == "clean"
+        assert manager.get_circuit_states()["flaky"]["state"] == "closed"
+        assert mock_session.call_tool.await_count == 2
+        await manager.cleanup()
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_health_checks_feed_breaker(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        manager: McpClientManager,
+        tmp_path: Path,
+        mock_session: AsyncMock,
+        mock_stdio_context: AsyncMock,
+    ) -> None:
+        """Failing health pings of a connected server open its circuit."""
+        mock_stdio.return_value = mock_stdio_context
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.send_ping.side_effect = TimeoutError("no pong")
+        await manager.initialize(self.write_config(tmp_path, 0.01))
+        await manager._connect_to_server("flaky", manager._config.mcpServers["flaky"])
+
+        for _ in range(100):
+            if manager.get_circuit_states()["flaky"]["state"] == "open":
+                break
+            await asyncio.sleep(0.01)
+        assert manager.get_circuit_states()["flaky"]["state"] == "open"
+
+        await manager.cleanup()
+        assert manager._health_tasks == {}
+
 
 class TestErrorHandling:
     """Test error handling and edge cases."""
@@ -634,6 +1460,138 @@ class TestErrorHandling:
         with pytest.raises(ToolExecutionError, match="Failed to execute tool"):
             await manager.call_tool("test-server__test_tool", {})
 
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_non_transient_error_not_retried(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        manager: McpClientManager,
+        temp_config_file: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+        mock_stdio_context: AsyncMock,
+    ) -> None:
+        """Errors that will never succeed should fail on the first attempt."""
+        mock_stdio.return_value = mock_stdio_context
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.list_tools.return_value.tools = [mock_tool]
+        mock_session.call_tool.side_effect = ValueError("bad params")
+
+        await manager.initialize(temp_config_file)
+
+        with pytest.raises(ToolExecutionError, match="after 1 attempt"):
+            await manager.call_tool("test-server__test_tool", {}, max_retries=3)
+        assert mock_session.call_tool.call_count == 1
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_closed_transport_reconnects(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        manager: McpClientManager,
+        tmp_path: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+        mock_stdio_context: AsyncMock,
+    ) -> None:
+        """A closed transport should trigger a reconnect and a retry."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(
+            json.dumps(
+                {
+                    "mcpServers": {
+                        "test-server": {"command": "node", "retry": {"baseDelay": 0}}
+                    }
+                }
+            )
+        )
+        mock_stdio.return_value = mock_stdio_context
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.list_tools.return_value.tools = [mock_tool]
+        ok = Mock()
+        ok.value = "recovered"
+        mock_session.call_tool.side_effect = [anyio.ClosedResourceError(), ok]
+
+        await manager.initialize(config_file)
+        result = await manager.call_tool("test-server__test_tool", {})
+
+        assert result == "recovered"
+        assert mock_stdio.call_count == 2
+        mock_stdio_context.__aexit__.assert_awaited()
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_transient_error_exhausts_retries(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        manager: McpClientManager,
+        tmp_path: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+        mock_stdio_context: AsyncMock,
+    ) -> None:
+        """Transient errors should be retried up to max_retries times."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(
+            json.dumps(
+                {
+                    "mcpServers": {
+                        "test-server": {"command": "node", "retry": {"baseDelay": 0}}
+                    }
+                }
+            )
+        )
+        mock_stdio.return_value = mock_stdio_context
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.list_tools.return_value.tools = [mock_tool]
+        mock_session.call_tool.side_effect = TimeoutError("slow")
+
+        await manager.initialize(config_file)
+
+        with pytest.raises(ToolExecutionError, match="after 3 attempt"):
+            await manager.call_tool("test-server__test_tool", {}, max_retries=2)
+        assert mock_session.call_tool.call_count == 3
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_retry_count_from_server_policy(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        manager: McpClientManager,
+        tmp_path: Path,
+        mock_session: AsyncMock,
+        mock_tool: Mock,
+        mock_stdio_context: AsyncMock,
+    ) -> None:
+        """Without max_retries, the server's retry.maxRetries applies."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(
+            json.dumps(
+                {
+                    "mcpServers": {
+                        "test-server": {
+                            "command": "node",
+                            "retry": {"baseDelay": 0, "maxRetries": 3},
+                        }
+                    }
+                }
+            )
+        )
+        mock_stdio.return_value = mock_stdio_context
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.list_tools.return_value.tools = [mock_tool]
+        mock_session.call_tool.side_effect = TimeoutError("slow")
+
+        await manager.initialize(config_file)
+
+        with pytest.raises(ToolExecutionError, match="after 4 attempt"):
+            await manager.call_tool("test-server__test_tool", {})
+        assert mock_session.call_tool.call_count == 4
+
     async def test_list_all_tools_with_no_enabled_servers(
         self, manager: McpClientManager, tmp_path: Path
     ) -> None:
@@ -671,5 +1629,37 @@ class TestConvenienceFunction:
         result = await call_mcp_tool("server__tool", {"param": "value"})
 
         mock_get_manager.assert_called_once()
-        mock_manager.call_tool.assert_called_once_with("server__tool", {"param": "value"}, max_retries=1)
+        mock_manager.call_tool.assert_called_once_with(
+            "server__tool", {"param": "value"}, max_retries=None
+        )
         assert result == "result"
+
+
+class TestLazySdkImport:
+    """Test that the MCP SDK is only imported on first connection."""
+
+    def test_import_does_not_load_sdk(self) -> None:
+        """Importing the client and harness should not import the mcp package."""
+        code = (
+            "import sys, runtime.harness, runtime.mcp_client; "
+            "print(any(m == 'mcp' or m.startswith('mcp.') for m in sys.modules))"
+        )
+        src = Path(__file__).resolve().parents[2] / "src"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONPATH": str(src)},
+            check=True,
+        )
+        assert result.stdout.strip() == "False"
+
+    def test_sdk_names_resolve_as_attributes(self) -> None:
+        """Lazily imported SDK names should still be module attributes."""
+        from mcp import ClientSession
+
+        import runtime.mcp_client as mcp_client
+
+        assert mcp_client.ClientSession is ClientSession
+        with pytest.raises(AttributeError):
+            _ = mcp_client.not_a_name
@@ -0,0 +1,127 @@
+"""Unit tests for the metrics registry."""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from mcp.types import CallToolResult, ImageContent, TextContent, Tool
+
+from runtime.exceptions import ToolExecutionError
+from runtime.mcp_client import McpClientManager
+from runtime.metrics import Histogram, MetricsRegistry, payload_size
+
+
+class TestHistogram:
+    """Test histogram aggregation."""
+
+    def test_summary(self) -> None:
+        """Count, sum, min, max and mean should be exact."""
+        histogram = Histogram()
+        for seconds in (0.002, 0.02, 0.2):
+            histogram.observe(seconds)
+        summary = histogram.to_dict()
+        assert summary["count"] == 3
+        assert summary["min"] == 0.002
+        assert summary["max"] == 0.2
+        assert summary["mean"] == pytest.approx(0.074)
+
+    def test_percentiles_are_bucket_bounds(self) -> None:
+        """Percentiles should be bucket upper bounds clamped to the maximum."""
+        histogram = Histogram()
+        for _ in range(99):
+            histogram.observe(0.004)
+        histogram.observe(3.0)
+        assert histogram.percentile(50) == 0.005
+        assert histogram.percentile(100) == 3.0
+
+    def test_empty(self) -> None:
+        """An empty histogram should summarize to zeros."""
+        assert Histogram().to_dict()["p95"] == 0.0
+
+
+class TestMetricsRegistry:
+    """Test per-server and per-tool recording."""
+
+    def test_calls_aggregate_per_server_and_tool(self) -> None:
+        """Calls should be counted under both their tool and server."""
+        metrics = MetricsRegistry()
+        metrics.record_call("git", "git__status", 0.1, request_bytes=10, response_bytes=100)
+        metrics.record_call("git", "git__log", 0.3, request_bytes=5, error=TimeoutError())
+        metrics.record_retry("git", "git__log")
+
+        snapshot = metrics.snapshot()
+        server = snapshot["servers"]["git"]
+        assert server["calls"] == 2
+        assert server["errors"] == 1
+        assert server["retries"] == 1
+        assert server["request_bytes"] == 15
+        assert snapshot["tools"]["git__log"]["error_types"] == {"TimeoutError": 1}
+        assert snapshot["tools"]["git__status"]["max_response_bytes"] == 100
+
+    def test_dump_writes_json(self, tmp_path: Path) -> None:
+        """dump() should write the snapshot to the given path."""
+        metrics = MetricsRegistry()
+        metrics.record_connect("git", 0.5)
+        path = metrics.dump(tmp_path / "out" / "metrics.json")
+        data = json.loads(path.read_text())
+        assert data["servers"]["git"]["connects"] == 1
+
+    def test_payload_size(self) -> None:
+        """Sizes should be UTF-8 bytes of the JSON encoding or the string."""
+        assert payload_size(None) == 0
+        assert payload_size({"a": "é"}) == len('{"a":"é"}'.encode())
+        assert payload_size("é") == 2
+
+    def test_payload_size_of_result_sums_content(self) -> None:
+        """Tool results should be measured by their content, not re-serialized."""
+        result = CallToolResult(
+            content=[
+                TextContent(type="text", text="hello"),
+                ImageContent(type="image", data="aGk=", mimeType="image/png"),
+            ]
+        )
+        with patch.object(CallToolResult, "model_dump_json") as dump:
+            assert payload_size(result) == len("hello") + len("aGk=")
+        dump.assert_not_called()
+
+
+class TestManagerIntegration:
+    """Test metrics recorded by McpClientManager."""
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_manager_records_connect_list_and_calls(
+        self, mock_session_class: Mock, mock_stdio: Mock, tmp_path: Path
+    ) -> None:
+        """Connect, list_tools, successful and failed calls should be recorded."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(json.dumps({"mcpServers": {"srv": {"command": "node"}}}))
+        mock_stdio.return_value.__aenter__ = AsyncMock(return_value=(Mock(), Mock()))
+        session = AsyncMock()
+        session.list_tools.return_value.tools = [
+            Tool(name="echo", inputSchema={"type": "object"})
+        ]
+        session.call_tool.side_effect = [
+            CallToolResult(content=[TextContent(type="text", text="hello")]),
+            ValueError("bad params"),
+        ]
+        mock_session_class.return_value.__aenter__.return_value = session
+
+        manager = McpClientManager()
+        await manager.initialize(config_file)
+        assert await manager.call_tool("srv__echo", {"text": "hello"}) == "hello"
+        with pytest.raises(ToolExecutionError):
+            await manager.call_tool("srv__echo", {})
+        await manager.cleanup()
+
+        snapshot = manager.metrics.snapshot()
+        server = snapshot["servers"]["srv"]
+        assert server["connects"] == 1
+        assert server["list_tools_seconds"]["count"] == 1
+        assert server["calls"] == 2
+        assert server["errors"] == 1
+        tool = snapshot["tools"]["srv__echo"]
+        assert tool["request_bytes"] == payload_size({"text": "hello"}) + payload_size({})
+        assert tool["response_bytes"] > 0
+        assert tool["error_types"] == {"ValueError": 1}
@@ -0,0 +1,186 @@
+"""Unit tests for tool result memoization."""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from mcp.types import Tool, ToolAnnotations
+
+from runtime.mcp_client import McpClientManager
+from runtime.result_cache import ResultCache, make_cache_key
+
+
+@pytest.fixture
+def safe_tool() -> Tool:
+    """A read-only tool."""
+    return Tool(name="get_status", description="Get status", inputSchema={"type": "object"})
+
+
+@pytest.fixture
+def dangerous_tool() -> Tool:
+    """A tool with side effects."""
+    return Tool(name="delete_file", description="Delete a file", inputSchema={"type": "object"})
+
+
+class TestCacheKey:
+    """Test cache key canonicalization."""
+
+    def test_param_order_does_not_matter(self) -> None:
+        """Keys should be independent of dict ordering."""
+        assert make_cache_key("s__t", {"a": 1, "b": 2}) == make_cache_key("s__t", {"b": 2, "a": 1})
+
+    def test_tool_is_part_of_key(self) -> None:
+        """Different tools with the same params should not collide."""
+        assert make_cache_key("s__a", {}) != make_cache_key("s__b", {})
+
+
+class TestResultCache:
+    """Test ResultCache behavior."""
+
+    def test_hit_and_miss_counters(self) -> None:
+        """get() should count hits and misses per tool."""
+        cache = ResultCache()
+        assert cache.get("s__t", {"x": 1}) == (False, None)
+        cache.put("s__t", {"x": 1}, {"ok": True})
+        assert cache.get("s__t", {"x": 1}) == (True, {"ok": True})
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["per_tool"]["s__t"] == {"hits": 1, "misses": 1}
+
+    def test_returns_copies(self) -> None:
+        """Mutating a returned value must not corrupt the cache."""
+        cache = ResultCache()
+        cache.put("s__t", {}, {"items": [1]})
+        _hit, value = cache.get("s__t", {})
+        value["items"].append(2)
+        assert cache.get("s__t", {}) == (True, {"items": [1]})
+
+    def test_ttl_expiry(self) -> None:
+        """Entries should expire after their tool's TTL."""
+        cache = ResultCache(default_ttl=60, tool_ttls={"s__fast": 0.5})
+        with patch("runtime.result_cache.time.monotonic", return_value=100.0):
+            cache.put("s__fast", {}, 1)
+            cache.put("s__slow", {}, 2)
+        with patch("runtime.result_cache.time.monotonic", return_value=101.0):
+            assert cache.get("s__fast", {}) == (False, None)
+            assert cache.get("s__slow", {}) == (True, 2)
+
+    def test_lru_entry_bound(self) -> None:
+        """The least recently used entry should be evicted first."""
+        cache = ResultCache(max_entries=2)
+        cache.put("s__t", {"n": 1}, 1)
+        cache.put("s__t", {"n": 2}, 2)
+        cache.get("s__t", {"n": 1})
+        cache.put("s__t", {"n": 3}, 3)
+
+        assert cache.get("s__t", {"n": 1})[0]
+        assert not cache.get("s__t", {"n": 2})[0]
+        assert cache.get("s__t", {"n": 3})[0]
+
+    def test_byte_bound(self) -> None:
+        """Total cached size should stay under max_bytes."""
+        cache = ResultCache(max_bytes=100)
+        cache.put("s__t", {"n": 1}, "x" * 60)
+        cache.put("s__t", {"n": 2}, "y" * 60)
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["bytes"] <= 100
+
+        cache.put("s__t", {"n": 3}, "z" * 200)
+        assert not cache.get("s__t", {"n": 3})[0]
+
+    def test_only_safe_tools_cacheable(self, safe_tool: Tool, dangerous_tool: Tool) -> None:
+        """Only SAFE-classified tools with a positive TTL are cacheable."""
+        cache = ResultCache(tool_ttls={"s__get_other": 0})
+        assert cache.is_cacheable("s__get_status", safe_tool)
+        assert not cache.is_cacheable("s__delete_file", dangerous_tool)
+        other = safe_tool.model_copy(update={"name": "get_other"})
+        assert not cache.is_cacheable("s__get_other", other)
+
+    def test_description_keywords_alone_not_cacheable(self) -> None:
+        """Only a safe name pattern or readOnlyHint makes a tool cacheable."""
+        cache = ResultCache()
+        by_description = Tool(
+            name="tool_xyz", description="Get the current user", inputSchema={"type": "object"}
+        )
+        hinted = Tool(
+            name="send_message",
+            inputSchema={"type": "object"},
+            annotations=ToolAnnotations(readOnlyHint=True),
+        )
+        not_read_only = Tool(
+            name="get_token",
+            inputSchema={"type": "object"},
+            annotations=ToolAnnotations(readOnlyHint=False),
+        )
+        assert not cache.is_cacheable("s__tool_xyz", by_description)
+        assert cache.is_cacheable("s__send_message", hinted)
+        assert not cache.is_cacheable("s__get_token", not_read_only)
+
+    def test_read_only_name_patterns(self) -> None:
+        """git read tools are cacheable; a dangerous description overrides a safe name."""
+        cache = ResultCache()
+        git_status = Tool(
+            name="git_status", description="Shows the working tree status", inputSchema={}
+        )
+        fetch_and_save = Tool(
+            name="fetch_and_save",
+            description="Fetches a URL and overwrites the local copy",
+            inputSchema={},
+        )
+        assert cache.is_cacheable("git__git_status", git_status)
+        assert not cache.is_cacheable("web__fetch_and_save", fetch_and_save)
+
+    def test_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """MCP_RESULT_CACHE_TTL should opt in; unset or 0 disables."""
+        monkeypatch.delenv("MCP_RESULT_CACHE_TTL", raising=False)
+        assert ResultCache.from_env() is None
+        monkeypatch.setenv("MCP_RESULT_CACHE_TTL", "0")
+        assert ResultCache.from_env() is None
+        monkeypatch.setenv("MCP_RESULT_CACHE_TTL", "30")
+        cache = ResultCache.from_env()
+        assert cache is not None
+        assert cache.default_ttl == 30
+
+
+class TestManagerIntegration:
+    """Test McpClientManager.call_tool memoization."""
+
+    @pytest.fixture
+    def config_file(self, tmp_path: Path) -> Path:
+        """Config with a single stdio server."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(json.dumps({"mcpServers": {"srv": {"command": "node"}}}))
+        return config_file
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_safe_tool_memoized(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        config_file: Path,
+        safe_tool: Tool,
+        dangerous_tool: Tool,
+    ) -> None:
+        """Repeated SAFE calls should hit the cache; dangerous calls never should."""
+        mock_stdio.return_value.__aenter__ = AsyncMock(return_value=(Mock(), Mock()))
+        session = AsyncMock()
+        session.list_tools.return_value.tools = [safe_tool, dangerous_tool]
+        session.call_tool.return_value.value = "ok"
+        mock_session_class.return_value.__aenter__.return_value = session
+
+        manager = McpClientManager(result_cache=ResultCache())
+        await manager.initialize(config_file)
+
+        for _ in range(3):
+            assert await manager.call_tool("srv__get_status", {"verbose": True}) == "ok"
+            assert await manager.call_tool("srv__delete_file", {"path": "x"}) == "ok"
+
+        calls = [call.args[0] for call in session.call_tool.call_args_list]
+        assert calls.count("get_status") == 1
+        assert calls.count("delete_file") == 3
+        assert manager.result_cache is not None
+        assert manager.result_cache.stats()["hits"] == 2
@@ -0,0 +1,157 @@
+"""Unit tests for streaming and spilling large tool results."""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from mcp.types import CallToolResult, ImageContent, TextContent, Tool
+
+from runtime.mcp_client import McpClientManager
+from runtime.result_stream import (
+    SpilledText,
+    iter_json_array,
+    spill_threshold_from_env,
+    unwrap_content,
+)
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestIterJsonArray:
+    """Test incremental JSON array parsing."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1000])
+    def test_elements_across_chunk_boundaries(self, chunk_size: int) -> None:
+        """Elements split across chunks (including numbers) should decode intact."""
+        data = [12345, "a,b]", {"nested": [1, 2]}, None, -0.5e3, True, []]
+        text = " " + json.dumps(data, indent=1) + "\n"
+        assert list(iter_json_array(_chunks(text, chunk_size))) == data
+
+    def test_string_source(self) -> None:
+        """A complete string should be accepted directly."""
+        assert list(iter_json_array("[1, 2, 3]")) == [1, 2, 3]
+        assert list(iter_json_array("[]")) == []
+
+    def test_non_array_yields_document(self) -> None:
+        """A non-array document should be yielded as one value."""
+        assert list(iter_json_array(_chunks('{"a": 1}', 2))) == [{"a": 1}]
+
+    def test_is_lazy(self) -> None:
+        """Elements should be yielded before the rest of the input is read."""
+        consumed = []
+
+        def source():
+            for chunk in ["[1,", "2,", "3]"]:
+                consumed.append(chunk)
+                yield chunk
+
+        iterator = iter_json_array(source())
+        assert next(iterator) == 1
+        assert len(consumed) < 3
+
+    @pytest.mark.parametrize("text", ["[1, 2", "[1 2]", ""])
+    def test_malformed(self, text: str) -> None:
+        """Malformed documents should raise JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array(text))
+
+
+class TestUnwrapContent:
+    """Test per-item unwrapping and the size guard."""
+
+    def test_json_and_text(self) -> None:
+        """JSON text should be parsed; plain text returned as is."""
+        assert unwrap_content(TextContent(type="text", text='{"a": 1}')) == {"a": 1}
+        assert unwrap_content(TextContent(type="text", text="hello")) == "hello"
+
+    def test_non_text_item_unchanged(self) -> None:
+        """Images and other non-text items should be returned unchanged."""
+        image = ImageContent(type="image", data="AAAA", mimeType="image/png")
+        assert unwrap_content(image) is image
+
+    def test_oversized_text_spilled(self) -> None:
+        """Text above the threshold should be spilled to a temp file."""
+        text = json.dumps(list(range(100)))
+        spilled = unwrap_content(TextContent(type="text", text=text), spill_threshold=10)
+        try:
+            assert isinstance(spilled, SpilledText)
+            assert spilled.length == len(text)
+            assert spilled.read_text() == text
+            assert list(spilled.iter_json(chunk_size=4)) == list(range(100))
+            with spilled.mmap() as mapped:
+                assert mapped[:3] == b"[0,"
+        finally:
+            spilled.unlink()
+        assert not spilled.path.exists()
+
+    def test_threshold_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """MCP_RESULT_SPILL_THRESHOLD should enable the guard for call_tool."""
+        monkeypatch.delenv("MCP_RESULT_SPILL_THRESHOLD", raising=False)
+        assert spill_threshold_from_env() is None
+        monkeypatch.setenv("MCP_RESULT_SPILL_THRESHOLD", "4096")
+        assert spill_threshold_from_env() == 4096
+
+
+class TestManagerStreaming:
+    """Test McpClientManager.stream_tool and multi-item results."""
+
+    @pytest.fixture
+    async def manager(self, tmp_path: Path):
+        """Manager connected to a mocked server returning four content items."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(json.dumps({"mcpServers": {"srv": {"command": "node"}}}))
+        session = AsyncMock()
+        session.list_tools.return_value.tools = [
+            Tool(name="crawl", inputSchema={"type": "object"})
+        ]
+        session.call_tool.return_value = CallToolResult(
+            content=[
+                TextContent(type="text", text='[{"page": 1}, {"page": 2}]'),
+                TextContent(type="text", text="x" * 50),
+                TextContent(type="text", text="done"),
+                TextContent(type="text", text="[Note] partial"),
+            ]
+        )
+        with (
+            patch("runtime.mcp_client.stdio_client") as mock_stdio,
+            patch("runtime.mcp_client.ClientSession") as mock_session_class,
+        ):
+            mock_stdio.return_value.__aenter__ = AsyncMock(return_value=(Mock(), Mock()))
+            mock_session_class.return_value.__aenter__.return_value = session
+            manager = McpClientManager(spill_threshold=40)
+            await manager.initialize(config_file)
+            yield manager
+            await manager.cleanup()
+
+    async def test_call_tool_returns_first_item(self, manager: McpClientManager) -> None:
+        """call_tool should keep returning only the first content item."""
+        result = await manager.call_tool("srv__crawl", {})
+        assert result == [{"page": 1}, {"page": 2}]
+
+    async def test_stream_tool_spills_large_items(self, manager: McpClientManager) -> None:
+        """stream_tool should spill large items and remove them on cleanup."""
+        items = [item async for item in manager.stream_tool("srv__crawl", {}, spill_threshold=40)]
+        assert items[0] == [{"page": 1}, {"page": 2}]
+        assert isinstance(items[1], SpilledText)
+        assert items[2:] == ["done", "[Note] partial"]
+
+        path = items[1].path
+        assert path.exists()
+        await manager.cleanup()
+        assert not path.exists()
+
+    async def test_stream_tool_yields_items(self, manager: McpClientManager) -> None:
+        """stream_tool should yield items and expand JSON arrays on request.
+
+        Text that only starts with "[" is yielded as text, not a parse error.
+        """
+        items = [
+            item
+            async for item in manager.stream_tool(
+                "srv__crawl", {}, spill_threshold=None, json_items=True
+            )
+        ]
+        assert items == [{"page": 1}, {"page": 2}, "x" * 50, "done", "[Note] partial"]
@@ -0,0 +1,49 @@
+"""Unit tests for retry classification and backoff."""
+
+import anyio
+import httpx
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, INVALID_PARAMS, ErrorData
+
+from runtime.config import RetryPolicy
+from runtime.retry import is_connection_lost, is_transient_error
+
+
+def _mcp_error(code: int) -> McpError:
+    return McpError(ErrorData(code=code, message="error"))
+
+
+def test_closed_transport_is_connection_lost():
+    """Closed streams and CONNECTION_CLOSED should require a reconnect."""
+    assert is_connection_lost(anyio.ClosedResourceError())
+    assert is_connection_lost(anyio.BrokenResourceError())
+    assert is_connection_lost(_mcp_error(CONNECTION_CLOSED))
+    assert not is_connection_lost(TimeoutError())
+
+
+def test_transient_errors():
+    """Timeouts and network errors should be retried."""
+    assert is_transient_error(TimeoutError())
+    assert is_transient_error(ConnectionRefusedError())
+    assert is_transient_error(httpx.ConnectError("refused"))
+    assert is_transient_error(_mcp_error(httpx.codes.REQUEST_TIMEOUT))
+
+
+def test_non_transient_errors():
+    """Server-reported and programming errors should not be retried."""
+    assert not is_transient_error(_mcp_error(INVALID_PARAMS))
+    assert not is_transient_error(ValueError("bad"))
+    assert not is_transient_error(KeyError("x"))
+
+
+def test_backoff_grows_exponentially_without_jitter():
+    """Delays should double up to maxDelay."""
+    policy = RetryPolicy(baseDelay=0.5, multiplier=2, maxDelay=3, jitter=0)
+    assert [policy.compute_delay(n) for n in range(4)] == [0.5, 1.0, 2.0, 3.0]
+
+
+def test_backoff_jitter_bounds():
+    """Jitter should only shorten the delay, by at most the jitter fraction."""
+    policy = RetryPolicy(baseDelay=1, jitter=0.5)
+    delays = [policy.compute_delay(0) for _ in range(50)]
+    assert all(0.5 <= d <= 1.0 for d in delays)
@@ -0,0 +1,61 @@
+"""Unit tests for server shutdown helpers."""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from runtime.shutdown import (
+    DEFAULT_SHUTDOWN_GRACE,
+    shutdown_grace_from_env,
+    signal_process_group,
+    stdio_process_pid,
+)
+
+
+class TestStdioProcessPid:
+    """Test reading the server PID from an entered stdio context."""
+
+    async def test_reads_process_from_suspended_generator(self) -> None:
+        """The PID of the local `process` should be found while entered."""
+
+        @asynccontextmanager
+        async def fake_stdio_client() -> AsyncIterator[tuple[None, None]]:
+            process = SimpleNamespace(pid=4321)
+            yield (None, None)
+            del process
+
+        ctx = fake_stdio_client()
+        await ctx.__aenter__()
+        try:
+            assert stdio_process_pid(ctx) == 4321
+        finally:
+            await ctx.__aexit__(None, None, None)
+
+    def test_unknown_context_returns_none(self) -> None:
+        """Mocks and other transports should not yield a PID."""
+        assert stdio_process_pid(AsyncMock()) is None
+        assert stdio_process_pid(object()) is None
+
+
+class TestSignalProcessGroup:
+    """Test signalling server processes."""
+
+    def test_missing_process(self) -> None:
+        """Signalling a process that is gone should report False."""
+        assert signal_process_group(2**22 + 12345, 0) is False
+
+
+class TestShutdownGraceFromEnv:
+    """Test MCP_SHUTDOWN_GRACE parsing."""
+
+    def test_default_and_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Unset or invalid values fall back to the default."""
+        monkeypatch.delenv("MCP_SHUTDOWN_GRACE", raising=False)
+        assert shutdown_grace_from_env() == DEFAULT_SHUTDOWN_GRACE
+        monkeypatch.setenv("MCP_SHUTDOWN_GRACE", "0.5")
+        assert shutdown_grace_from_env() == 0.5
+        monkeypatch.setenv("MCP_SHUTDOWN_GRACE", "soon")
+        assert shutdown_grace_from_env() == DEFAULT_SHUTDOWN_GRACE
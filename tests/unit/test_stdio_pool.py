@@ -0,0 +1,109 @@
+"""Unit tests for the process-wide stdio server pool."""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+from runtime.config import ServerConfig
+from runtime.mcp_client import McpClientManager
+from runtime.stdio_pool import PooledServer, StdioServerPool, stdio_fingerprint
+
+
+def make_opener() -> AsyncMock:
+    """Build an opener returning a new PooledServer with mock contexts per call."""
+
+    async def open_server(server_name: str, config: ServerConfig) -> PooledServer:
+        return PooledServer(server_name, AsyncMock(), Mock())
+
+    return AsyncMock(side_effect=open_server)
+
+
+class TestFingerprint:
+    """Test pool keys."""
+
+    def test_depends_on_launch_configuration_only(self) -> None:
+        """Command, args and env form the key; unrelated options do not."""
+        base = ServerConfig(command="node", args=["a.js"], env={"K": "1"})
+        assert stdio_fingerprint(base) == stdio_fingerprint(
+            base.model_copy(update={"maxConcurrentRequests": 2, "warmup": "eager"})
+        )
+        assert stdio_fingerprint(base) != stdio_fingerprint(
+            base.model_copy(update={"env": {"K": "2"}})
+        )
+
+
+class TestStdioServerPool:
+    """Test reference counting and reuse."""
+
+    async def test_shared_until_last_release(self) -> None:
+        """Holders of the same config share one server, closed by the last release."""
+        pool = StdioServerPool()
+        opener = make_opener()
+        config = ServerConfig(command="node")
+
+        first = await pool.acquire("a", config, opener)
+        second = await pool.acquire("b", config, opener)
+        assert first is second
+        assert first.refcount == 2
+        opener.assert_awaited_once()
+
+        assert await pool.release(first) == "released"
+        first._host.__aexit__.assert_not_awaited()
+        assert await pool.release(second) == "closed"
+        first._host.__aexit__.assert_awaited_once()
+        assert pool.active_servers() == []
+
+    async def test_different_env_spawns_separately(self) -> None:
+        """Configs that launch differently must not share a process."""
+        pool = StdioServerPool()
+        opener = make_opener()
+        one = await pool.acquire("s", ServerConfig(command="node", env={"K": "1"}), opener)
+        two = await pool.acquire("s", ServerConfig(command="node", env={"K": "2"}), opener)
+        assert one is not two
+        assert len(pool.active_servers()) == 2
+
+    async def test_discarded_server_is_replaced(self) -> None:
+        """After discard, new holders get a fresh server; old holders keep theirs."""
+        pool = StdioServerPool()
+        opener = make_opener()
+        config = ServerConfig(command="node")
+
+        broken = await pool.acquire("s", config, opener)
+        await pool.acquire("s", config, opener)
+        pool.discard(broken)
+        fresh = await pool.acquire("s", config, opener)
+
+        assert fresh is not broken
+        assert broken.refcount == 2
+        assert pool.active_servers() == [fresh]
+
+
+class TestManagerSharing:
+    """Test that managers in one process share stdio servers."""
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_two_managers_spawn_once(
+        self, mock_session_class: Mock, mock_stdio: Mock, tmp_path: Path
+    ) -> None:
+        """A second manager should reuse the first manager's server."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(json.dumps({"mcpServers": {"srv": {"command": "node"}}}))
+        mock_stdio.return_value.__aenter__ = AsyncMock(return_value=(Mock(), Mock()))
+        session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = session
+        pool = StdioServerPool()
+
+        managers = [McpClientManager(stdio_pool=pool) for _ in range(2)]
+        for manager in managers:
+            await manager.initialize(config_file)
+            await manager._connect_to_server("srv", manager._config.mcpServers["srv"])
+
+        mock_stdio.assert_called_once()
+        assert managers[0]._clients["srv"] is managers[1]._clients["srv"]
+
+        await managers[0].cleanup()
+        mock_stdio.return_value.__aexit__.assert_not_awaited()
+        await managers[1].cleanup()
+        mock_stdio.return_value.__aexit__.assert_awaited_once()
+
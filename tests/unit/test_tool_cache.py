@@ -0,0 +1,215 @@
+"""Unit tests for the persistent tool-schema cache."""
+
+import json
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from mcp.types import Tool
+
+from runtime.config import ServerConfig
+from runtime.mcp_client import McpClientManager
+from runtime.tool_cache import ToolSchemaCache, config_fingerprint
+
+
+@pytest.fixture
+def server_config() -> ServerConfig:
+    """A simple stdio server configuration."""
+    return ServerConfig(command="node", args=["server.js"], env={"TOKEN": "${TOKEN}"})
+
+
+@pytest.fixture
+def tools() -> list[Tool]:
+    """Tools as returned by list_tools."""
+    return [
+        Tool(
+            name="read_file",
+            description="Read a file",
+            inputSchema={"type": "object", "properties": {"path": {"type": "string"}}},
+        ),
+        Tool(name="list_dir", inputSchema={"type": "object"}),
+    ]
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ToolSchemaCache:
+    """Cache rooted in a temporary directory."""
+    return ToolSchemaCache(cache_dir=tmp_path / "cache")
+
+
+class TestFingerprint:
+    """Test config fingerprinting."""
+
+    def test_fingerprint_is_stable(self, server_config: ServerConfig) -> None:
+        """Equal configs should produce equal fingerprints."""
+        clone = ServerConfig.model_validate(server_config.model_dump())
+        assert config_fingerprint(server_config) == config_fingerprint(clone)
+
+    def test_fingerprint_changes_with_config(self, server_config: ServerConfig) -> None:
+        """Any config change should change the fingerprint."""
+        changed = server_config.model_copy(update={"args": ["other.js"]})
+        assert config_fingerprint(server_config) != config_fingerprint(changed)
+
+
+class TestToolSchemaCache:
+    """Test load/store/invalidate behavior."""
+
+    async def test_round_trip(
+        self, cache: ToolSchemaCache, server_config: ServerConfig, tools: list[Tool]
+    ) -> None:
+        """Stored tools should load back identically."""
+        await cache.store("srv", server_config, tools)
+        loaded = await cache.load("srv", server_config)
+        assert loaded == tools
+
+    async def test_miss_when_absent(
+        self, cache: ToolSchemaCache, server_config: ServerConfig
+    ) -> None:
+        """Loading an unknown server should miss."""
+        assert await cache.load("srv", server_config) is None
+
+    async def test_config_change_invalidates(
+        self, cache: ToolSchemaCache, server_config: ServerConfig, tools: list[Tool]
+    ) -> None:
+        """A changed config should not see the old entry."""
+        await cache.store("srv", server_config, tools)
+        changed = server_config.model_copy(update={"command": "deno"})
+        assert await cache.load("srv", changed) is None
+
+    async def test_ttl_expiry(
+        self, tmp_path: Path, server_config: ServerConfig, tools: list[Tool]
+    ) -> None:
+        """Entries older than the TTL should miss."""
+        cache = ToolSchemaCache(cache_dir=tmp_path, ttl=60)
+        await cache.store("srv", server_config, tools)
+
+        entry_path = tmp_path / "srv.json"
+        entry = json.loads(entry_path.read_text())
+        entry["created_at"] = time.time() - 120
+        entry_path.write_text(json.dumps(entry))
+
+        assert await cache.load("srv", server_config) is None
+
+    async def test_corrupt_entry_is_a_miss(
+        self, cache: ToolSchemaCache, server_config: ServerConfig
+    ) -> None:
+        """Unreadable entries should be ignored, not raised."""
+        cache.cache_dir.mkdir(parents=True)
+        (cache.cache_dir / "srv.json").write_text("{ not json")
+        assert await cache.load("srv", server_config) is None
+
+    async def test_invalidate(
+        self, cache: ToolSchemaCache, server_config: ServerConfig, tools: list[Tool]
+    ) -> None:
+        """invalidate() should drop one or all entries."""
+        await cache.store("a", server_config, tools)
+        await cache.store("b", server_config, tools)
+
+        cache.invalidate("a")
+        assert await cache.load("a", server_config) is None
+        assert await cache.load("b", server_config) == tools
+
+        cache.invalidate()
+        assert await cache.load("b", server_config) is None
+
+    def test_from_env_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """MCP_TOOL_CACHE_TTL=0 should disable the cache."""
+        monkeypatch.setenv("MCP_TOOL_CACHE_TTL", "0")
+        assert ToolSchemaCache.from_env() is None
+
+    def test_from_env_ttl(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """MCP_TOOL_CACHE_TTL should set the TTL."""
+        monkeypatch.setenv("MCP_TOOL_CACHE_TTL", "90")
+        cache = ToolSchemaCache.from_env()
+        assert cache is not None
+        assert cache.ttl == 90
+
+
+class TestManagerIntegration:
+    """Test McpClientManager use of the persistent cache."""
+
+    @pytest.fixture
+    def config_file(self, tmp_path: Path) -> Path:
+        """Config with a single stdio server."""
+        config_file = tmp_path / "mcp_config.json"
+        config_file.write_text(
+            json.dumps({"mcpServers": {"srv": {"command": "node", "args": ["server.js"]}}})
+        )
+        return config_file
+
+    @staticmethod
+    def _mock_session(tools: list[Tool]) -> AsyncMock:
+        session = AsyncMock()
+        session.list_tools.return_value.tools = tools
+        session.call_tool.return_value.value = "ok"
+        return session
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_warm_cache_skips_list_tools(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        config_file: Path,
+        cache: ToolSchemaCache,
+        tools: list[Tool],
+    ) -> None:
+        """A second manager should resolve tools from disk without list_tools."""
+        mock_stdio.return_value.__aenter__ = AsyncMock(return_value=(Mock(), Mock()))
+        session = self._mock_session(tools)
+        mock_session_class.return_value.__aenter__.return_value = session
+
+        first = McpClientManager(schema_cache=cache)
+        await first.initialize(config_file)
+        await first.call_tool("srv__read_file", {"path": "x"})
+        assert session.list_tools.call_count == 1
+
+        second = McpClientManager(schema_cache=cache)
+        await second.initialize(config_file)
+        result = await second.call_tool("srv__read_file", {"path": "x"})
+
+        assert result == "ok"
+        assert session.list_tools.call_count == 1
+
+    @patch("runtime.mcp_client.stdio_client")
+    @patch("runtime.mcp_client.ClientSession")
+    async def test_stale_cache_refreshes_for_unknown_tool(
+        self,
+        mock_session_class: Mock,
+        mock_stdio: Mock,
+        config_file: Path,
+        cache: ToolSchemaCache,
+        tools: list[Tool],
+    ) -> None:
+        """A tool missing from the cached list should trigger a live list_tools."""
+        mock_stdio.return_value.__aenter__ = AsyncMock(return_value=(Mock(), Mock()))
+        new_tool = Tool(name="new_tool", inputSchema={"type": "object"})
+        session = self._mock_session([*tools, new_tool])
+        mock_session_class.return_value.__aenter__.return_value = session
+
+        manager = McpClientManager(schema_cache=cache)
+        await manager.initialize(config_file)
+        await cache.store("srv", manager._config.mcpServers["srv"], tools)
+
+        await manager.call_tool("srv__new_tool", {})
+
+        assert session.list_tools.call_count == 1
+        cached = await cache.load("srv", manager._config.mcpServers["srv"])
+        assert cached is not None
+        assert "new_tool" in [tool.name for tool in cached]
+
+    async def test_list_all_tools_from_cache_does_not_connect(
+        self, config_file: Path, cache: ToolSchemaCache, tools: list[Tool]
+    ) -> None:
+        """list_all_tools should not connect to servers with cached tools."""
+        manager = McpClientManager(schema_cache=cache)
+        await manager.initialize(config_file)
+        await cache.store("srv", manager._config.mcpServers["srv"], tools)
+
+        with patch("runtime.mcp_client.stdio_client") as mock_stdio:
+            result = await manager.list_all_tools()
+
+        assert result == tools
+        mock_stdio.assert_not_called()
+        assert manager._clients == {}
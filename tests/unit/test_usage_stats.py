@@ -0,0 +1,58 @@
+"""Unit tests for per-server usage statistics."""
+
+from pathlib import Path
+
+import pytest
+
+from runtime.usage_stats import UsageStats
+
+
+@pytest.fixture
+def stats(tmp_path: Path) -> UsageStats:
+    """Usage stats in a temporary file."""
+    return UsageStats(tmp_path / "cache" / "mcp-usage.json")
+
+
+class TestUsageStats:
+    """Test decayed usage scores and prediction."""
+
+    def test_scores_decay_across_runs(self, stats: UsageStats) -> None:
+        """Used servers gain score, unused ones decay."""
+        stats.record_run({"a"}, known=["a", "b"])
+        assert stats.load() == {"a": pytest.approx(0.2)}
+
+        stats.record_run({"a", "b"}, known=["a", "b"])
+        stats.record_run({"b"}, known=["a", "b"])
+        scores = stats.load()
+        assert scores["a"] == pytest.approx(0.8 * (0.8 * 0.2 + 0.2))
+        assert scores["b"] == pytest.approx(0.8 * 0.2 + 0.2)
+
+    def test_predicted_requires_threshold(self, stats: UsageStats) -> None:
+        """One run is not enough; repeated use is."""
+        stats.record_run({"a", "b"}, known=["a", "b"])
+        assert stats.predicted(["a", "b"]) == []
+
+        stats.record_run({"a"}, known=["a", "b"])
+        assert stats.predicted(["a", "b"]) == ["a"]
+        assert stats.predicted(["b"]) == []
+
+    def test_removed_servers_are_dropped(self, stats: UsageStats) -> None:
+        """Servers no longer configured should not linger in the file."""
+        stats.record_run({"old"}, known=["old"])
+        stats.record_run(set(), known=["new"])
+        assert stats.load() == {}
+
+    def test_unreadable_file_is_ignored(self, stats: UsageStats) -> None:
+        """A corrupt file yields no scores and is replaced on the next run."""
+        stats.path.parent.mkdir(parents=True)
+        stats.path.write_text("{ not json")
+        assert stats.load() == {}
+        stats.record_run({"a"}, known=["a"])
+        assert stats.load() == {"a": pytest.approx(0.2)}
+
+    def test_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """MCP_USAGE_STATS=0 disables tracking."""
+        monkeypatch.setenv("MCP_USAGE_STATS", "0")
+        assert UsageStats.from_env() is None
+        monkeypatch.delenv("MCP_USAGE_STATS")
+        assert UsageStats.from_env() is not None
@@ -0,0 +1,67 @@
+"""Unit tests for wrapper manifests."""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+from runtime.wrapper_manifest import (
+    GENERATOR_VERSION,
+    MANIFEST_FILE,
+    WrapperManifest,
+    diff_tools,
+    tool_hash,
+)
+
+
+def _tool(name: str, schema: dict) -> Mock:
+    tool = Mock(description="A tool", inputSchema=schema)
+    tool.name = name
+    return tool
+
+
+class TestToolHash:
+    """Test hashing tool definitions."""
+
+    def test_ignores_key_order(self) -> None:
+        """Equal schemas should hash equally regardless of key order."""
+        a = _tool("t", {"type": "object", "properties": {"x": {"type": "string"}}})
+        b = _tool("t", {"properties": {"x": {"type": "string"}}, "type": "object"})
+        assert tool_hash(a) == tool_hash(b)
+
+    def test_schema_change_changes_hash(self) -> None:
+        """Any change to the input schema should change the hash."""
+        a = _tool("t", {"type": "object"})
+        b = _tool("t", {"type": "object", "required": ["x"]})
+        assert tool_hash(a) != tool_hash(b)
+
+
+class TestWrapperManifest:
+    """Test reading manifests and diffing them against tools."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """A written manifest should load back unchanged."""
+        manifest = WrapperManifest.for_tools([_tool("t", {"type": "object"})])
+        (tmp_path / MANIFEST_FILE).write_text(manifest.to_json())
+
+        loaded = WrapperManifest.load(tmp_path)
+
+        assert loaded is not None
+        assert loaded.tools == manifest.tools
+        assert loaded.version == GENERATOR_VERSION
+
+    def test_unreadable_manifest_is_ignored(self, tmp_path: Path) -> None:
+        """A corrupt manifest should load as missing."""
+        (tmp_path / MANIFEST_FILE).write_text("{not json")
+        assert WrapperManifest.load(tmp_path) is None
+        assert WrapperManifest.load(tmp_path / "missing") is None
+
+    def test_other_generator_version_changes_all(self, tmp_path: Path) -> None:
+        """Wrappers from another generator version should all be regenerated."""
+        current = WrapperManifest.for_tools([_tool("t", {"type": "object"})])
+        old = WrapperManifest(dict(current.tools), version=GENERATOR_VERSION - 1)
+        (tmp_path / "t.py").write_text("")
+
+        def wrapper_path(name: str) -> Path:
+            return tmp_path / f"{name}.py"
+
+        assert diff_tools(old, current, wrapper_path).changed == ["t"]
+        assert diff_tools(current, current, wrapper_path).unchanged == ["t"]